@@ -0,0 +1,81 @@
+# benchmarks/dict_resolvers.py
+"""Compare executing a query on converted objects with resolving it straight from the upstream dicts
+
+The hosts come from renterd's example response in api-schemas/renterd.simplified.json, repeated
+until there are `--items` of them, and are served already decoded, so only conversion and GraphQL
+execution are timed: the default schema converting the selected fields, converting lazily, and the
+schema whose default resolver reads the dicts.
+
+    PYTHONPATH=. python benchmarks/dict_resolvers.py --items 10000 --repeat 5
+"""
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List
+
+import strawberry
+
+from benchmarks.json_decoding import example_body, scale
+from siaql.graphql.schema import mapping_schema, schema
+
+QUERY = """{
+    renterdGetHosts {
+        publicKey netAddress knownSince lastAnnouncement scanned blocked storedData
+        interactions { totalScans lastScan lastScanSuccess uptime downtime }
+        settings { acceptingcontracts maxduration storageprice collateral netaddress version }
+        priceTable { uid validity hostblockheight expiry }
+    }
+}"""
+
+
+class Renterd:
+    def __init__(self, hosts: List[Dict[str, Any]]):
+        self.hosts = hosts
+
+    async def get_hosts(self) -> List[Dict[str, Any]]:
+        return self.hosts
+
+
+def context(hosts: List[Dict[str, Any]], lazy: bool) -> Dict[str, Any]:
+    return {
+        "skipped_endpoints": {"walletd": True, "renterd": False, "hostd": True},
+        "renterd_client": Renterd(hosts),
+        "conversion_cache": None,
+        "lazy_conversion": lazy,
+    }
+
+
+async def measure(executor: strawberry.Schema, hosts: List[Dict[str, Any]], lazy: bool, repeat: int) -> float:
+    """Best wall time of `repeat` executions, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await executor.execute(QUERY, context_value=context(hosts, lazy))
+        best = min(best, time.perf_counter() - start)
+        assert result.errors is None, result.errors
+    return best
+
+
+async def run(items: int, repeat: int) -> None:
+    hosts = scale(example_body("renterd", "GET", "/hosts"), items)
+    cases = {"converted": (schema, False), "lazy": (schema, True), "dicts": (mapping_schema(), False)}
+    timings = {label: await measure(executor, hosts, lazy, repeat) for label, (executor, lazy) in cases.items()}
+    baseline = timings["converted"]
+    print(f"{'resolution':<12} {'ms':>10} {'speedup':>8}")
+    for label, seconds in timings.items():
+        print(f"{label:<12} {seconds * 1e3:>10.2f} {baseline / seconds:>7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10000, help="Hosts per response")
+    parser.add_argument("--repeat", type=int, default=5, help="Executions per mode, the best one counts")
+    args = parser.parse_args()
+    # The example response has fields the types don't, logging each of them would dominate the timings
+    logging.getLogger("siaql.resolvers.converter").setLevel(logging.ERROR)
+    asyncio.run(run(args.items, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
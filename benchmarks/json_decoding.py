@@ -0,0 +1,94 @@
+# benchmarks/json_decoding.py
+"""Compare the available JSON decoders on large upstream responses
+
+The payloads are built from the example responses captured in api-schemas/*.simplified.json,
+repeated until each holds `--items` entries, and encoded to bytes as a daemon would send them.
+
+    python benchmarks/json_decoding.py --items 10000 --repeat 5
+"""
+import argparse
+import gc
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from siaql.api.decoding import DECODERS
+
+SCHEMAS = Path(__file__).resolve().parent.parent / "api-schemas"
+# Example responses to benchmark as (daemon, HTTP method, endpoint name, client method it feeds)
+FIXTURES = [
+    ("renterd", "GET", "/hosts", "get_hosts"),
+    ("renterd", "GET", "/contracts", "get_contracts"),
+    ("walletd", "GET", "Get Wallet Events", "get_wallet_events"),
+    ("renterd", "POST", "/rhp/:id/roots", "get_contract_roots"),
+    ("hostd", "POST", "Search contracts", "get_contracts"),
+]
+
+
+def endpoints(items: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    for item in items:
+        if "item" in item:
+            yield from endpoints(item["item"])
+        else:
+            yield item
+
+
+def example_body(daemon: str, method: str, name: str) -> Any:
+    schema = json.loads((SCHEMAS / f"{daemon}.simplified.json").read_text())
+    for endpoint in endpoints(schema["item"]):
+        if endpoint["method"] == method and endpoint["name"] == name:
+            for response in endpoint.get("responses", []):
+                if response.get("body"):
+                    return response["body"]
+    raise LookupError(f"No example response for {daemon} {method} {name}")
+
+
+def scale(body: Any, items: int) -> Any:
+    """Repeat the example's entries until the list (or the dict's largest list) holds `items` entries"""
+    if isinstance(body, list):
+        return [body[i % len(body)] for i in range(items)]
+    key = max((key for key, value in body.items() if isinstance(value, list)), key=lambda key: len(body[key]))
+    return {**body, key: scale(body[key], items)}
+
+
+def measure(loads, payload: bytes, repeat: int) -> float:
+    """Best wall time of `repeat` decodes with the garbage collector paused, in seconds"""
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            loads(payload)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10000, help="Entries per payload")
+    parser.add_argument("--repeat", type=int, default=5, help="Decodes per payload and decoder, the best one counts")
+    args = parser.parse_args()
+
+    decoders = sorted(DECODERS)
+    rows: List[Tuple[str, float, Dict[str, float]]] = []
+    for daemon, method, name, client_method in FIXTURES:
+        payload = json.dumps(scale(example_body(daemon, method, name), args.items)).encode()
+        timings = {decoder: measure(DECODERS[decoder], payload, args.repeat) for decoder in decoders}
+        rows.append((f"{daemon}.{client_method}", len(payload) / 1e6, timings))
+
+    header = f"{'payload':<28} {'MB':>7} " + " ".join(f"{decoder + ' ms':>12}" for decoder in decoders)
+    print(header + (f" {'speedup':>8}" if "orjson" in decoders else ""))
+    for label, size, timings in rows:
+        line = f"{label:<28} {size:>7.2f} " + " ".join(f"{timings[decoder] * 1e3:>12.2f}" for decoder in decoders)
+        if "orjson" in timings:
+            line += f" {timings['stdlib'] / timings['orjson']:>7.1f}x"
+        print(line)
+    if "orjson" not in decoders:
+        print("orjson is not installed, install the fastjson extra to compare")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/selection_conversion.py
+"""Compare converting every field of large responses with converting only the fields a query reads
+
+The hosts come from renterd's example response in api-schemas/renterd.simplified.json, repeated
+until there are `--items` of them, and are converted as a `[Host]` field selecting `netAddress`
+and `interactions { totalScans }` would be: eagerly with and without a projection of the selected
+fields, and lazily with those fields read afterwards.
+
+    PYTHONPATH=. python benchmarks/selection_conversion.py --items 10000 --repeat 5
+"""
+import argparse
+import logging
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from strawberry.types.base import StrawberryList
+
+from benchmarks.json_decoding import example_body, scale
+from siaql.graphql.resolvers.converter import TypeConverter
+from siaql.graphql.schemas.types import Host
+
+HOSTS = StrawberryList(Host)
+SELECTED = {"netAddress": None, "interactions": {"totalScans": None}}
+
+
+def read_selected(hosts: List[Host]) -> None:
+    for host in hosts:
+        host.net_address
+        if host.interactions is not None:
+            host.interactions.total_scans
+
+
+CASES: Dict[str, Callable[[List[Dict[str, Any]]], Any]] = {
+    "all fields": lambda hosts: TypeConverter.convert(hosts, HOSTS),
+    "projected": lambda hosts: TypeConverter.convert(hosts, HOSTS, SELECTED),
+    "lazy": lambda hosts: read_selected(TypeConverter.convert(hosts, HOSTS, lazy=True)),
+}
+
+
+def measure(case: Callable[[List[Dict[str, Any]]], Any], hosts: List[Dict[str, Any]], repeat: int) -> float:
+    """Best wall time of `repeat` conversions, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case(hosts)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(case: Callable[[List[Dict[str, Any]]], Any], hosts: List[Dict[str, Any]]) -> int:
+    """Peak bytes allocated by one conversion"""
+    tracemalloc.start()
+    try:
+        case(hosts)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10000, help="Hosts to convert")
+    parser.add_argument("--repeat", type=int, default=5, help="Conversions per case, the best one counts")
+    args = parser.parse_args()
+    # The example response has fields the types don't, logging each of them would dominate the timings
+    logging.getLogger("siaql.resolvers.converter").setLevel(logging.ERROR)
+
+    hosts = scale(example_body("renterd", "GET", "/hosts"), args.items)
+    timings = {label: measure(case, hosts, args.repeat) for label, case in CASES.items()}
+    peaks = {label: peak_memory(case, hosts) for label, case in CASES.items()}
+    full = timings["all fields"]
+    print(f"{'conversion':<12} {'ms':>10} {'speedup':>8} {'peak MB':>8}")
+    for label, seconds in timings.items():
+        print(f"{label:<12} {seconds * 1e3:>10.2f} {full / seconds:>7.1f}x {peaks[label] / 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
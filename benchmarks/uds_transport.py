@@ -0,0 +1,96 @@
+# benchmarks/uds_transport.py
+"""Compare upstream calls over a unix domain socket with calls over TCP to localhost
+
+A minimal keep-alive HTTP/1.1 server listens on both a TCP port and a unix socket and answers
+every request with the same JSON body. The daemon clients' connection pool is used to make
+`--requests` GETs, `--concurrency` at a time, against each.
+
+    python benchmarks/uds_transport.py --requests 5000 --concurrency 16 --size 1000
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import List, Tuple
+
+from siaql.api.pool import ConnectionPool, socket_url
+
+
+def handler(body: bytes):
+    response = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            # The benchmark only sends body-less GETs, a request ends with its headers
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def measure(base_url: str, requests: int, concurrency: int) -> Tuple[float, List[float]]:
+    """Requests per second and the sorted per-request latencies, in seconds"""
+    pool = ConnectionPool(coalesce_gets=False)
+    client = pool.create_client("bench", base_url)
+    latencies: List[float] = []
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.get("/state")
+            response.json()
+            latencies.append(time.perf_counter() - start)
+
+    # Warm the connections up so both transports are measured with an established pool
+    await asyncio.gather(*(client.get("/state") for _ in range(concurrency)))
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await client.aclose()
+    return requests / elapsed, sorted(latencies)
+
+
+async def run(args: argparse.Namespace) -> None:
+    body = json.dumps([{"id": i, "value": "x" * 32} for i in range(args.size)]).encode()
+    with tempfile.TemporaryDirectory() as directory:
+        socket = os.path.join(directory, "bench.sock")
+        tcp = await asyncio.start_server(handler(body), "127.0.0.1", 0)
+        uds = await asyncio.start_unix_server(handler(body), socket)
+        port = tcp.sockets[0].getsockname()[1]
+        # Base URLs as the daemon clients build them from TCP and unix:// daemon URLs
+        targets = [("tcp", f"http://127.0.0.1:{port}/api"), ("uds", f"{socket_url(f'unix://{socket}')}/api")]
+
+        print(f"{'transport':<10} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+        results = {}
+        for name, url in targets:
+            rate, latencies = await measure(url, args.requests, args.concurrency)
+            results[name] = rate
+            p50 = latencies[len(latencies) // 2]
+            p99 = latencies[int(len(latencies) * 0.99)]
+            print(f"{name:<10} {rate:>10.0f} {p50 * 1e3:>8.3f} {p99 * 1e3:>8.3f}")
+        print(f"unix socket throughput is {results['uds'] / results['tcp']:.2f}x TCP's")
+
+        tcp.close()
+        uds.close()
+        # Let the connection handlers see their clients hang up before the loop goes away
+        await asyncio.sleep(0.1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000, help="GETs per transport")
+    parser.add_argument("--concurrency", type=int, default=16, help="GETs in flight at once")
+    parser.add_argument("--size", type=int, default=100, help="Entries in the JSON response body")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
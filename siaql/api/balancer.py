@@ -0,0 +1,154 @@
+# siaql/api/balancer.py
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+
+import httpx
+
+from siaql.api.resilience import UNAVAILABLE_STATUSES
+
+# Errors raised before any of the request reached the member, safe to send elsewhere whatever the method
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+
+class Member:
+    """One of the daemons a balancer spreads requests over"""
+
+    def __init__(self, base_url: str, transport: httpx.AsyncBaseTransport):
+        self.url = httpx.URL(base_url.rstrip("/"))
+        self.transport = transport
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until = float("-inf")
+
+    def stats(self, now: float) -> Dict[str, Any]:
+        return {
+            "inFlight": self.in_flight,
+            "requests": self.requests,
+            "consecutiveFailures": self.failures,
+            "ejections": self.ejections,
+            "ejected": now < self.ejected_until,
+        }
+
+
+class MemberStream(httpx.AsyncByteStream):
+    """Response stream that frees its member's slot once it is closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, member: Member):
+        self.stream = stream
+        self.member = member
+        self.closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.member.in_flight -= 1
+        await self.stream.aclose()
+
+
+class BalancerTransport(httpx.AsyncBaseTransport):
+    """Transport that spreads the requests under a route prefix over several daemons
+
+    Requests under `prefix` of the client's base URL go to the member with the fewest requests in
+    flight, other requests go to `transport`. A member is ejected for `eject_time` seconds after
+    `eject_threshold` consecutive failures, and requests that fail to connect are sent to the next
+    member.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        base_url: str,
+        prefix: str,
+        members: List[Member],
+        eject_threshold: int = 3,
+        eject_time: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not members:
+            raise ValueError("A balancer needs at least one member")
+        self.transport = transport
+        self.base_path = httpx.URL(base_url.rstrip("/")).path
+        self.prefix = f"{self.base_path}/{prefix.strip('/')}/"
+        self.members = members
+        self.eject_threshold = eject_threshold
+        self.eject_time = eject_time
+        self.clock = clock
+        self.failovers = 0
+        # Rotates the order ties are broken in, so sequential calls don't all land on the first member
+        self._next = 0
+
+    def pick(self, exclude: Set[int]) -> Optional[int]:
+        """Index of the least loaded healthy member, or of any member left if all are ejected"""
+        now = self.clock()
+        candidates = [i for i in range(len(self.members)) if i not in exclude]
+        healthy = [i for i in candidates if now >= self.members[i].ejected_until]
+        candidates = healthy or candidates
+        if not candidates:
+            return None
+        start = self._next
+        self._next = (self._next + 1) % len(self.members)
+        return min(candidates, key=lambda i: (self.members[i].in_flight, (i - start) % len(self.members)))
+
+    def record(self, member: Member, failed: bool) -> None:
+        if not failed:
+            member.failures = 0
+            return
+        member.failures += 1
+        if member.failures >= self.eject_threshold:
+            member.failures = 0
+            member.ejections += 1
+            member.ejected_until = self.clock() + self.eject_time
+
+    def route(self, request: httpx.Request, member: Member) -> httpx.Request:
+        """Copy of `request` addressed to `member` instead of the client's base URL"""
+        path = member.url.path + request.url.path[len(self.base_path) :]
+        url = member.url.copy_with(path=path, query=request.url.query or None)
+        headers = request.headers.copy()
+        headers["Host"] = url.netloc.decode("ascii")
+        return httpx.Request(request.method, url, headers=headers, stream=request.stream, extensions=request.extensions)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not request.url.path.startswith(self.prefix):
+            return await self.transport.handle_async_request(request)
+
+        tried: Set[int] = set()
+        while True:
+            index = self.pick(tried)
+            member = self.members[index]
+            tried.add(index)
+            member.requests += 1
+            member.in_flight += 1
+            try:
+                response = await member.transport.handle_async_request(self.route(request, member))
+            except Exception as e:
+                member.in_flight -= 1
+                self.record(member, isinstance(e, httpx.TransportError))
+                if isinstance(e, NOT_SENT_ERRORS) and len(tried) < len(self.members):
+                    self.failovers += 1
+                    continue
+                raise
+            self.record(member, response.status_code in UNAVAILABLE_STATUSES)
+            return httpx.Response(
+                status_code=response.status_code,
+                headers=response.headers,
+                stream=MemberStream(response.stream, member),
+                extensions=response.extensions,
+            )
+
+    async def aclose(self) -> None:
+        for member in self.members:
+            await member.transport.aclose()
+        await self.transport.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        now = self.clock()
+        return {
+            "failovers": self.failovers,
+            "members": {str(member.url): member.stats(now) for member in self.members},
+        }
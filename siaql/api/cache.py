@@ -0,0 +1,127 @@
+# siaql/api/cache.py
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from siaql.api.decoding import capture_digests, record_digests
+
+
+@dataclass
+class CachePolicy:
+    """Which client methods are cached, for how long, and which calls invalidate them"""
+
+    # Client method name -> seconds a response stays fresh
+    ttls: Dict[str, float] = field(default_factory=dict)
+    # Client method name (usually a mutation) -> cached methods it makes stale
+    invalidates: Dict[str, List[str]] = field(default_factory=dict)
+    # Client methods whose responses only change when the chain tip moves, cached per tip
+    tip_scoped: List[str] = field(default_factory=list)
+    # Upper bound on how long a tip-scoped response is kept, in case tip changes are missed
+    tip_ttl: float = 600.0
+    max_entries: int = 1024
+
+    def with_ttls(self, ttls: Dict[str, float]) -> "CachePolicy":
+        """Copy of this policy with some TTLs overridden, a TTL of 0 disables caching for a method"""
+        merged = {**self.ttls, **ttls}
+        return replace(self, ttls={method: ttl for method, ttl in merged.items() if ttl > 0})
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of decoded client responses with per-method TTLs
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, policy: CachePolicy, clock: Callable[[], float] = time.monotonic):
+        self.policy = policy
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        # Current chain tip, tip-scoped methods are only cached while it is known
+        self.tip: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(method: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[str, str]:
+        return method, repr((args, sorted(kwargs.items())))
+
+    def get(self, key: Tuple[str, str]) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires, value = entry
+        if expires <= self.clock():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: Tuple[str, str], value: Any, ttl: float) -> None:
+        self._entries[key] = (self.clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.policy.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *methods: str) -> None:
+        """Drop every cached response of the given methods, or everything if none are given"""
+        stale = [key for key in self._entries if not methods or key[0] in methods]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+
+    def set_tip(self, tip: Optional[str]) -> None:
+        """Move to a new chain tip, dropping every tip-scoped response at once"""
+        if tip != self.tip:
+            self.tip = tip
+            if self.policy.tip_scoped:
+                self.invalidate(*self.policy.tip_scoped)
+
+    async def call(
+        self, method: str, func: Callable[..., Awaitable[Any]], args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> Any:
+        """Serve a client call from the cache, or make it and cache the result per the policy"""
+        # Keys skip the client instance itself, and tip-scoped keys include the tip they were fetched at
+        tip = self.tip
+        if method in self.policy.tip_scoped and tip is not None:
+            ttl: Optional[float] = self.policy.tip_ttl
+            key = self.make_key(method, (tip, *args[1:]), kwargs)
+        else:
+            ttl = self.policy.ttls.get(method)
+            key = self.make_key(method, args[1:], kwargs)
+
+        if ttl is None:
+            result = await func(*args, **kwargs)
+        else:
+            hit, value = self.get(key)
+            if hit:
+                self.hits += 1
+                # Served again with the digests of the bodies it was decoded from, see capture_digests
+                result, digests = value
+                record_digests(digests)
+                return result
+            self.misses += 1
+            with capture_digests() as digests:
+                result = await func(*args, **kwargs)
+            record_digests(digests)
+            # Don't store a response that may predate a tip change seen while it was in flight
+            if tip == self.tip:
+                self.set(key, (result, tuple(digests)), ttl)
+
+        stale = self.policy.invalidates.get(method)
+        if stale:
+            self.invalidate(*stale)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.policy.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,268 @@
+# siaql/api/compression.py
+import re
+import zlib
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Sequence, Tuple
+
+import httpx
+
+from siaql.api.singleflight import NO_COALESCE
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+
+class Decompressor(ABC):
+    """Incremental decoder of one response body"""
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        """Decode the next chunk of the body"""
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class ZlibDecompressor(Decompressor):
+    def __init__(self, wbits: int):
+        self.decoder = zlib.decompressobj(wbits)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self.decoder.decompress(data)
+
+    def flush(self) -> bytes:
+        return self.decoder.flush()
+
+
+class DeflateDecompressor(ZlibDecompressor):
+    """Deflate is meant to be zlib wrapped, but some servers send raw deflate streams"""
+
+    def __init__(self):
+        super().__init__(zlib.MAX_WBITS)
+        self.started = False
+
+    def decompress(self, data: bytes) -> bytes:
+        if not self.started and data:
+            self.started = True
+            try:
+                return self.decoder.decompress(data)
+            except zlib.error:
+                self.decoder = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self.decoder.decompress(data)
+
+
+class BrotliDecompressor(Decompressor):
+    def __init__(self):
+        decoder = brotli.Decompressor()
+        # brotli names it process, brotlicffi decompress
+        self.process = getattr(decoder, "process", None) or decoder.decompress
+
+    def decompress(self, data: bytes) -> bytes:
+        return self.process(data)
+
+
+class ZstdDecompressor(Decompressor):
+    def __init__(self):
+        self.decoder = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, data: bytes) -> bytes:
+        return self.decoder.decompress(data)
+
+
+# Content codings in order of preference, the denser first
+CODECS: Dict[str, Callable[[], Decompressor]] = {}
+if zstandard is not None:
+    CODECS["zstd"] = ZstdDecompressor
+if brotli is not None:
+    CODECS["br"] = BrotliDecompressor
+CODECS["gzip"] = lambda: ZlibDecompressor(zlib.MAX_WBITS | 16)
+CODECS["deflate"] = DeflateDecompressor
+
+# Path segments that identify a single resource, collapsed so they don't split the per-endpoint stats
+ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F]{16,}|\w+:[0-9a-fA-F]{16,})$")
+
+
+@lru_cache(maxsize=None)
+def default_accept_encoding() -> Optional[str]:
+    """The Accept-Encoding httpx sends unless told otherwise, any other value was set by the caller"""
+    with httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200))) as client:
+        return client.headers.get("accept-encoding")
+
+
+def resolve_codecs(codecs: Optional[Sequence[str]] = None) -> Tuple[str, ...]:
+    """Validate content codings to ask the daemons for, every available one if none are given"""
+    if codecs is None:
+        return tuple(CODECS)
+    unavailable = [codec for codec in codecs if codec not in CODECS]
+    if unavailable:
+        raise ValueError(
+            f"Unsupported upstream compression {', '.join(unavailable)}, available: {', '.join(CODECS)}"
+            " (br needs brotli, zstd needs zstandard)"
+        )
+    return tuple(codec for codec in CODECS if codec in codecs)
+
+
+def endpoint_name(request: httpx.Request) -> str:
+    segments = ["{id}" if ID_SEGMENT.match(segment) else segment for segment in request.url.path.split("/")]
+    return f"{request.method} {'/'.join(segments)}"
+
+
+class EndpointCompression:
+    """Bytes on the wire and after decoding of one endpoint's responses"""
+
+    def __init__(self):
+        self.responses = 0
+        self.compressed = 0
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+
+    def record(self, compressed: bool, wire_bytes: int, decoded_bytes: int) -> None:
+        self.responses += 1
+        self.compressed += compressed
+        self.wire_bytes += wire_bytes
+        self.decoded_bytes += decoded_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "responses": self.responses,
+            "compressedResponses": self.compressed,
+            "wireBytes": self.wire_bytes,
+            "decodedBytes": self.decoded_bytes,
+            "bytesSaved": self.decoded_bytes - self.wire_bytes,
+            "ratio": round(self.decoded_bytes / self.wire_bytes, 2) if self.wire_bytes else None,
+        }
+
+
+class DecompressingStream(httpx.AsyncByteStream):
+    """Response stream that decodes the body chunk by chunk as it arrives"""
+
+    def __init__(
+        self,
+        stream: httpx.AsyncByteStream,
+        decoder: Optional[Decompressor],
+        request: httpx.Request,
+        on_close: Callable[[int, int], None],
+    ):
+        self.stream = stream
+        self.decoder = decoder
+        self.request = request
+        self.on_close = on_close
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self.closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self.stream:
+                self.wire_bytes += len(chunk)
+                if self.decoder is not None:
+                    chunk = self.decoder.decompress(chunk)
+                if chunk:
+                    self.decoded_bytes += len(chunk)
+                    yield chunk
+            if self.decoder is not None:
+                chunk = self.decoder.flush()
+                if chunk:
+                    self.decoded_bytes += len(chunk)
+                    yield chunk
+        except httpx.HTTPError:
+            raise
+        except Exception as e:
+            raise httpx.DecodingError(f"Failed to decode the response body: {e}", request=self.request) from e
+
+    async def aclose(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.on_close(self.wire_bytes, self.decoded_bytes)
+        await self.stream.aclose()
+
+
+class CompressionTransport(httpx.AsyncBaseTransport):
+    """Transport that asks a daemon for compressed responses and decodes them as they stream in
+
+    Requests advertise the content codings in `codecs` (none asks for identity), unless the caller
+    set its own Accept-Encoding or streams the body (`NO_COALESCE`), those pass through untouched.
+    The decoded body replaces the encoded one before httpx sees it, so daemons or reverse proxies that compress with
+    zstd work even though httpx can't decode it itself. Wire and decoded bytes are counted per
+    endpoint, with resource IDs in the path collapsed.
+    """
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, codecs: Sequence[str] = tuple(CODECS), max_endpoints: int = 256
+    ):
+        self.transport = transport
+        self.codecs = tuple(codecs)
+        self.accept_encoding = ", ".join(self.codecs) or "identity"
+        self.max_endpoints = max_endpoints
+        self.endpoints: Dict[str, EndpointCompression] = {}
+
+    def endpoint(self, request: httpx.Request) -> EndpointCompression:
+        name = endpoint_name(request)
+        if name not in self.endpoints and len(self.endpoints) >= self.max_endpoints:
+            name = "other"
+        return self.endpoints.setdefault(name, EndpointCompression())
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # Streamed bodies are relayed as they are, and callers asking for codings themselves decode them
+        accept_encoding = request.headers.get("accept-encoding")
+        if request.extensions.get(NO_COALESCE) or accept_encoding not in (None, default_accept_encoding()):
+            return await self.transport.handle_async_request(request)
+        request.headers["Accept-Encoding"] = self.accept_encoding
+        response = await self.transport.handle_async_request(request)
+
+        encoding = response.headers.get("content-encoding", "").strip().lower()
+        if encoding in ("", "identity"):
+            decoder = None
+        elif encoding in CODECS:
+            decoder = CODECS[encoding]()
+        else:
+            # Stacked or unknown codings are left for httpx to decode
+            return response
+        headers = response.headers
+        if decoder is not None:
+            # The decoded body has neither the coding nor the length of the one on the wire
+            headers = httpx.Headers(
+                [
+                    (name, value)
+                    for name, value in response.headers.multi_items()
+                    if name.lower() not in ("content-encoding", "content-length")
+                ]
+            )
+        endpoint = self.endpoint(request)
+
+        def record(wire_bytes: int, decoded_bytes: int) -> None:
+            endpoint.record(decoder is not None, wire_bytes, decoded_bytes)
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=headers,
+            stream=DecompressingStream(response.stream, decoder, request, record),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        total = EndpointCompression()
+        for endpoint in self.endpoints.values():
+            total.responses += endpoint.responses
+            total.compressed += endpoint.compressed
+            total.wire_bytes += endpoint.wire_bytes
+            total.decoded_bytes += endpoint.decoded_bytes
+        return {
+            "acceptEncoding": self.accept_encoding,
+            **total.stats(),
+            "endpoints": {name: endpoint.stats() for name, endpoint in sorted(self.endpoints.items())},
+        }
@@ -0,0 +1,96 @@
+# siaql/api/deadline.py
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterator, Optional, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+# Request header a GraphQL client sets its time budget in, in seconds
+DEADLINE_HEADER = "X-Request-Timeout"
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a GraphQL request runs out of time before an upstream call completes"""
+
+    pass
+
+
+class Deadline:
+    """Point in time by which a GraphQL request, and every upstream call it makes, must be done"""
+
+    def __init__(self, expires_at: float, clock: Callable[[], float] = time.monotonic):
+        self.expires_at = expires_at
+        self.clock = clock
+
+    @classmethod
+    def after(cls, seconds: float, clock: Callable[[], float] = time.monotonic) -> "Deadline":
+        return cls(clock() + seconds, clock)
+
+    def remaining(self) -> float:
+        """Seconds left, never negative"""
+        return max(0.0, self.expires_at - self.clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+# Deadline of the GraphQL request the current task is working for, if any
+current_deadline: ContextVar[Optional[Deadline]] = ContextVar("siaql_deadline", default=None)
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left before the current request's deadline, or None without a deadline"""
+    deadline = current_deadline.get()
+    return None if deadline is None else deadline.remaining()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[None]:
+    """Make `deadline` the current deadline for upstream calls made in this block"""
+    token = current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        current_deadline.reset(token)
+
+
+async def within_deadline(awaitable: Awaitable[T], deadline: Optional[Deadline]) -> T:
+    """Await `awaitable`, cancelling it and raising DeadlineExceeded once the deadline passes"""
+    if deadline is None:
+        return await awaitable
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        # Close the coroutine that will never run so it doesn't warn about never being awaited
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded("Request deadline exceeded before the upstream call was made")
+    try:
+        return await asyncio.wait_for(awaitable, remaining)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(f"Request deadline exceeded, upstream call cancelled after {remaining:.2f}s") from None
+
+
+class DeadlineTransport(httpx.AsyncBaseTransport):
+    """Transport that caps every request's timeouts at the time left before the current deadline"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        remaining = remaining_budget()
+        if remaining is not None:
+            if remaining <= 0:
+                raise httpx.PoolTimeout("Request deadline exceeded", request=request)
+            timeout: Any = request.extensions.get("timeout", {})
+            request.extensions["timeout"] = {
+                phase: remaining if value is None else min(value, remaining) for phase, value in timeout.items()
+            } or {phase: remaining for phase in ("connect", "read", "write", "pool")}
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
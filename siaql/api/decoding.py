@@ -0,0 +1,107 @@
+# siaql/api/decoding.py
+import hashlib
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import httpx
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+Decoder = Callable[[bytes], Any]
+
+
+def stdlib_loads(data: bytes) -> Any:
+    return json.loads(data)
+
+
+def orjson_loads(data: bytes) -> Any:
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # orjson is stricter than the stdlib about a few inputs, such as lone surrogates
+        return json.loads(data)
+
+
+DECODERS: Dict[str, Decoder] = {"stdlib": stdlib_loads}
+if orjson is not None:
+    DECODERS["orjson"] = orjson_loads
+
+# The decoder every client response goes through
+_loads: Decoder = DECODERS.get("orjson", stdlib_loads)
+
+
+def register_decoder(name: str, decoder: Decoder) -> None:
+    """Make a decoder taking the raw response bytes available to `use_decoder`"""
+    DECODERS[name] = decoder
+
+
+def use_decoder(name: Optional[str] = None) -> str:
+    """Switch the decoder used for upstream responses, the fastest available one if no name is given"""
+    global _loads
+    if name is None or name == "auto":
+        name = "orjson" if "orjson" in DECODERS else "stdlib"
+    if name not in DECODERS:
+        raise ValueError(f"Unknown JSON decoder '{name}', available: {', '.join(sorted(DECODERS))}")
+    _loads = DECODERS[name]
+    return name
+
+
+def current_decoder() -> str:
+    return next(name for name, decoder in DECODERS.items() if decoder is _loads)
+
+
+def loads(data: bytes) -> Any:
+    return _loads(data)
+
+
+# Digests of the responses decoded while a capture is active, see `capture_digests`
+_digests: ContextVar[Optional[List[bytes]]] = ContextVar("siaql_body_digests", default=None)
+
+
+def response_digest(response: httpx.Response) -> bytes:
+    """Digest of a response body together with the URL it was fetched from"""
+    digest = hashlib.blake2b(response.content, digest_size=16)
+    try:
+        digest.update(str(response.request.url).encode())
+    except RuntimeError:
+        # Responses built by hand have no request
+        pass
+    return digest.digest()
+
+
+@contextmanager
+def capture_digests() -> Iterator[List[bytes]]:
+    """Collect the digests of every response decoded in this block, including by tasks it starts"""
+    digests: List[bytes] = []
+    token = _digests.set(digests)
+    try:
+        yield digests
+    finally:
+        _digests.reset(token)
+
+
+def record_digests(digests: Iterable[bytes]) -> None:
+    """Add digests to the active capture, for responses that are served again without decoding"""
+    captured = _digests.get()
+    if captured is not None:
+        captured.extend(digests)
+
+
+def decode_json(response: httpx.Response, exact_integers: bool = False) -> Any:
+    """Decode a response body straight from its raw bytes
+
+    Fast decoders such as orjson turn integers beyond 64 bits into floats, responses that carry
+    them (Go big.Int values, like renterd's account balances) pass `exact_integers=True` to be
+    decoded by the stdlib instead.
+    """
+    captured = _digests.get()
+    if captured is not None:
+        captured.append(response_digest(response))
+    if exact_integers:
+        return json.loads(response.content)
+    return _loads(response.content)
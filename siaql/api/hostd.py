@@ -1,5 +1,6 @@
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Union
+from enum import Enum
+from typing import AsyncIterator, List, Optional, Dict, Any, Union
 import httpx
 from siaql.graphql.schemas.types import (
     AddVolumeRequest,
@@ -35,7 +36,40 @@ from siaql.graphql.schemas.types import (
     WalletResponse,
     Currency,
 )
-from siaql.api.utils import handle_api_errors
+from siaql.api.cache import CachePolicy, ResponseCache
+from siaql.api.decoding import decode_json
+from siaql.api.pool import ConnectionPool, socket_url
+from siaql.api.resilience import CircuitBreaker, RetryPolicy
+from siaql.api.utils import clamp_concurrency, collect, fan_out, handle_api_errors, paginate
+
+
+# Responses that rarely change, cached when the client is given a response cache
+CACHE_POLICY = CachePolicy(
+    ttls={
+        "get_consensus_network": 3600.0,
+        "get_syncer_address": 3600.0,
+        "get_settings": 60.0,
+        "get_pinned_settings": 60.0,
+        "get_webhooks": 60.0,
+    },
+    invalidates={
+        "patch_settings": ["get_settings"],
+        "put_pinned_settings": ["get_pinned_settings", "get_settings"],
+        "post_webhooks": ["get_webhooks"],
+        "put_webhooks": ["get_webhooks"],
+        "delete_webhooks": ["get_webhooks"],
+    },
+    # Confirmed chain data that only changes when the tip moves
+    tip_scoped=["get_consensus_tip_state", "get_wallet_events"],
+)
+
+
+def contract_filter_body(filter: Union[ContractFilter, Dict[str, Any]]) -> Dict[str, Any]:
+    """JSON body of a contract search, camelCase keys without the unset fields and statuses by name"""
+    body = filter.dict() if hasattr(filter, "dict") else dict(filter)
+    if body.get("statuses"):
+        body["statuses"] = [status.name.lower() if isinstance(status, Enum) else status for status in body["statuses"]]
+    return body
 
 
 class HostdError(Exception):
@@ -47,14 +81,25 @@ class HostdError(Exception):
 class HostdClient:
     """Client for interacting with the Hostd REST API"""
 
-    def __init__(self, base_url: str, api_password: Optional[str] = None):
-        # Ensure base_url doesn't have trailing slash and has /api
-        self.base_url = f"{base_url.rstrip('/')}/api"
-        if api_password:
-            auth = httpx.BasicAuth(username="", password=api_password)
-            self.client = httpx.AsyncClient(base_url=self.base_url, auth=auth, timeout=30.0)
-        else:
-            self.client = httpx.AsyncClient(base_url=self.base_url, timeout=30.0)
+    # Client method polled to follow the chain tip
+    tip_method = "get_consensus_tip"
+
+    def __init__(
+        self,
+        base_url: str,
+        api_password: Optional[str] = None,
+        pool: Optional[ConnectionPool] = None,
+        cache: Optional[ResponseCache] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        # Ensure base_url doesn't have trailing slash and has /api, unix:// socket URLs included
+        self.base_url = f"{socket_url(base_url).rstrip('/')}/api"
+        self.pool = pool or ConnectionPool()
+        self.client = self.pool.create_client("hostd", self.base_url, api_password)
+        self.cache = cache
+        self.retry = retry
+        self.breaker = breaker
 
     async def close(self):
         """Close the HTTP client"""
@@ -66,7 +111,7 @@ class HostdClient:
         """Get the current state of the hostd daemon"""
         response = await self.client.get("/state")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     # Consensus endpoints
     @handle_api_errors(HostdError)
@@ -74,21 +119,21 @@ class HostdClient:
         """Get the current consensus tip"""
         response = await self.client.get("/consensus/tip")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def get_consensus_tip_state(self) -> ConsensusState:
         """Get the current consensus tip state"""
         response = await self.client.get("/consensus/tipstate")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def get_consensus_network(self) -> Network:
         """Get consensus network parameters"""
         response = await self.client.get("/consensus/network")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     # Syncer endpoints
     @handle_api_errors(HostdError)
@@ -96,14 +141,14 @@ class HostdClient:
         """Get syncer address"""
         response = await self.client.get("/syncer/address")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def get_syncer_peers(self) -> List[Peer]:
         """Get list of connected peers"""
         response = await self.client.get("/syncer/peers")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def put_syncer_peer(self, address: str) -> None:
@@ -117,7 +162,7 @@ class HostdClient:
         """Get current index tip"""
         response = await self.client.get("/index/tip")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     # Alert endpoints
     @handle_api_errors(HostdError)
@@ -125,7 +170,7 @@ class HostdClient:
         """Get active alerts"""
         response = await self.client.get("/alerts")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def post_alerts_dismiss(self, ids: List[Hash256]) -> None:
@@ -139,14 +184,14 @@ class HostdClient:
         """Get host settings"""
         response = await self.client.get("/settings")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def patch_settings(self, settings: HostSettings) -> HostSettings:
         """Update host settings"""
         response = await self.client.patch("/settings", json=settings)
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def post_announce(self) -> None:
@@ -165,7 +210,7 @@ class HostdClient:
         """Get pinned settings"""
         response = await self.client.get("/settings/pinned")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def put_pinned_settings(self, settings: PinnedSettings) -> None:
@@ -182,7 +227,7 @@ class HostdClient:
             params["timestamp"] = timestamp.isoformat()
         response = await self.client.get("/metrics", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def get_period_metrics(self, start: datetime, periods: int, interval: MetricsInterval) -> List[Metrics]:
@@ -190,29 +235,29 @@ class HostdClient:
         params = {"start": start.isoformat(), "periods": str(periods)}
         response = await self.client.get(f"/metrics/{interval}", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     # Contract endpoints
     @handle_api_errors(HostdError)
     async def post_contracts(self, filter: ContractFilter) -> HostdContractsResponse:
         """Get contracts matching filter"""
-        response = await self.client.post("/contracts", json=filter)
+        response = await self.client.post("/contracts", json=contract_filter_body(filter))
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def get_contract(self, id: FileContractID) -> Contract:
         """Get specific contract"""
         response = await self.client.get(f"/contracts/{id}")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def get_contract_integrity(self, id: FileContractID) -> IntegrityCheckResult:
         """Get contract integrity check result"""
         response = await self.client.get(f"/contracts/{id}/integrity")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def put_contract_integrity(self, id: FileContractID) -> None:
@@ -233,14 +278,30 @@ class HostdClient:
         params = {"limit": limit, "offset": offset}
         response = await self.client.get("/accounts", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
+
+    def iter_accounts(self, page_size: int = 100, prefetch: int = 1) -> AsyncIterator[HostdAccount]:
+        """Stream all accounts, page by page"""
+        return paginate(lambda offset, limit: self.get_accounts(limit=limit, offset=offset), page_size, prefetch)
 
     @handle_api_errors(HostdError)
     async def get_account_funding(self, account: str) -> List[FundingSource]:
         """Get account funding sources"""
         response = await self.client.get(f"/accounts/{account}/funding")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
+
+    async def get_accounts_funding(
+        self, accounts: Optional[List[str]] = None, concurrency: int = 16
+    ) -> List[Dict[str, Any]]:
+        """Get funding sources for many accounts, or every account if none are given
+
+        `concurrency` is clamped to `1..MAX_FAN_OUT`.
+        """
+        if accounts is None:
+            accounts = [account["id"] for account in await collect(self.iter_accounts())]
+        results = await fan_out(accounts, self.get_account_funding, clamp_concurrency(concurrency))
+        return [{"account": account, "funding": funding, "error": error} for account, funding, error in results]
 
     # Sector endpoints
     @handle_api_errors(HostdError)
@@ -254,7 +315,7 @@ class HostdClient:
         """Verify a sector"""
         response = await self.client.get(f"/sectors/{root}/verify")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     # Volume endpoints
     @handle_api_errors(HostdError)
@@ -262,21 +323,21 @@ class HostdClient:
         """Get all volumes"""
         response = await self.client.get("/volumes")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def post_volume(self, req: AddVolumeRequest) -> Volume:
         """Add a new volume"""
         response = await self.client.post("/volumes", json=req)
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def get_volume(self, id: int) -> VolumeMeta:
         """Get specific volume"""
         response = await self.client.get(f"/volumes/{id}")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def put_volume(self, id: int, req: UpdateVolumeRequest) -> None:
@@ -310,7 +371,7 @@ class HostdClient:
         params = {"path": path}
         response = await self.client.get("/system/dir", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def put_system_dir(self, path: str) -> None:
@@ -332,7 +393,7 @@ class HostdClient:
         """Get wallet state"""
         response = await self.client.get("/wallet")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def get_wallet_events(self, limit: int = 100, offset: int = 0) -> List[WalletEvent]:
@@ -340,21 +401,25 @@ class HostdClient:
         params = {"limit": limit, "offset": offset}
         response = await self.client.get("/wallet/events", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
+
+    def iter_wallet_events(self, page_size: int = 100, prefetch: int = 1) -> AsyncIterator[WalletEvent]:
+        """Stream all wallet events, page by page"""
+        return paginate(lambda offset, limit: self.get_wallet_events(limit=limit, offset=offset), page_size, prefetch)
 
     @handle_api_errors(HostdError)
     async def get_wallet_pending(self) -> List[WalletEvent]:
         """Get pending wallet events"""
         response = await self.client.get("/wallet/pending")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def post_wallet_send(self, req: WalletSendSiacoinsRequest) -> TransactionID:
         """Send siacoins"""
         response = await self.client.post("/wallet/send", json=req)
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     # TPool endpoints
     @handle_api_errors(HostdError)
@@ -362,7 +427,7 @@ class HostdClient:
         """Get recommended transaction fee"""
         response = await self.client.get("/tpool/fee")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     # Webhook endpoints
     @handle_api_errors(HostdError)
@@ -370,21 +435,21 @@ class HostdClient:
         """Get all webhooks"""
         response = await self.client.get("/webhooks")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def post_webhooks(self, req: RegisterWebHookRequest) -> Webhook:
         """Register a new webhook"""
         response = await self.client.post("/webhooks", json=req)
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def put_webhooks(self, id: int, req: RegisterWebHookRequest) -> Webhook:
         """Update an existing webhook"""
         response = await self.client.put(f"/webhooks/{id}", json=req)
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(HostdError)
     async def post_webhooks_test(self, id: int) -> None:
@@ -0,0 +1,200 @@
+# siaql/api/limiter.py
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional
+
+import httpx
+
+from siaql.api.deadline import remaining_budget
+from siaql.api.singleflight import NO_COALESCE
+from siaql.api.resilience import UNAVAILABLE_STATUSES
+
+
+class AdaptiveLimiter:
+    """AIMD limit on the number of requests in flight to a daemon
+
+    The limit grows by about one per round trip while the daemon is kept busy and its latency
+    stays healthy, and is cut by `backoff` when requests fail or the recent latency rises above
+    `tolerance` times the long-term average. Calls beyond the limit wait their turn in FIFO order.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        backoff: float = 0.75,
+        tolerance: float = 2.0,
+        min_latency: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        # Latencies below this are always healthy, however they compare to the average
+        self.min_latency = min_latency
+        self.clock = clock
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Recent and long-term exponentially weighted latency averages, in seconds
+        self.recent_latency: Optional[float] = None
+        self.baseline_latency: Optional[float] = None
+        self._last_decrease = float("-inf")
+        self.increases = 0
+        self.decreases = 0
+        self.peak_queued = 0
+
+    @property
+    def current_limit(self) -> int:
+        return int(self.limit)
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self) -> None:
+        """Wait for a slot, in arrival order"""
+        if self.in_flight < self.current_limit and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled, pass it on
+                self.in_flight -= 1
+                self._wake()
+            raise
+
+    def release(self, latency: Optional[float] = None, failed: bool = False) -> None:
+        """Give a slot back, adjusting the limit by how the call went"""
+        saturated = self.in_flight >= self.current_limit or self.queued > 0
+        self.in_flight -= 1
+        if failed:
+            self._decrease()
+        elif latency is not None:
+            self._observe(latency, saturated)
+        self._wake()
+
+    def _observe(self, latency: float, saturated: bool) -> None:
+        if self.recent_latency is None:
+            self.recent_latency = self.baseline_latency = latency
+        else:
+            self.recent_latency += 0.3 * (latency - self.recent_latency)
+            self.baseline_latency += 0.02 * (latency - self.baseline_latency)
+        if self.recent_latency > max(self.min_latency, self.tolerance * self.baseline_latency):
+            self._decrease()
+        elif saturated and self.limit < self.max_limit:
+            # Additive increase, spread over a full window of calls
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.increases += 1
+
+    def _decrease(self) -> None:
+        # Back off at most once per round trip, the calls already in flight report the same congestion
+        now = self.clock()
+        if now - self._last_decrease < (self.recent_latency or 0):
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+        self.decreases += 1
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.current_limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.current_limit,
+            "inFlight": self.in_flight,
+            "queued": self.queued,
+            "peakQueued": self.peak_queued,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "recentLatencyMs": None if self.recent_latency is None else round(self.recent_latency * 1000, 1),
+            "baselineLatencyMs": None if self.baseline_latency is None else round(self.baseline_latency * 1000, 1),
+        }
+
+
+class LimitedStream(httpx.AsyncByteStream):
+    """Response stream that holds its limiter slot until it is closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, limiter: AdaptiveLimiter, latency: float, failed: bool):
+        self.stream = stream
+        self.limiter = limiter
+        self.latency = latency
+        self.failed = failed
+        self.closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.limiter.release(self.latency, self.failed)
+        await self.stream.aclose()
+
+
+class LimiterTransport(httpx.AsyncBaseTransport):
+    """Transport that keeps a daemon's in-flight requests within its adaptive limit
+
+    Transfers, requests with a streamed body or marked `NO_COALESCE` for a streamed response,
+    bypass the limit: they can stay open for as long as the client reads, and would otherwise
+    leave every other call queued behind them.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: AdaptiveLimiter):
+        self.transport = transport
+        self.limiter = limiter
+
+    @staticmethod
+    def is_transfer(request: httpx.Request) -> bool:
+        return bool(request.extensions.get(NO_COALESCE)) or not isinstance(request.stream, httpx.ByteStream)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.is_transfer(request):
+            return await self.transport.handle_async_request(request)
+
+        budget = remaining_budget()
+        try:
+            if budget is None:
+                await self.limiter.acquire()
+            else:
+                await asyncio.wait_for(self.limiter.acquire(), budget)
+        except asyncio.TimeoutError:
+            raise httpx.PoolTimeout("Request deadline exceeded while queued for the daemon", request=request)
+
+        start = self.limiter.clock()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except Exception as e:
+            # Running out of the request's own time says nothing about the daemon
+            budget = remaining_budget()
+            deadline_hit = isinstance(e, httpx.TimeoutException) and budget is not None and budget <= 0
+            self.limiter.release(failed=isinstance(e, httpx.TransportError) and not deadline_hit)
+            raise
+        except BaseException:
+            self.limiter.release()
+            raise
+        latency = self.limiter.clock() - start
+        failed = response.status_code in UNAVAILABLE_STATUSES
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=LimitedStream(response.stream, self.limiter, latency, failed),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
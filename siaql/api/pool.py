@@ -0,0 +1,251 @@
+# siaql/api/pool.py
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote, unquote
+
+import httpx
+
+from siaql.api.balancer import BalancerTransport, Member
+from siaql.api.compression import CompressionTransport, resolve_codecs
+from siaql.api.deadline import DeadlineTransport
+from siaql.api.limiter import AdaptiveLimiter, LimiterTransport
+from siaql.api.replay import Journal, RecordingTransport, ReplayTransport
+from siaql.api.singleflight import SingleFlightTransport
+
+
+# Daemon URLs in this scheme point at a unix domain socket, e.g. unix:///run/renterd/api.sock
+UNIX_SCHEME = "unix://"
+# The same with the socket path quoted into the host, so API paths can be appended like to any other URL
+SOCKET_SCHEME = "http+unix://"
+
+
+def socket_url(url: str) -> str:
+    """Turn a unix:// daemon URL into an http+unix:// base URL, other URLs are returned as is"""
+    if not url.startswith(UNIX_SCHEME):
+        return url
+    return SOCKET_SCHEME + quote(url[len(UNIX_SCHEME) :].rstrip("/"), safe="")
+
+
+def split_socket_url(url: str) -> Tuple[Optional[str], str]:
+    """Split a base URL into the unix socket to connect to, if any, and the HTTP URL to request"""
+    url = socket_url(url)
+    if not url.startswith(SOCKET_SCHEME):
+        return None, url
+    socket, _, path = url[len(SOCKET_SCHEME) :].partition("/")
+    return unquote(socket), f"http://localhost/{path}"
+
+
+@dataclass
+class PoolLimits:
+    """Connection pool settings for a single daemon"""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 5.0
+    http2: bool = False
+    timeout: float = 30.0
+
+    def to_httpx(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+class MeteredStream(httpx.AsyncByteStream):
+    """Response stream that reports back to its transport once it is closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, transport: "MeteredTransport"):
+        self.stream = stream
+        self.transport = transport
+        self.closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.transport.in_flight -= 1
+        await self.stream.aclose()
+
+
+class MeteredTransport(httpx.AsyncBaseTransport):
+    """Shared transport that counts the requests flowing through a daemon's pool"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+        self.users = 0
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            response = await self.transport.handle_async_request(request)
+        except Exception:
+            self.errors += 1
+            self.in_flight -= 1
+            raise
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=MeteredStream(response.stream, self),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        # The transport is shared between clients, only close it with its last user
+        self.users -= 1
+        if self.users <= 0:
+            await self.transport.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "inFlight": self.in_flight,
+            "peakInFlight": self.peak_in_flight,
+        }
+
+
+class ConnectionPool:
+    """Shared HTTP transports for the daemon clients, one pool per daemon"""
+
+    def __init__(
+        self,
+        limits: Optional[PoolLimits] = None,
+        daemon_limits: Optional[Dict[str, PoolLimits]] = None,
+        coalesce_gets: bool = True,
+        adaptive_concurrency: bool = False,
+        journal: Optional[Journal] = None,
+        replay_records: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        replay_latency_scale: float = 1.0,
+        compression: Optional[Sequence[str]] = None,
+    ):
+        self.limits = limits or PoolLimits()
+        self.daemon_limits = daemon_limits or {}
+        self.coalesce_gets = coalesce_gets
+        self.adaptive_concurrency = adaptive_concurrency
+        # Daemon traffic is recorded to `journal`, or answered from `replay_records` without any daemon
+        self.journal = journal
+        self.replay_records = replay_records
+        self.replay_latency_scale = replay_latency_scale
+        # Content codings asked of the daemons, every available one by default
+        self.compression = resolve_codecs(compression)
+        self._replay: Dict[str, ReplayTransport] = {}
+        self._compression: Dict[str, CompressionTransport] = {}
+        self._http: Dict[str, httpx.AsyncHTTPTransport] = {}
+        self._singleflight: Dict[str, SingleFlightTransport] = {}
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+        self._transports: Dict[str, MeteredTransport] = {}
+        self._balancers: Dict[str, BalancerTransport] = {}
+
+    def limits_for(self, daemon: str) -> PoolLimits:
+        """Get the pool settings for a daemon, falling back to the shared defaults"""
+        return self.daemon_limits.get(daemon, self.limits)
+
+    def transport(
+        self, daemon: str, limits: Optional[PoolLimits] = None, uds: Optional[str] = None
+    ) -> MeteredTransport:
+        """Get the shared transport for a daemon, connecting over the unix socket `uds` if given"""
+        if daemon not in self._transports:
+            limits = limits or self.limits_for(daemon)
+            if self.replay_records is not None:
+                records = self.replay_records.get(daemon, [])
+                transport = self._replay[daemon] = ReplayTransport(records, self.replay_latency_scale)
+            else:
+                transport = self._http[daemon] = httpx.AsyncHTTPTransport(
+                    limits=limits.to_httpx(), http2=limits.http2, uds=uds
+                )
+                if self.journal is not None:
+                    transport = RecordingTransport(transport, self.journal, daemon)
+            # Journals hold the bodies as sent, so replayed responses are decoded here too
+            transport = self._compression[daemon] = CompressionTransport(transport, self.compression)
+            if self.adaptive_concurrency:
+                # Below coalescing, so requests that share another's response don't take a slot
+                limiter = self._limiters[daemon] = AdaptiveLimiter(max_limit=limits.max_connections)
+                transport = LimiterTransport(transport, limiter)
+            # Requests made on behalf of a GraphQL request get no more time than it has left
+            transport = DeadlineTransport(transport)
+            if self.coalesce_gets:
+                # Above the deadline, so a shared request isn't cut short by whichever caller started it
+                transport = self._singleflight[daemon] = SingleFlightTransport(transport)
+            self._transports[daemon] = MeteredTransport(transport)
+        return self._transports[daemon]
+
+    def create_client(
+        self,
+        daemon: str,
+        base_url: str,
+        api_password: Optional[str] = None,
+        balance_prefix: Optional[str] = None,
+        balance_urls: Sequence[str] = (),
+    ) -> httpx.AsyncClient:
+        """Create an HTTP client for a daemon that shares the daemon's pool
+
+        With `balance_urls`, requests under `balance_prefix` are spread over those daemons instead,
+        each with a pool of its own. Any of the URLs may point at a unix socket.
+        """
+        uds, base_url = split_socket_url(base_url)
+        transport: httpx.AsyncBaseTransport = self.transport(daemon, uds=uds)
+        transport.users += 1
+        if balance_prefix and balance_urls:
+            members = []
+            for i, url in enumerate(balance_urls, start=1):
+                uds, url = split_socket_url(url)
+                member = self.transport(f"{daemon}-{balance_prefix.strip('/')}{i}", self.limits_for(daemon), uds)
+                member.users += 1
+                members.append(Member(url, member))
+            transport = self._balancers[daemon] = BalancerTransport(transport, base_url, balance_prefix, members)
+        auth = httpx.BasicAuth(username="", password=api_password) if api_password else None
+        return httpx.AsyncClient(
+            base_url=base_url, auth=auth, timeout=self.limits_for(daemon).timeout, transport=transport
+        )
+
+    def connection_stats(self, daemon: str) -> Dict[str, Optional[int]]:
+        """Open, idle and active connections of a daemon's pool, None when they can't be told
+
+        httpx doesn't expose its connections, so they are read from the httpcore pool behind the
+        transport when it still looks as expected, and not at all for replayed daemons.
+        """
+        try:
+            connections = list(self._http[daemon]._pool.connections)
+            idle = sum(1 for conn in connections if conn.is_idle())
+        except (KeyError, AttributeError, TypeError):
+            return {"connections": None, "idleConnections": None, "activeConnections": None}
+        return {"connections": len(connections), "idleConnections": idle, "activeConnections": len(connections) - idle}
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get pool, coalescing, concurrency, balancing and compression counters for every daemon with an open pool"""
+        stats = {}
+        for daemon, transport in self._transports.items():
+            stats[daemon] = {"pool": {**transport.stats(), **self.connection_stats(daemon)}}
+            if daemon in self._singleflight:
+                stats[daemon]["singleflight"] = self._singleflight[daemon].stats()
+            if daemon in self._limiters:
+                stats[daemon]["limiter"] = self._limiters[daemon].stats()
+            if daemon in self._balancers:
+                stats[daemon]["balancer"] = self._balancers[daemon].stats()
+            if daemon in self._replay:
+                stats[daemon]["replay"] = self._replay[daemon].stats()
+            if daemon in self._compression:
+                stats[daemon]["compression"] = self._compression[daemon].stats()
+        return stats
+
+    async def aclose(self) -> None:
+        for transport in self._transports.values():
+            await transport.transport.aclose()
+        self._transports.clear()
+        self._singleflight.clear()
+        self._limiters.clear()
+        self._balancers.clear()
+        self._replay.clear()
+        self._compression.clear()
+        self._http.clear()
@@ -1,11 +1,17 @@
 import json
+import os
 from functools import wraps
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncContextManager, AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 import httpx
 from httpx import AsyncClient, BasicAuth
 
-from siaql.api.utils import APIError, handle_api_errors
+from siaql.api.cache import CachePolicy, ResponseCache
+from siaql.api.decoding import decode_json
+from siaql.api.pool import ConnectionPool, socket_url
+from siaql.api.resilience import CircuitBreaker, RetryPolicy
+from siaql.api.singleflight import NO_COALESCE
+from siaql.api.utils import APIError, ChunkSink, handle_api_errors, iter_file, paginate, write_chunks
 from siaql.graphql.schemas.types import (
     Account,
     AccountsFundRequest,
@@ -121,6 +127,57 @@ from siaql.graphql.schemas.types import (
 )
 
 
+# Responses that rarely change, cached when the client is given a response cache
+CACHE_POLICY = CachePolicy(
+    ttls={
+        "get_state": 3600.0,
+        "get_consensus_network": 3600.0,
+        "get_syncer_address": 3600.0,
+        "get_worker_id": 3600.0,
+        "get_gouging_params": 60.0,
+        "get_upload_params": 60.0,
+        "get_settings": 60.0,
+        "get_setting": 60.0,
+        "get_autopilot_config": 60.0,
+        "get_buckets": 60.0,
+        "get_bucket": 60.0,
+        "get_contract_sets": 60.0,
+        "get_hosts_allowlist": 60.0,
+        "get_hosts_blocklist": 60.0,
+        "get_webhooks": 60.0,
+    },
+    invalidates={
+        "update_setting": ["get_settings", "get_setting", "get_gouging_params", "get_upload_params"],
+        "delete_setting": ["get_settings", "get_setting", "get_gouging_params", "get_upload_params"],
+        "update_autopilot_config": ["get_autopilot_config"],
+        "create_bucket": ["get_buckets", "get_bucket"],
+        "delete_bucket": ["get_buckets", "get_bucket"],
+        "update_bucket_policy": ["get_buckets", "get_bucket"],
+        "update_contract_set": ["get_contract_sets", "get_upload_params"],
+        "delete_contract_set": ["get_contract_sets", "get_upload_params"],
+        "update_hosts_allowlist": ["get_hosts_allowlist"],
+        "update_hosts_blocklist": ["get_hosts_blocklist"],
+        "register_webhook": ["get_webhooks"],
+        "delete_webhook": ["get_webhooks"],
+    },
+    # Confirmed chain data that only changes when the tip moves
+    tip_scoped=["get_wallet_outputs", "get_wallet_transactions", "get_contract_ancestors"],
+)
+
+
+# Size of the chunks objects are streamed to and from the worker in
+STREAM_CHUNK_SIZE = 1 << 20
+# Upload options passed to the worker as query parameters
+UPLOAD_PARAMS = {
+    "minShards": "minshards",
+    "totalShards": "totalshards",
+    "contractSet": "contractset",
+    "mimeType": "mimetype",
+}
+# Header prefix the worker stores user metadata under
+OBJECT_META_PREFIX = "X-Sia-Meta-"
+
+
 class RenterdError(Exception):
     """Base exception for renterd API errors"""
 
@@ -130,14 +187,30 @@ class RenterdError(Exception):
 class RenterdClient:
     """Client for the renterd API"""
 
-    def __init__(self, base_url: str, api_password: Optional[str] = None):
-        # Ensure base_url doesn't have trailing slash and has /api
-        self.base_url = f"{base_url.rstrip('/')}/api"
-        if api_password:
-            auth = httpx.BasicAuth(username="", password=api_password)
-            self.client = httpx.AsyncClient(base_url=self.base_url, auth=auth, timeout=30.0)
-        else:
-            self.client = httpx.AsyncClient(base_url=self.base_url, timeout=30.0)
+    # Client method polled to follow the chain tip
+    tip_method = "get_consensus_state"
+
+    def __init__(
+        self,
+        base_url: str,
+        api_password: Optional[str] = None,
+        pool: Optional[ConnectionPool] = None,
+        cache: Optional[ResponseCache] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        worker_urls: Optional[List[str]] = None,
+    ):
+        # Ensure base_url doesn't have trailing slash and has /api, unix:// socket URLs included
+        self.base_url = f"{socket_url(base_url).rstrip('/')}/api"
+        # Worker routes are spread over separate workers when given, bus and autopilot routes stay on base_url
+        self.worker_urls = [f"{socket_url(url).rstrip('/')}/api" for url in worker_urls or []]
+        self.pool = pool or ConnectionPool()
+        self.client = self.pool.create_client(
+            "renterd", self.base_url, api_password, balance_prefix="worker", balance_urls=self.worker_urls
+        )
+        self.cache = cache
+        self.retry = retry
+        self.breaker = breaker
 
     async def close(self):
         """Close the HTTP client"""
@@ -147,7 +220,8 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def get_accounts(self, owner: Optional[str] = None) -> List[Account]:
         response = await self.client.get("/bus/accounts", params={"owner": owner})
-        return response.json()
+        # Balances and drift are big.Int values
+        return decode_json(response, exact_integers=True)
 
     @handle_api_errors(RenterdError)
     async def save_accounts(self, req: AccountsSaveRequest) -> None:
@@ -156,13 +230,13 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def fund_account(self, req: AccountsFundRequest) -> AccountsFundResponse:
         response = await self.client.post("/bus/accounts/fund", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     # Alert endpoints
     @handle_api_errors(RenterdError)
     async def get_alerts(self, opts: AlertsOpts) -> AlertsResponse:
         response = await self.client.get("/bus/alerts", params={**opts.dict()})
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def dismiss_alerts(self, ids: List[Hash256]) -> None:
@@ -176,12 +250,12 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def get_autopilots(self) -> List[Autopilot]:
         response = await self.client.get("/bus/autopilots")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_autopilot(self, id: str) -> Autopilot:
         response = await self.client.get(f"/bus/autopilot/{id}")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def update_autopilot(self, id: str, autopilot: Autopilot) -> None:
@@ -195,7 +269,7 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def get_buckets(self) -> List[Bucket]:
         response = await self.client.get("/bus/buckets")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def create_bucket(self, req: BucketCreateRequest) -> None:
@@ -212,7 +286,7 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def get_bucket(self, name: str) -> Bucket:
         response = await self.client.get(f"/bus/bucket/{name}")
-        return response.json()
+        return decode_json(response)
 
     # Consensus endpoints
     @handle_api_errors(RenterdError)
@@ -222,29 +296,29 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def get_consensus_network(self) -> Network:
         response = await self.client.get("/bus/consensus/network")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_consensus_siafund_fee(self, payout: Currency) -> Currency:
         response = await self.client.get(f"/bus/consensus/siafundfee/{payout}")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_consensus_state(self) -> ConsensusState:
         response = await self.client.get("/bus/consensus/state")
-        return response.json()
+        return decode_json(response)
 
     # Contract endpoints
     @handle_api_errors(RenterdError)
     async def form_contract(self, req: ContractFormRequest) -> ContractMetadata:
         response = await self.client.post("/bus/contracts", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_contracts(self, contract_set: Optional[str] = None) -> List[ContractMetadata]:
         params = {"contractset": contract_set} if contract_set else None
         response = await self.client.get("/bus/contracts", params=params)
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def delete_contracts_all(self) -> None:
@@ -257,17 +331,17 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def get_contracts_prunable(self) -> ContractsPrunableDataResponse:
         response = await self.client.get("/bus/contracts/prunable")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_contract_renewed(self, id: FileContractID) -> ContractMetadata:
         response = await self.client.get(f"/bus/contracts/renewed/{id}")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_contract_sets(self) -> List[str]:
         response = await self.client.get("/bus/contracts/sets")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def update_contract_set(self, set_name: str, req: ContractSetUpdateRequest) -> None:
@@ -284,12 +358,12 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def get_contract(self, id: FileContractID) -> ContractMetadata:
         response = await self.client.get(f"/bus/contract/{id}")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def add_contract(self, id: FileContractID, req: ContractAddRequest) -> ContractMetadata:
         response = await self.client.post(f"/bus/contract/{id}", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def delete_contract(self, id: FileContractID) -> None:
@@ -298,17 +372,17 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def acquire_contract(self, id: FileContractID, req: ContractAcquireRequest) -> ContractAcquireResponse:
         response = await self.client.post(f"/bus/contract/{id}/acquire", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_contract_ancestors(self, id: FileContractID, min_start_height: int) -> List[ArchivedContract]:
         response = await self.client.get(f"/bus/contract/{id}/ancestors", params={"minStartHeight": min_start_height})
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def contract_broadcast(self, id: FileContractID) -> TransactionID:
         response = await self.client.post(f"/bus/contract/{id}/broadcast")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def keepalive_contract(self, id: FileContractID, req: ContractKeepaliveRequest) -> None:
@@ -317,17 +391,17 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def prune_contract(self, id: FileContractID, req: ContractPruneRequest) -> ContractPruneResponse:
         response = await self.client.post(f"/bus/contract/{id}/prune", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def renew_contract(self, id: FileContractID, req: ContractRenewRequest) -> ContractMetadata:
         response = await self.client.post(f"/bus/contract/{id}/renew", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def add_renewed_contract(self, id: FileContractID, req: ContractRenewedRequest) -> ContractMetadata:
         response = await self.client.post(f"/bus/contract/{id}/renewed", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def release_contract(self, id: FileContractID, lock_id: int) -> None:
@@ -336,23 +410,23 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def get_contract_roots(self, id: FileContractID) -> ContractRootsResponse:
         response = await self.client.get(f"/bus/contract/{id}/roots")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_contract_size(self, id: FileContractID) -> ContractSize:
         response = await self.client.get(f"/bus/contract/{id}/size")
-        return response.json()
+        return decode_json(response)
 
     # Host endpoints
     @handle_api_errors(RenterdError)
     async def get_hosts(self) -> List[Host]:
         response = await self.client.get("/bus/hosts")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_hosts_allowlist(self) -> List[PublicKey]:
         response = await self.client.get("/bus/hosts/allowlist")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def update_hosts_allowlist(self, req: UpdateAllowlistRequest) -> None:
@@ -361,7 +435,7 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def get_hosts_blocklist(self) -> List[str]:
         response = await self.client.get("/bus/hosts/blocklist")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def update_hosts_blocklist(self, req: UpdateBlocklistRequest) -> None:
@@ -377,7 +451,7 @@ class RenterdClient:
             "/bus/hosts/remove",
             json=req.dict(),
         )
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def record_hosts_scan(self, req: HostsScanRequest) -> None:
@@ -389,12 +463,12 @@ class RenterdClient:
     ) -> List[HostAddress]:
         params = {"lastScan": last_scan, "offset": offset, "limit": limit}
         response = await self.client.get("/bus/hosts/scanning", params=params)
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_host(self, public_key: PublicKey) -> Host:
         response = await self.client.get(f"/bus/host/{public_key}")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def hosts_reset_lost_sectors(self, hostkey: PublicKey) -> None:
@@ -409,7 +483,7 @@ class RenterdClient:
     async def get_metric(self, key: str, start: str, n: int, interval: str) -> Any:
         params = {"start": start, "n": n, "interval": interval}
         response = await self.client.get(f"/bus/metric/{key}", params=params)
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def delete_metric(self, key: str, cutoff: str) -> None:
@@ -419,7 +493,7 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def create_multipart_upload(self, req: MultipartCreateRequest) -> MultipartCreateResponse:
         response = await self.client.post("/bus/multipart/create", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def abort_multipart_upload(self, req: MultipartAbortRequest) -> None:
@@ -428,7 +502,7 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def complete_multipart_upload(self, req: MultipartCompleteRequest) -> MultipartCompleteResponse:
         response = await self.client.post("/bus/multipart/complete", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def add_multipart_part(self, req: MultipartAddPartRequest) -> None:
@@ -437,24 +511,24 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def get_multipart_upload(self, id: str) -> MultipartUpload:
         response = await self.client.get(f"/bus/multipart/upload/{id}")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def list_multipart_uploads(self, req: MultipartListUploadsRequest) -> MultipartListUploadsResponse:
         response = await self.client.post("/bus/multipart/listuploads", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def list_multipart_parts(self, req: MultipartListPartsRequest) -> MultipartListPartsResponse:
         response = await self.client.post("/bus/multipart/listparts", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     # Object endpoints
     @handle_api_errors(RenterdError)
     async def get_object(self, path: str, bucket: Optional[str] = None, only_metadata: bool = False) -> Object:
         params = {"bucket": bucket, "onlymetadata": only_metadata} if bucket else {"onlymetadata": only_metadata}
         response = await self.client.get(f"/bus/objects/{path}", params=params)
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def add_object(self, path: str, req: AddObjectRequest) -> None:
@@ -468,7 +542,7 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def copy_object(self, req: CopyObjectsRequest) -> ObjectMetadata:
         response = await self.client.post("/bus/objects/copy", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def rename_object(self, req: ObjectsRenameRequest) -> None:
@@ -477,24 +551,24 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def list_objects(self, req: ObjectsListRequest) -> ObjectsListResponse:
         response = await self.client.post("/bus/objects/list", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     # Parameter endpoints
     @handle_api_errors(RenterdError)
     async def get_gouging_params(self) -> GougingParams:
         response = await self.client.get("/bus/params/gouging")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_upload_params(self) -> UploadParams:
         response = await self.client.get("/bus/params/upload")
-        return response.json()
+        return decode_json(response)
 
     # Slab buffer endpoints
     @handle_api_errors(RenterdError)
     async def get_slab_buffers(self) -> List[SlabBuffer]:
         response = await self.client.get("/bus/slabbuffers")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def mark_packed_slabs_uploaded(self, req: PackedSlabsRequestPOST) -> None:
@@ -503,13 +577,13 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def fetch_packed_slabs(self, req: PackedSlabsRequestGET) -> List[PackedSlab]:
         response = await self.client.post("/bus/slabbuffer/fetch", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     # Search endpoints
     @handle_api_errors(RenterdError)
     async def search_hosts(self, req: SearchHostsRequest) -> List[Host]:
         response = await self.client.post("/bus/search/hosts", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def search_objects(
@@ -517,24 +591,24 @@ class RenterdClient:
     ) -> List[ObjectMetadata]:
         params = {"key": key, "bucket": bucket, "offset": offset, "limit": limit}
         response = await self.client.get("/bus/search/objects", params=params)
-        return response.json()
+        return decode_json(response)
 
     # Sector endpoints
     @handle_api_errors(RenterdError)
     async def delete_host_sector(self, host_key: PublicKey, root: Hash256) -> int:
         response = await self.client.delete(f"/bus/sectors/{host_key}/{root}")
-        return response.json()
+        return decode_json(response)
 
     # Settings endpoints
     @handle_api_errors(RenterdError)
     async def get_settings(self) -> List[str]:
         response = await self.client.get("/bus/settings")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_setting(self, key: str) -> str:
         response = await self.client.get(f"/bus/setting/{key}")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def update_setting(self, key: str, value: str) -> None:
@@ -548,7 +622,7 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def slabs_migration(self, req: MigrationSlabsRequest) -> UnhealthySlabsResponse:
         response = await self.client.post("/bus/slabs/migration", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_slabs_partial(self, key: str, offset: int, length: int) -> bytes:
@@ -556,13 +630,33 @@ class RenterdClient:
         response = await self.client.get(f"/bus/slabs/partial/{key}", params=params)
         return response.content
 
+    def open_slabs_partial(
+        self, key: str, offset: int, length: int, accept_encoding: Optional[str] = None
+    ) -> AsyncContextManager[httpx.Response]:
+        """Open the partial slab data as a streamed response, its body is left unread
+
+        `accept_encoding` replaces httpx's default Accept-Encoding, for callers relaying the raw body.
+        """
+        params = {"offset": offset, "length": length}
+        headers = {"Accept-Encoding": accept_encoding} if accept_encoding is not None else None
+        return self.client.stream(
+            "GET", f"/bus/slabs/partial/{key}", params=params, headers=headers, extensions={NO_COALESCE: True}
+        )
+
     @handle_api_errors(RenterdError)
     async def add_slabs_partial(
-        self, data: bytes, min_shards: int, total_shards: int, contract_set: str
+        self,
+        data: Union[bytes, AsyncIterable[bytes]],
+        min_shards: int,
+        total_shards: int,
+        contract_set: str,
+        content_length: Optional[int] = None,
     ) -> AddPartialSlabResponse:
         params = {"minShards": min_shards, "totalShards": total_shards, "contractSet": contract_set}
-        response = await self.client.post("/bus/slabs/partial", content=data, params=params)
-        return response.json()
+        headers = {"Content-Length": str(content_length)} if content_length is not None else None
+        response = await self.client.post("/bus/slabs/partial", content=data, params=params, headers=headers)
+        response.raise_for_status()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def refresh_health(self) -> None:
@@ -571,12 +665,12 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def get_slab(self, key: str) -> Slab:
         response = await self.client.get(f"/bus/slab/{key}")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_slab_objects(self, key: str) -> List[ObjectMetadata]:
         response = await self.client.get(f"/bus/slab/{key}/objects")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def update_slab(self, slab: Slab) -> None:
@@ -586,19 +680,19 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def get_state(self) -> BusStateResponse:
         response = await self.client.get("/bus/state")
-        return response.json()
+        return decode_json(response)
 
     # Stats endpoints
     @handle_api_errors(RenterdError)
     async def get_objects_stats(self) -> ObjectsStatsResponse:
         response = await self.client.get("/bus/stats/objects")
-        return response.json()
+        return decode_json(response)
 
     # Syncer endpoints
     @handle_api_errors(RenterdError)
     async def get_syncer_address(self) -> str:
         response = await self.client.get("/bus/syncer/address")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def sync_connect(self, addr: str) -> None:
@@ -607,18 +701,18 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def get_syncer_peers(self) -> List[str]:
         response = await self.client.get("/bus/syncer/peers")
-        return response.json()
+        return decode_json(response)
 
     # Transaction pool endpoints
     @handle_api_errors(RenterdError)
     async def get_txpool_recommended_fee(self) -> Currency:
         response = await self.client.get("/bus/txpool/recommendedfee")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_txpool_transactions(self) -> List[Transaction]:
         response = await self.client.get("/bus/txpool/transactions")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def txpool_broadcast(self, transactions: List[Transaction]) -> None:
@@ -641,7 +735,7 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def get_wallet(self) -> WalletResponse:
         response = await self.client.get("/bus/wallet")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def wallet_discard_transaction(self, transaction: Transaction) -> None:
@@ -653,27 +747,27 @@ class RenterdClient:
             "/bus/wallet/fund",
             json=req.dict(),
         )
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_wallet_outputs(self) -> List[SiacoinElement]:
         response = await self.client.get("/bus/wallet/outputs")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_wallet_pending(self) -> List[Transaction]:
         response = await self.client.get("/bus/wallet/pending")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def wallet_redistribute(self, req: WalletRedistributeRequest) -> List[TransactionID]:
         response = await self.client.post("/bus/wallet/redistribute", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def wallet_send_siacoins(self, req: WalletSendRequest) -> TransactionID:
         response = await self.client.post("/bus/wallet/send", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def wallet_sign_transaction(self, req: WalletSignRequest) -> Transaction:
@@ -681,19 +775,25 @@ class RenterdClient:
             "/bus/wallet/sign",
             json=req.dict(),
         )
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_wallet_transactions(self, offset: int = 0, limit: int = -1) -> List[Transaction]:
         params = {"offset": offset, "limit": limit}
         response = await self.client.get("/bus/wallet/transactions", params=params)
-        return response.json()
+        return decode_json(response)
+
+    def iter_wallet_transactions(self, page_size: int = 100, prefetch: int = 1) -> AsyncIterator[Transaction]:
+        """Stream all wallet transactions, page by page"""
+        return paginate(
+            lambda offset, limit: self.get_wallet_transactions(offset=offset, limit=limit), page_size, prefetch
+        )
 
     # Webhook endpoints
     @handle_api_errors(RenterdError)
     async def get_webhooks(self) -> WebhookResponse:
         response = await self.client.get("/bus/webhooks")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def register_webhook(self, webhook: Webhook) -> None:
@@ -711,7 +811,7 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def get_autopilot_config(self) -> AutopilotConfig:
         response = await self.client.get("/autopilot/config")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def update_autopilot_config(self, config: AutopilotConfig) -> None:
@@ -720,81 +820,83 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def get_autopilot_host(self, host_key: PublicKey) -> HostResponse:
         response = await self.client.get(f"/autopilot/host/{host_key}")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_autopilot_hosts(self, opts: SearchHostsRequest) -> List[HostResponse]:
         response = await self.client.post("/autopilot/hosts", params=opts)
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_autopilot_state(self) -> AutopilotStateResponse:
         response = await self.client.get("/autopilot/state")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def trigger_autopilot(self, req: AutopilotTriggerRequest) -> AutopilotTriggerResponse:
         response = await self.client.post("/autopilot/trigger", json=req)
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def evaluate_autopilot_config(self, req: ConfigEvaluationRequest) -> ConfigEvaluationResponse:
         response = await self.client.post("/autopilot/config", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     # Worker endpoints
     @handle_api_errors(RenterdError)
     async def get_worker_state(self) -> WorkerStateResponse:
         response = await self.client.get("/worker/state")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_worker_memory(self) -> MemoryResponse:
         response = await self.client.get("/worker/memory")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_worker_id(self) -> str:
         response = await self.client.get("/worker/id")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_worker_accounts(self) -> List[Account]:
         response = await self.client.get("/worker/accounts")
-        return response.json()
+        # Balances and drift are big.Int values
+        return decode_json(response, exact_integers=True)
 
     @handle_api_errors(RenterdError)
     async def get_worker_account(self, host_key: str) -> Account:
         response = await self.client.get(f"/worker/account/{host_key}")
-        return response.json()
+        # Balances and drift are big.Int values
+        return decode_json(response, exact_integers=True)
 
     @handle_api_errors(RenterdError)
     async def rhp_scan(self, req: RHPScanRequest) -> RHPScanResponse:
         response = await self.client.post("/worker/rhp/scan", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def rhp_price_table(self, req: RHPPriceTableRequest) -> HostPriceTable:
         response = await self.client.post("/worker/rhp/pricetable", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_worker_contracts(self, host_timeout: Optional[int] = None) -> ContractsResponse:
         params = {"hosttimeout": host_timeout} if host_timeout else None
         response = await self.client.get("/worker/rhp/contracts", params=params)
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_worker_object(self, bucket: str, path: str, opts: GetObjectResponse) -> GetObjectResponse:
         params = {"bucket": bucket, **opts.dict()}
         response = await self.client.get(f"/worker/objects/{path}", params=params)
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def head_object(self, bucket: str, path: str, opts: HeadObjectOptions) -> HeadObjectResponse:
         params = {"bucket": bucket, **opts.dict()}
         response = await self.client.head(f"/worker/objects/{path}", params=params)
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def upload_object(
@@ -804,7 +906,86 @@ class RenterdClient:
         response = await self.client.put(
             f"/worker/objects/{path}", content=data, params=params, headers=options.get("metadata", {})
         )
-        return response.json()
+        return decode_json(response)
+
+    @handle_api_errors(RenterdError)
+    async def upload_object_stream(
+        self,
+        bucket: str,
+        path: str,
+        data: Union[AsyncIterable[bytes], str, os.PathLike],
+        options: Optional[Dict[str, Any]] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> UploadObjectResponse:
+        """Upload an object from an async byte iterator or a file path without buffering it in memory"""
+        options = options or {}
+        params = {"bucket": bucket}
+        params.update({param: options[key] for key, param in UPLOAD_PARAMS.items() if options.get(key) is not None})
+        headers = {f"{OBJECT_META_PREFIX}{key}": value for key, value in (options.get("metadata") or {}).items()}
+        if isinstance(data, (str, os.PathLike)):
+            headers["Content-Length"] = str(os.path.getsize(data))
+            data = iter_file(data, chunk_size)
+        elif options.get("contentLength") is not None:
+            headers["Content-Length"] = str(options["contentLength"])
+        response = await self.client.put(f"/worker/objects/{path}", content=data, params=params, headers=headers)
+        response.raise_for_status()
+        return {"etag": response.headers.get("ETag")}
+
+    def open_object(
+        self,
+        bucket: str,
+        path: str,
+        byte_range: Optional[Union[Tuple[int, Optional[int]], str]] = None,
+        accept_encoding: Optional[str] = None,
+    ) -> AsyncContextManager[httpx.Response]:
+        """Open an object's content as a streamed response, its body is left unread
+
+        `byte_range` is an inclusive (start, end) pair with an optional end, or a raw Range header value.
+        `accept_encoding` replaces httpx's default Accept-Encoding, for callers relaying the raw body.
+        """
+        headers = {}
+        if accept_encoding is not None:
+            headers["Accept-Encoding"] = accept_encoding
+        if isinstance(byte_range, str):
+            headers["Range"] = byte_range
+        elif byte_range is not None:
+            start, end = byte_range
+            headers["Range"] = f"bytes={start}-{'' if end is None else end}"
+        return self.client.stream(
+            "GET",
+            f"/worker/objects/{path}",
+            params={"bucket": bucket},
+            headers=headers,
+            extensions={NO_COALESCE: True},
+        )
+
+    async def stream_object(
+        self,
+        bucket: str,
+        path: str,
+        byte_range: Optional[Tuple[int, Optional[int]]] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream an object's content from the worker chunk by chunk, optionally only an inclusive byte range"""
+        try:
+            async with self.open_object(bucket, path, byte_range) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(chunk_size):
+                    yield chunk
+        except httpx.HTTPError as e:
+            raise RenterdError(f"Failed to renterdclient::stream_object: {e}") from e
+
+    @handle_api_errors(RenterdError)
+    async def download_object(
+        self,
+        bucket: str,
+        path: str,
+        sink: ChunkSink,
+        byte_range: Optional[Tuple[int, Optional[int]]] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> int:
+        """Download an object into a file path or a chunk callable, returns the number of bytes written"""
+        return await write_chunks(self.stream_object(bucket, path, byte_range, chunk_size), sink)
 
     @handle_api_errors(RenterdError)
     async def delete_worker_object(self, bucket: str, path: str, opts: DeleteObjectOptions) -> None:
@@ -814,7 +995,7 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def multipart_create(self, req: MultipartCreateRequest) -> MultipartCreateResponse:
         response = await self.client.post("/worker/multipart/create", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def multipart_abort(self, req: MultipartAbortRequest) -> None:
@@ -823,7 +1004,7 @@ class RenterdClient:
     @handle_api_errors(RenterdError)
     async def multipart_complete(self, req: MultipartCompleteRequest) -> MultipartCompleteResponse:
         response = await self.client.post("/worker/multipart/complete", json=req.dict())
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def multipart_upload(self, path: str, req: MultipartAddPartRequest) -> None:
@@ -833,17 +1014,17 @@ class RenterdClient:
     async def migrate_slab(self, slab: Slab, contract_set: Optional[str] = None) -> MigrateSlabResponse:
         params = {"contractset": contract_set} if contract_set else None
         response = await self.client.post("/worker/slab/migrate", json=slab.dict(), params=params)
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_worker_downloads_stats(self) -> DownloadStatsResponse:
         response = await self.client.get("/worker/stats/downloads")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def get_worker_uploads_stats(self) -> UploadStatsResponse:
         response = await self.client.get("/worker/stats/uploads")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(RenterdError)
     async def reset_account_drift(self, account_id: str) -> None:
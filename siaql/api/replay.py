@@ -0,0 +1,222 @@
+# siaql/api/replay.py
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from siaql.api.singleflight import NO_COALESCE
+
+# Headers that describe the connection rather than the response, not recorded
+HOP_HEADERS = {"connection", "keep-alive", "transfer-encoding", "content-length"}
+
+RequestKey = Tuple[str, str, Optional[str]]
+
+# Largest response body kept in a journal, larger and streamed bodies are recorded by size alone
+MAX_RECORDED_BODY = 16 * 1024 * 1024
+
+
+class ReplayMissError(httpx.TransportError):
+    """Raised when a replayed request has no recorded response"""
+
+    pass
+
+
+def request_key(request: httpx.Request) -> RequestKey:
+    """Method, path with query and body digest a response is recorded and looked up under"""
+    try:
+        body: Optional[str] = hashlib.blake2b(request.content, digest_size=8).hexdigest() if request.content else None
+    except httpx.RequestNotRead:
+        # Streamed uploads are matched on method and path alone
+        body = None
+    return request.method, request.url.raw_path.decode("ascii"), body
+
+
+def encode_body(body: bytes) -> Dict[str, str]:
+    try:
+        return {"text": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(body).decode("ascii")}
+
+
+def decode_body(record: Dict[str, Any]) -> bytes:
+    if "base64" in record:
+        return base64.b64decode(record["base64"])
+    return record.get("text", "").encode("utf-8")
+
+
+class Journal:
+    """Gzipped JSON lines file of recorded daemon exchanges, one object per request
+
+    Each record holds the daemon, request key, response status, headers and body (still encoded
+    as the daemon sent it) and `latency`, the seconds until the response headers arrived. Bodies
+    that are streamed or too large to keep are left out, with `omitted` set and their `size`.
+    """
+
+    def __init__(self, path: str, flush_every: int = 100, clock: Callable[[], float] = time.monotonic):
+        self.path = path
+        self.flush_every = flush_every
+        self.clock = clock
+        self.records = 0
+        self._file = gzip.open(path, "at", encoding="utf-8")
+
+    def write(
+        self, daemon: str, key: RequestKey, response: httpx.Response, body: Optional[bytes], size: int, latency: float
+    ):
+        method, path, request_body = key
+        record = {
+            "daemon": daemon,
+            "method": method,
+            "path": path,
+            "requestBody": request_body,
+            "status": response.status_code,
+            "headers": [[name, value] for name, value in response.headers.items() if name not in HOP_HEADERS],
+            **(encode_body(body) if body is not None else {"omitted": True, "size": size}),
+            "latency": round(latency, 6),
+        }
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.records += 1
+        if self.records % self.flush_every == 0:
+            self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+def load_journal(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Recorded exchanges by daemon, in the order they were recorded"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Replay journal {path} does not exist")
+    records: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                records[record["daemon"]].append(record)
+    return dict(records)
+
+
+class RecordingStream(httpx.AsyncByteStream):
+    """Response stream that writes its exchange to the journal once it has been read
+
+    Chunks are only kept while the body fits in `max_body` bytes, past that (or without
+    `keep_body`) the journal gets the body's size instead of the body.
+    """
+
+    def __init__(
+        self,
+        stream: httpx.AsyncByteStream,
+        on_close: Callable[[Optional[bytes], int], None],
+        keep_body: bool = True,
+        max_body: int = MAX_RECORDED_BODY,
+    ):
+        self.stream = stream
+        self.on_close = on_close
+        self.keep_body = keep_body
+        self.max_body = max_body
+        self.chunks: List[bytes] = []
+        self.size = 0
+        self.closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            self.size += len(chunk)
+            if self.keep_body and self.size > self.max_body:
+                self.keep_body = False
+                self.chunks = []
+            elif self.keep_body:
+                self.chunks.append(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.on_close(b"".join(self.chunks) if self.keep_body else None, self.size)
+        await self.stream.aclose()
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Transport that records every exchange with a daemon, timings included, to a journal"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, journal: Journal, daemon: str):
+        self.transport = transport
+        self.journal = journal
+        self.daemon = daemon
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request)
+        start = self.journal.clock()
+        response = await self.transport.handle_async_request(request)
+        latency = self.journal.clock() - start
+
+        def record(body: Optional[bytes], size: int) -> None:
+            self.journal.write(self.daemon, key, response, body, size, latency)
+
+        # Streamed bodies, such as object downloads, can be far larger than memory
+        keep_body = not request.extensions.get(NO_COALESCE)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=RecordingStream(response.stream, record, keep_body),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Transport that answers from recorded exchanges instead of a daemon
+
+    Requests are matched on method, path with query and body. Repeated requests get the recorded
+    responses in order, starting over once they run out. Each response is held back for its
+    recorded latency times `latency_scale`, 0 answers immediately.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], latency_scale: float = 1.0):
+        self.latency_scale = latency_scale
+        self._responses: Dict[RequestKey, List[Dict[str, Any]]] = defaultdict(list)
+        for record in records:
+            self._responses[(record["method"], record["path"], record.get("requestBody"))].append(record)
+        self._next: Dict[RequestKey, int] = defaultdict(int)
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, request: httpx.Request) -> Optional[Dict[str, Any]]:
+        key = request_key(request)
+        responses = self._responses.get(key) or self._responses.get((key[0], key[1], None))
+        if not responses:
+            return None
+        record = responses[self._next[key] % len(responses)]
+        self._next[key] += 1
+        return record
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        record = self.lookup(request)
+        if record is None:
+            self.misses += 1
+            raise ReplayMissError(f"No recorded response for {request.method} {request.url.raw_path.decode()}")
+        self.hits += 1
+
+        delay = record["latency"] * self.latency_scale
+        if delay > 0:
+            read_timeout = request.extensions.get("timeout", {}).get("read")
+            if read_timeout is not None and delay > read_timeout:
+                await asyncio.sleep(read_timeout)
+                raise httpx.ReadTimeout("Replayed response took longer than the read timeout", request=request)
+            await asyncio.sleep(delay)
+        if record.get("omitted"):
+            # The body wasn't recorded, so a body of the recorded size stands in for it, unencoded
+            headers = [(name, value) for name, value in record["headers"] if name.lower() != "content-encoding"]
+            return httpx.Response(record["status"], headers=headers, content=bytes(record["size"]))
+        return httpx.Response(record["status"], headers=record["headers"], content=decode_body(record))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"recorded": sum(len(r) for r in self._responses.values()), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,185 @@
+# siaql/api/resilience.py
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from siaql.api.deadline import remaining_budget
+
+# Gateway statuses that mean the daemon (or a proxy in front of it) is unavailable rather than refusing the call
+UNAVAILABLE_STATUSES = {502, 503, 504}
+# Transport errors that can be retried without waiting out another full timeout
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadError, httpx.RemoteProtocolError)
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a daemon whose circuit breaker is open"""
+
+    pass
+
+
+def is_unavailable(e: BaseException) -> bool:
+    """Whether an error means the daemon could not serve the call at all"""
+    if isinstance(e, httpx.HTTPStatusError):
+        return e.response.status_code in UNAVAILABLE_STATUSES
+    return isinstance(e, httpx.TransportError)
+
+
+def is_retryable(e: BaseException) -> bool:
+    """Whether a failed call was an idempotent request that failed in a way worth retrying"""
+    if not (isinstance(e, RETRYABLE_ERRORS) or isinstance(e, httpx.HTTPStatusError) and is_unavailable(e)):
+        return False
+    try:
+        return e.request.method in IDEMPOTENT_METHODS
+    except RuntimeError:
+        # No request attached, nothing is known about the call
+        return False
+
+
+@dataclass
+class RetryPolicy:
+    """How often idempotent requests are retried, with full-jitter exponential backoff between attempts"""
+
+    max_retries: int = 2
+    base_delay: float = 0.2
+    max_delay: float = 2.0
+    # Retries made under this policy, for the stats
+    retries: int = field(default=0, compare=False)
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before retry number `attempt`, counting from 1"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"maxRetries": self.max_retries, "retries": self.retries}
+
+
+class CircuitBreaker:
+    """Per-daemon breaker that fails calls fast while the daemon is unavailable
+
+    After `failure_threshold` consecutive unavailable errors the breaker opens and rejects every
+    call for `reset_timeout` seconds. It then turns half-open and lets a single probe call through,
+    which closes it again on success or reopens it on failure.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self.consecutive_failures = 0
+        self.opens = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+        return self._state
+
+    def before_call(self) -> None:
+        """Let a call through, or raise CircuitOpenError if the daemon is considered down"""
+        state = self.state
+        if state == self.CLOSED:
+            return
+        if state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        self.rejected += 1
+        retry_in = max(0.0, self.reset_timeout - (self.clock() - self._opened_at))
+        raise CircuitOpenError(f"{self.name} is unavailable, circuit breaker open (retrying in {retry_in:.0f}s)")
+
+    def record_success(self) -> None:
+        self._probing = False
+        self._state = self.CLOSED
+        self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        self._probing = False
+        self.consecutive_failures += 1
+        if self._state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.opens += 1
+            self._state = self.OPEN
+            self._opened_at = self.clock()
+
+    def release(self) -> None:
+        """Give up a probe slot without an outcome, when the probe call was cancelled"""
+        self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutiveFailures": self.consecutive_failures,
+            "opens": self.opens,
+            "rejected": self.rejected,
+        }
+
+
+def guarded(
+    func: Callable[..., Awaitable[Any]], breaker: Optional[CircuitBreaker], retry: Optional[RetryPolicy]
+) -> Callable[..., Awaitable[Any]]:
+    """Wrap a client call with the daemon's circuit breaker and retry policy"""
+    if breaker is None and retry is None:
+        return func
+
+    async def call(*args: Any, **kwargs: Any) -> Any:
+        attempt = 0
+        while True:
+            if breaker is not None:
+                breaker.before_call()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                budget = remaining_budget()
+                if isinstance(e, httpx.TimeoutException) and budget is not None and budget <= 0:
+                    # Timed out because the GraphQL request ran out of time, not because of the daemon
+                    if breaker is not None:
+                        breaker.release()
+                    raise
+                if not is_unavailable(e):
+                    # The daemon answered, whatever went wrong with this particular call
+                    if breaker is not None:
+                        breaker.record_success()
+                    raise
+                if breaker is not None:
+                    breaker.record_failure()
+                if retry is None or attempt >= retry.max_retries or not is_retryable(e):
+                    raise
+                if breaker is not None and breaker.state != CircuitBreaker.CLOSED:
+                    # The breaker just opened, retrying would only be rejected
+                    raise
+                delay = retry.delay(attempt + 1)
+                if budget is not None and delay >= budget:
+                    # No time left for another attempt before the request's deadline
+                    raise
+                attempt += 1
+                retry.retries += 1
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                if breaker is not None:
+                    breaker.release()
+                raise
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+    return call
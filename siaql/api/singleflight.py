@@ -0,0 +1,98 @@
+# siaql/api/singleflight.py
+import asyncio
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from siaql.api.deadline import deadline_scope, remaining_budget
+
+SharedResponse = Tuple[int, httpx.Headers, bytes, Dict[str, Any]]
+
+# Request extension that opts a GET out of coalescing, for streamed bodies that must not be buffered
+NO_COALESCE = "siaql.no_coalesce"
+
+
+class SingleFlightTransport(httpx.AsyncBaseTransport):
+    """Transport that coalesces identical in-flight GETs into a single upstream request
+
+    The first caller for a given method, URL (path and params) and credentials becomes the
+    leader and performs the request, every caller arriving while it is in flight waits for the
+    leader and gets its own copy of the same response. The shared request isn't tied to the
+    leader: it runs without a deadline and survives the leader being cancelled, while each caller
+    gives up on waiting for it once its own deadline passes.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+        self._inflight: Dict[Tuple[str, str, Optional[str]], asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def request_key(request: httpx.Request) -> Tuple[str, str, Optional[str]]:
+        return request.method, str(request.url), request.headers.get("authorization")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET" or request.extensions.get(NO_COALESCE):
+            return await self.transport.handle_async_request(request)
+
+        budget = remaining_budget()
+        if budget is not None and budget <= 0:
+            raise httpx.PoolTimeout("Request deadline exceeded", request=request)
+
+        key = self.request_key(request)
+        task = self._inflight.get(key)
+        if task is None:
+            self.leaders += 1
+            # The shared request runs without any caller's deadline, each caller only bounds its own wait
+            with deadline_scope(None):
+                task = self._inflight[key] = asyncio.ensure_future(self.fetch(key, request))
+            # Mark the exception as retrieved in case every caller has given up waiting
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        else:
+            self.coalesced += 1
+
+        try:
+            if budget is None:
+                shared = await asyncio.shield(task)
+            else:
+                shared = await asyncio.wait_for(asyncio.shield(task), budget)
+        except asyncio.TimeoutError:
+            raise httpx.PoolTimeout(
+                "Request deadline exceeded waiting for the shared response", request=request
+            ) from None
+        return self.build_response(shared)
+
+    async def fetch(self, key: Tuple[str, str, Optional[str]], request: httpx.Request) -> SharedResponse:
+        try:
+            response = await self.transport.handle_async_request(request)
+            # Keep the body as received (still encoded) so every copy decodes it independently
+            try:
+                content = b"".join([chunk async for chunk in response.stream])
+            finally:
+                await response.stream.aclose()
+            return response.status_code, response.headers, content, response.extensions
+        finally:
+            self._inflight.pop(key, None)
+
+    @staticmethod
+    def build_response(shared: SharedResponse) -> httpx.Response:
+        status_code, headers, content, extensions = shared
+        return httpx.Response(
+            status_code=status_code,
+            headers=headers,
+            stream=httpx.ByteStream(content),
+            extensions={key: value for key, value in extensions.items() if key != "network_stream"},
+        )
+
+    async def aclose(self) -> None:
+        for task in list(self._inflight.values()):
+            task.cancel()
+        await self.transport.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "inFlight": len(self._inflight),
+        }
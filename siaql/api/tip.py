@@ -0,0 +1,74 @@
+# siaql/api/tip.py
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from siaql.api.cache import ResponseCache
+
+logger = logging.getLogger("siaql.api.tip")
+
+
+class TipWatcher:
+    """Background poller that follows a daemon's chain tip
+
+    Whenever the tip moves, the tip-scoped responses in the daemon's cache are dropped all at
+    once, so between blocks repeated queries for consensus-derived data are served from cache.
+    """
+
+    def __init__(self, cache: ResponseCache, fetch_tip: Callable[[], Awaitable[Any]], interval: float = 5.0):
+        self.cache = cache
+        self.fetch_tip = fetch_tip
+        self.interval = interval
+        self.polls = 0
+        self.changes = 0
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def tip_key(tip: Any) -> str:
+        """Hashable key for a tip, a ChainIndex for walletd/hostd or a ConsensusState for renterd"""
+        if isinstance(tip, dict):
+            return repr(sorted(tip.items()))
+        return repr(tip)
+
+    async def poll(self) -> None:
+        self.polls += 1
+        try:
+            tip = self.tip_key(await self.fetch_tip())
+        except Exception as e:
+            # Without a known tip nothing tip-scoped can be trusted, so stop caching it
+            self.failures += 1
+            logger.warning("Failed to fetch chain tip: %s", e)
+            tip = None
+        if tip != self.cache.tip:
+            if tip is not None:
+                self.changes += 1
+            self.cache.set_tip(tip)
+
+    async def run(self) -> None:
+        while True:
+            await self.poll()
+            await asyncio.sleep(self.interval)
+
+    def ensure_started(self) -> None:
+        """Start polling in the running event loop unless it is already running"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.cache.set_tip(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tip": self.cache.tip,
+            "polls": self.polls,
+            "changes": self.changes,
+            "failures": self.failures,
+        }
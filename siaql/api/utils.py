@@ -1,11 +1,38 @@
 # siaql/api/utils.py
-from typing import Dict, List, Optional, Any, Callable, TypeVar, Type
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+from collections import deque
 from functools import wraps
+import asyncio
+import os
 import re
 import httpx
 import inspect
 
+from siaql.api.resilience import CircuitOpenError, guarded
+
 T = TypeVar("T")
+K = TypeVar("K")
+
+# Most calls a bulk query may have in flight against a daemon, whatever concurrency it asks for
+MAX_FAN_OUT = 64
+
+# A file path, or a callable taking each chunk such as an open file's `write`, sync or async
+ChunkSink = Union[str, os.PathLike, Callable[[bytes], Any]]
 
 
 class APIError(Exception):
@@ -26,7 +53,16 @@ def handle_api_errors(error_class: Type[Exception] = APIError):
                 operation_name = f"{class_name}::{func.__name__}"
 
             try:
-                return await func(*args, **kwargs)
+                client = args[0] if args else None
+                # Upstream calls go through the daemon's circuit breaker and retry policy, if it has them
+                call = guarded(func, getattr(client, "breaker", None), getattr(client, "retry", None))
+                # Clients configured with a response cache serve cacheable calls from it
+                cache = getattr(client, "cache", None)
+                if cache is not None:
+                    return await cache.call(func.__name__, call, args, kwargs)
+                return await call(*args, **kwargs)
+            except CircuitOpenError as e:
+                raise error_class(f"Failed to {operation_name}: {e}") from e
             except httpx.HTTPError as e:
                 cleaned_message = re.sub(r"For more information.*", "", str(e), flags=re.DOTALL)
                 newline_removed = re.sub(r"\n", "", cleaned_message, flags=re.DOTALL)
@@ -40,3 +76,133 @@ def handle_api_errors(error_class: Type[Exception] = APIError):
         return wrapper
 
     return decorator
+
+
+def paginate(
+    fetch_page: Callable[[int, int], Awaitable[List[T]]],
+    page_size: int = 100,
+    prefetch: int = 1,
+    offset: int = 0,
+) -> AsyncIterator[T]:
+    """Stream every item of an offset/limit endpoint, fetching up to `prefetch` pages ahead
+
+    `fetch_page(offset, limit)` fetches a single page, the walk ends at the first page that
+    comes back shorter than `page_size`. Pages ahead are only fetched once a full page is in,
+    so a listing that fits one page takes one request.
+    """
+    if page_size <= 0:
+        raise ValueError("page_size must be positive")
+
+    async def pages() -> AsyncIterator[T]:
+        pending: Deque[asyncio.Task] = deque()
+        next_offset = offset
+
+        def schedule() -> None:
+            nonlocal next_offset
+            task = asyncio.ensure_future(fetch_page(next_offset, page_size))
+            # Prefetched pages may never be awaited, don't let their errors go unretrieved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            pending.append(task)
+            next_offset += page_size
+
+        def reached_end() -> bool:
+            # A short page already in ends the walk, nothing after it is worth fetching
+            return any(
+                task.done() and not task.cancelled() and task.exception() is None and len(task.result()) < page_size
+                for task in pending
+            )
+
+        try:
+            schedule()
+            while True:
+                page = await pending.popleft()
+                full = len(page) >= page_size
+                if full:
+                    # More may follow, fetch up to `prefetch` pages while this one is consumed
+                    while len(pending) < prefetch and not reached_end():
+                        schedule()
+                for item in page:
+                    yield item
+                if not full:
+                    break
+                if not pending:
+                    schedule()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    return pages()
+
+
+async def collect(items: AsyncIterator[T], max_items: Optional[int] = None) -> List[T]:
+    """Collect an async iterator into a list, stopping early once `max_items` are in"""
+    result: List[T] = []
+    try:
+        if max_items is not None and max_items <= 0:
+            return result
+        async for item in items:
+            result.append(item)
+            if max_items is not None and len(result) >= max_items:
+                break
+    finally:
+        aclose = getattr(items, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    return result
+
+
+def clamp_concurrency(concurrency: int) -> int:
+    """A caller-supplied concurrency limited to `1..MAX_FAN_OUT`"""
+    return max(1, min(concurrency, MAX_FAN_OUT))
+
+
+async def fan_out(
+    keys: Iterable[K], fetch: Callable[[K], Awaitable[T]], concurrency: int = 16
+) -> List[Tuple[K, Optional[T], Optional[str]]]:
+    """Fetch many keys with at most `concurrency` calls in flight
+
+    Returns a `(key, value, error)` triple per key in the order the keys were given, a failed
+    key gets its error message instead of failing the whole batch.
+    """
+    if concurrency <= 0:
+        raise ValueError("concurrency must be positive")
+    keys = list(keys)
+    results: List[Tuple[K, Optional[T], Optional[str]]] = [None] * len(keys)
+    pending = iter(enumerate(keys))
+
+    async def worker() -> None:
+        for index, key in pending:
+            try:
+                results[index] = (key, await fetch(key), None)
+            except Exception as e:
+                results[index] = (key, None, str(e))
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(keys)))))
+    return results
+
+
+async def iter_file(path: Union[str, os.PathLike], chunk_size: int = 1 << 20) -> AsyncIterator[bytes]:
+    """Read a file in chunks without blocking the event loop"""
+    with open(path, "rb") as f:
+        while True:
+            chunk = await asyncio.to_thread(f.read, chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+async def write_chunks(chunks: AsyncIterable[bytes], sink: ChunkSink) -> int:
+    """Write chunks to a file path or pass them to a callable as they arrive, returns the bytes written"""
+    written = 0
+    if isinstance(sink, (str, os.PathLike)):
+        with open(sink, "wb") as f:
+            async for chunk in chunks:
+                await asyncio.to_thread(f.write, chunk)
+                written += len(chunk)
+        return written
+    async for chunk in chunks:
+        result = sink(chunk)
+        if inspect.isawaitable(result):
+            await result
+        written += len(chunk)
+    return written
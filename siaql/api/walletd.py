@@ -1,8 +1,12 @@
 # siaql/siaql/api/walletd.py
-from typing import Dict, List, Optional, Any, Union
+from typing import AsyncIterator, Dict, List, Optional, Any, Union
 import httpx
 from datetime import datetime
-from siaql.api.utils import handle_api_errors, APIError
+from siaql.api.cache import CachePolicy, ResponseCache
+from siaql.api.decoding import decode_json
+from siaql.api.pool import ConnectionPool, socket_url
+from siaql.api.resilience import CircuitBreaker, RetryPolicy
+from siaql.api.utils import clamp_concurrency, fan_out, handle_api_errors, paginate, APIError
 from siaql.graphql.schemas.types import (
     Address,
     ApplyUpdate,
@@ -34,6 +38,48 @@ from siaql.graphql.schemas.types import (
 )
 
 
+# Confirmed chain data that only changes when the tip moves (or a wallet's addresses change)
+WALLET_TIP_SCOPED = [
+    "get_wallet_balance",
+    "get_wallet_events",
+    "get_wallet_siacoin_outputs",
+    "get_wallet_siafund_outputs",
+]
+ADDRESS_TIP_SCOPED = [
+    "get_address_balance",
+    "get_address_events",
+    "get_address_siacoin_outputs",
+    "get_address_siafund_outputs",
+]
+
+# Responses that rarely change, cached when the client is given a response cache
+CACHE_POLICY = CachePolicy(
+    ttls={
+        "get_state": 3600.0,
+        "get_consensus_network": 3600.0,
+        "get_wallets": 30.0,
+        "get_wallet_addresses": 30.0,
+    },
+    invalidates={
+        "post_add_wallet": ["get_wallets"],
+        "post_update_wallet": ["get_wallets"],
+        "delete_wallet": ["get_wallets", "get_wallet_addresses"],
+        "add_wallet_address": WALLET_TIP_SCOPED + ["get_wallet_addresses"],
+        "delete_wallet_address": WALLET_TIP_SCOPED + ["get_wallet_addresses"],
+        "start_rescan": WALLET_TIP_SCOPED + ADDRESS_TIP_SCOPED,
+    },
+    tip_scoped=WALLET_TIP_SCOPED
+    + ADDRESS_TIP_SCOPED
+    + [
+        "get_consensus_tip_state",
+        "get_consensus_index",
+        "get_event",
+        "get_siacoin_output",
+        "get_siafund_output",
+    ],
+)
+
+
 class WalletdError(APIError):
     """Specific exception for Walletd API errors"""
 
@@ -41,14 +87,25 @@ class WalletdError(APIError):
 
 
 class WalletdClient:
-    def __init__(self, base_url: str, api_password: Optional[str] = None):
-        # Ensure base_url doesn't have trailing slash and has /api
-        self.base_url = f"{base_url.rstrip('/')}/api"
-        if api_password:
-            auth = httpx.BasicAuth(username="", password=api_password)
-            self.client = httpx.AsyncClient(base_url=self.base_url, auth=auth, timeout=30.0)
-        else:
-            self.client = httpx.AsyncClient(base_url=self.base_url, timeout=30.0)
+    # Client method polled to follow the chain tip
+    tip_method = "get_consensus_tip"
+
+    def __init__(
+        self,
+        base_url: str,
+        api_password: Optional[str] = None,
+        pool: Optional[ConnectionPool] = None,
+        cache: Optional[ResponseCache] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        # Ensure base_url doesn't have trailing slash and has /api, unix:// socket URLs included
+        self.base_url = f"{socket_url(base_url).rstrip('/')}/api"
+        self.pool = pool or ConnectionPool()
+        self.client = self.pool.create_client("walletd", self.base_url, api_password)
+        self.cache = cache
+        self.retry = retry
+        self.breaker = breaker
 
     async def close(self):
         """Close the HTTP client"""
@@ -60,7 +117,7 @@ class WalletdClient:
         """Get the current state of the walletd daemon"""
         response = await self.client.get("/state")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     # Consensus endpoints
     @handle_api_errors(WalletdError)
@@ -68,34 +125,34 @@ class WalletdClient:
         """Get consensus network parameters"""
         response = await self.client.get("/consensus/network")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def get_consensus_tip(self) -> ChainIndex:
         """Get current consensus tip"""
         response = await self.client.get("/consensus/tip")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def get_consensus_tip_state(self) -> ConsensusState:
         """Get current consensus tip state"""
         response = await self.client.get("/consensus/tipstate")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def get_consensus_index(self, height: int) -> ChainIndex:
         """Get consensus index at specified height"""
         response = await self.client.get(f"/consensus/index/{height}")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def get_consensus_updates(self, index: ChainIndex, limit: int) -> ConsensusUpdatesResponse:
         """Get consensus updates since index."""
         response = await self.client.get(f"/consensus/updates/{index}", params={"limit": limit})
-        return response.json()
+        return decode_json(response)
 
     # Syncer endpoints
     @handle_api_errors(WalletdError)
@@ -103,7 +160,7 @@ class WalletdClient:
         """Get list of connected peers"""
         response = await self.client.get("/syncer/peers")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def post_syncer_connect(self, addr: str) -> None:
@@ -123,21 +180,21 @@ class WalletdClient:
     async def get_txpool_parents(self, txn: Transaction) -> List[Transaction]:
         """Get parent transactions from pool"""
         response = await self.client.post("/txpool/parents", json=txn)
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def get_txpool_transactions(self) -> TxpoolTransactionsResponse:
         """Get all transactions in the transaction pool"""
         response = await self.client.get("/txpool/transactions")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def get_txpool_fee(self) -> Currency:
         """Get the recommended transaction fee"""
         response = await self.client.get("/txpool/fee")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def txpool_broadcast(self, req: TxpoolBroadcastRequest) -> None:
@@ -151,21 +208,21 @@ class WalletdClient:
         """Get all wallets"""
         response = await self.client.get("/wallets")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def post_add_wallet(self, wallet_update: WalletUpdateRequest) -> Wallet:
         """Add a new wallet"""
         response = await self.client.post("/wallets", json=wallet_update)
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def post_update_wallet(self, wallet_id: str, wallet_update: WalletUpdateRequest) -> Wallet:
         """Update a wallet"""
         response = await self.client.post(f"/wallets/{wallet_id}", json=wallet_update)
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def delete_wallet(self, wallet_id: str) -> None:
@@ -178,7 +235,7 @@ class WalletdClient:
         """Get addresses for a wallet"""
         response = await self.client.get(f"/wallets/{wallet_id}/addresses")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     # Wallet-specific operations
     @handle_api_errors(WalletdError)
@@ -198,21 +255,27 @@ class WalletdClient:
         """Get wallet balance"""
         response = await self.client.get(f"/wallets/{wallet_id}/balance")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def get_wallet_events(self, wallet_id: str, offset: int = 0, limit: int = 500) -> List[WalletEvent]:
         """Get wallet events"""
         response = await self.client.get(f"/wallets/{wallet_id}/events", params={"offset": offset, "limit": limit})
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
+
+    def iter_wallet_events(self, wallet_id: str, page_size: int = 500, prefetch: int = 1) -> AsyncIterator[WalletEvent]:
+        """Stream all wallet events, page by page"""
+        return paginate(
+            lambda offset, limit: self.get_wallet_events(wallet_id, offset=offset, limit=limit), page_size, prefetch
+        )
 
     @handle_api_errors(WalletdError)
     async def get_wallet_unconfirmed_events(self, wallet_id: str) -> List[WalletEvent]:
         """Get unconfirmed wallet events"""
         response = await self.client.get(f"/wallets/{wallet_id}/events/unconfirmed")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def get_wallet_siacoin_outputs(
@@ -223,7 +286,17 @@ class WalletdClient:
             f"/wallets/{wallet_id}/outputs/siacoin", params={"offset": offset, "limit": limit}
         )
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
+
+    def iter_wallet_siacoin_outputs(
+        self, wallet_id: str, page_size: int = 1000, prefetch: int = 1
+    ) -> AsyncIterator[SiacoinElement]:
+        """Stream all wallet siacoin outputs, page by page"""
+        return paginate(
+            lambda offset, limit: self.get_wallet_siacoin_outputs(wallet_id, offset=offset, limit=limit),
+            page_size,
+            prefetch,
+        )
 
     @handle_api_errors(WalletdError)
     async def get_wallet_siafund_outputs(
@@ -234,7 +307,7 @@ class WalletdClient:
             f"/wallets/{wallet_id}/outputs/siafund", params={"offset": offset, "limit": limit}
         )
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def post_wallet_reserve(self, wallet_id: str, reserve_request: WalletReserveRequest) -> None:
@@ -253,14 +326,14 @@ class WalletdClient:
         """Fund a transaction"""
         response = await self.client.post(f"/wallets/{wallet_id}/fund", json=fund_request)
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def post_wallet_fund_siafund(self, wallet_id: str, fund_request: WalletFundSFRequest) -> WalletFundResponse:
         """Fund a siafund transaction"""
         response = await self.client.post(f"/wallets/{wallet_id}/fundsf", json=fund_request)
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     # Address-related endpoints
 
@@ -269,21 +342,35 @@ class WalletdClient:
         """Get balance for address"""
         response = await self.client.get(f"/addresses/{address}/balance")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
+
+    async def get_address_balances(self, addresses: List[str], concurrency: int = 16) -> List[Dict[str, Any]]:
+        """Get balances for many addresses, a failed address gets an error instead of a balance
+
+        `concurrency` is clamped to `1..MAX_FAN_OUT`.
+        """
+        results = await fan_out(addresses, self.get_address_balance, clamp_concurrency(concurrency))
+        return [{"address": address, "balance": balance, "error": error} for address, balance, error in results]
 
     @handle_api_errors(WalletdError)
     async def get_address_events(self, address: str, offset: int = 0, limit: int = 500) -> List[WalletEvent]:
         """Get events for an address"""
         response = await self.client.get(f"/addresses/{address}/events", params={"offset": offset, "limit": limit})
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
+
+    def iter_address_events(self, address: str, page_size: int = 500, prefetch: int = 1) -> AsyncIterator[WalletEvent]:
+        """Stream all events for an address, page by page"""
+        return paginate(
+            lambda offset, limit: self.get_address_events(address, offset=offset, limit=limit), page_size, prefetch
+        )
 
     @handle_api_errors(WalletdError)
     async def get_address_unconfirmed_events(self, address: str) -> List[WalletEvent]:
         """Get unconfirmed events for an address"""
         response = await self.client.get(f"/addresses/{address}/events/unconfirmed")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def get_address_siacoin_outputs(
@@ -294,7 +381,7 @@ class WalletdClient:
             f"/addresses/{address}/outputs/siacoin", params={"offset": offset, "limit": limit}
         )
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def get_address_siafund_outputs(
@@ -305,7 +392,7 @@ class WalletdClient:
             f"/addresses/{address}/outputs/siafund", params={"offset": offset, "limit": limit}
         )
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     # Event-related endpoints
     @handle_api_errors(WalletdError)
@@ -313,7 +400,7 @@ class WalletdClient:
         """Get a specific event"""
         response = await self.client.get(f"/events/{event_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     # Rescan endpoints
     @handle_api_errors(WalletdError)
@@ -321,7 +408,7 @@ class WalletdClient:
         """Get rescan status"""
         response = await self.client.get("/rescan")
         response.raise_for_status()
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def start_rescan(self, height: int) -> None:
@@ -334,10 +421,10 @@ class WalletdClient:
     async def get_siacoin_output(self, id: str) -> SiacoinElement:
         """Get siacoin output"""
         response = await self.client.get(f"/outputs/siacoin/{id}")
-        return response.json()
+        return decode_json(response)
 
     @handle_api_errors(WalletdError)
     async def get_siafund_output(self, id: str) -> SiafundElement:
         """Get siafund output"""
         response = await self.client.get(f"/outputs/siafund/{id}")
-        return response.json()
+        return decode_json(response)
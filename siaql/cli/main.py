@@ -3,14 +3,27 @@ import typer
 import uvicorn
 import os
 import sys
+from dataclasses import replace
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
-from typing import Optional
+from typing import Dict, List, Optional
 from pathlib import Path
 from dotenv import load_dotenv
 from siaql.graphql.app import create_graphql_app
+from siaql.api.cache import CachePolicy
+from siaql.api.compression import resolve_codecs
+from siaql.api.decoding import use_decoder
+from siaql.api.pool import ConnectionPool, PoolLimits, split_socket_url
+from siaql.api.replay import Journal, load_journal
+from siaql.api.resilience import RetryPolicy
+from siaql.api.walletd import CACHE_POLICY as WALLETD_CACHE_POLICY
+from siaql.api.renterd import CACHE_POLICY as RENTERD_CACHE_POLICY
+from siaql.api.hostd import CACHE_POLICY as HOSTD_CACHE_POLICY
 import httpx
+
+CACHE_POLICIES = {"walletd": WALLETD_CACHE_POLICY, "renterd": RENTERD_CACHE_POLICY, "hostd": HOSTD_CACHE_POLICY}
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -21,7 +34,8 @@ console = Console()
 def validate_url(url: str) -> bool:
     """Check if a URL is alive by making a request"""
     try:
-        with httpx.Client() as client:
+        uds, url = split_socket_url(url)
+        with httpx.Client(transport=httpx.HTTPTransport(uds=uds)) as client:
             response = client.get(url)
             return response.status_code < 500  # Accept any non-server error response
     except:
@@ -44,6 +58,39 @@ def get_endpoint_config(name: str, default_url: str) -> tuple[Optional[str], Opt
         return url, password, False
 
 
+def parse_cache_ttls(value: Optional[str]) -> Dict[str, Dict[str, float]]:
+    """Parse per-daemon cache TTL overrides like "hostd.get_settings=30,renterd.get_hosts=5" """
+    ttls: Dict[str, Dict[str, float]] = {}
+    for item in filter(None, (part.strip() for part in (value or "").split(","))):
+        try:
+            name, ttl = item.split("=")
+            daemon, method = name.strip().split(".")
+            ttls.setdefault(daemon, {})[method] = float(ttl)
+        except ValueError:
+            raise typer.BadParameter(f"Invalid cache TTL '{item}', expected <daemon>.<method>=<seconds>")
+    return ttls
+
+
+def parse_cache_daemons(value: Optional[str]) -> List[str]:
+    """Daemons whose responses are cached, every daemon if none are given"""
+    daemons = [daemon.strip().lower() for daemon in (value or "").split(",") if daemon.strip()]
+    for daemon in daemons:
+        if daemon not in CACHE_POLICIES:
+            raise typer.BadParameter(f"Unknown daemon '{daemon}' in cache daemons, expected walletd, renterd or hostd")
+    return daemons or list(CACHE_POLICIES)
+
+
+def build_cache_policies(
+    cache_daemons: Optional[str], cache_ttls: Optional[str], max_entries: int
+) -> Dict[str, CachePolicy]:
+    """Response cache policies of the daemons with a cache, TTL overrides applied"""
+    ttl_overrides = parse_cache_ttls(cache_ttls)
+    return {
+        daemon: replace(CACHE_POLICIES[daemon].with_ttls(ttl_overrides.get(daemon, {})), max_entries=max_entries)
+        for daemon in parse_cache_daemons(cache_daemons)
+    }
+
+
 @app.command()
 def serve(
     host: str = typer.Option(None, help="Host to bind the server to", envvar="HOST"),
@@ -52,11 +99,127 @@ def serve(
     walletd_password: Optional[str] = typer.Option(None, help="Walletd API password", envvar="WALLETD_PASSWORD"),
     renterd_url: str = typer.Option(None, help="Renterd API URL", envvar="RENTERD_URL"),
     renterd_password: Optional[str] = typer.Option(None, help="Renterd API password", envvar="RENTERD_PASSWORD"),
+    renterd_worker_urls: Optional[str] = typer.Option(
+        None,
+        help="Comma-separated renterd worker URLs to spread worker calls over, defaults to RENTERD_URL",
+        envvar="RENTERD_WORKER_URLS",
+    ),
     hostd_url: str = typer.Option(None, help="Hostd API URL", envvar="HOSTD_URL"),
     hostd_password: Optional[str] = typer.Option(None, help="Hostd API password", envvar="HOSTD_PASSWORD"),
     skip_walletd: bool = typer.Option(False, help="Skip walletd configuration", envvar="SKIP_WALLETD"),
     skip_renterd: bool = typer.Option(False, help="Skip renterd configuration", envvar="SKIP_RENTERD"),
     skip_hostd: bool = typer.Option(False, help="Skip hostd configuration", envvar="SKIP_HOSTD"),
+    max_connections: int = typer.Option(100, help="Max upstream connections per daemon", envvar="MAX_CONNECTIONS"),
+    max_keepalive_connections: int = typer.Option(
+        20, help="Max idle keep-alive connections per daemon", envvar="MAX_KEEPALIVE_CONNECTIONS"
+    ),
+    keepalive_expiry: float = typer.Option(
+        5.0, help="Seconds an idle upstream connection is kept alive", envvar="KEEPALIVE_EXPIRY"
+    ),
+    http2: bool = typer.Option(False, help="Use HTTP/2 for upstream connections (requires h2)", envvar="HTTP2"),
+    upstream_timeout: float = typer.Option(30.0, help="Upstream request timeout in seconds", envvar="UPSTREAM_TIMEOUT"),
+    walletd_max_connections: Optional[int] = typer.Option(
+        None, help="Max upstream connections to walletd", envvar="WALLETD_MAX_CONNECTIONS"
+    ),
+    renterd_max_connections: Optional[int] = typer.Option(
+        None, help="Max upstream connections to renterd", envvar="RENTERD_MAX_CONNECTIONS"
+    ),
+    hostd_max_connections: Optional[int] = typer.Option(
+        None, help="Max upstream connections to hostd", envvar="HOSTD_MAX_CONNECTIONS"
+    ),
+    coalesce_gets: bool = typer.Option(
+        True, help="Share one upstream request between identical concurrent GETs", envvar="COALESCE_GETS"
+    ),
+    adaptive_concurrency: bool = typer.Option(
+        True,
+        help="Adapt each daemon's concurrent request limit to its latency and errors",
+        envvar="ADAPTIVE_CONCURRENCY",
+    ),
+    response_cache: bool = typer.Option(
+        True, help="Cache responses of rarely changing endpoints", envvar="RESPONSE_CACHE"
+    ),
+    cache_daemons: Optional[str] = typer.Option(
+        None,
+        help="Comma-separated daemons whose responses are cached, e.g. walletd,hostd (defaults to all)",
+        envvar="CACHE_DAEMONS",
+    ),
+    cache_max_entries: int = typer.Option(1024, help="Max cached responses per daemon", envvar="CACHE_MAX_ENTRIES"),
+    cache_ttls: Optional[str] = typer.Option(
+        None,
+        help="Per-daemon cache TTL overrides, e.g. hostd.get_settings=30,renterd.get_hosts=5 (0 disables)",
+        envvar="CACHE_TTLS",
+    ),
+    conversion_cache_size: int = typer.Option(
+        8,
+        help="Converted results of unchanged upstream responses kept per GraphQL field type (0 disables)",
+        envvar="CONVERSION_CACHE_SIZE",
+    ),
+    dedupe_calls: bool = typer.Option(
+        True,
+        help="Share identical upstream calls within a query and batch single contract lookups",
+        envvar="DEDUPE_CALLS",
+    ),
+    lazy_conversion: bool = typer.Option(
+        False,
+        help="Convert upstream objects field by field as the query reads them instead of all at once",
+        envvar="LAZY_CONVERSION",
+    ),
+    dict_resolvers: bool = typer.Option(
+        False,
+        help="Resolve fields straight from the upstream JSON instead of converting it to GraphQL objects first",
+        envvar="DICT_RESOLVERS",
+    ),
+    result_cache_ttl: float = typer.Option(
+        0,
+        help="Seconds complete results of repeated queries are served from memory (0 disables)",
+        envvar="RESULT_CACHE_TTL",
+    ),
+    result_cache_size: int = typer.Option(256, help="Max cached query results", envvar="RESULT_CACHE_SIZE"),
+    tip_poll_interval: float = typer.Option(
+        5.0,
+        help="Seconds between chain tip polls that expire cached consensus data (0 disables)",
+        envvar="TIP_POLL_INTERVAL",
+    ),
+    max_retries: int = typer.Option(
+        2, help="Retries for idempotent upstream GETs that fail to connect (0 disables)", envvar="MAX_RETRIES"
+    ),
+    retry_backoff: float = typer.Option(
+        0.2, help="Base delay in seconds of the jittered exponential backoff between retries", envvar="RETRY_BACKOFF"
+    ),
+    breaker_threshold: int = typer.Option(
+        5,
+        help="Consecutive upstream failures after which a daemon's calls fail fast (0 disables)",
+        envvar="BREAKER_THRESHOLD",
+    ),
+    breaker_reset_timeout: float = typer.Option(
+        30.0,
+        help="Seconds an open circuit breaker waits before probing the daemon again",
+        envvar="BREAKER_RESET_TIMEOUT",
+    ),
+    request_timeout: float = typer.Option(
+        60.0,
+        help="Seconds a GraphQL request may spend on upstream calls, clients can ask for less (0 disables)",
+        envvar="REQUEST_TIMEOUT",
+    ),
+    record_journal: Optional[str] = typer.Option(
+        None, help="Record all daemon traffic, timings included, to this gzipped journal", envvar="RECORD_JOURNAL"
+    ),
+    replay_journal: Optional[str] = typer.Option(
+        None, help="Answer daemon calls from a recorded journal instead of the daemons", envvar="REPLAY_JOURNAL"
+    ),
+    replay_latency_scale: float = typer.Option(
+        1.0,
+        help="Factor applied to recorded latencies when replaying (0 answers immediately)",
+        envvar="REPLAY_LATENCY_SCALE",
+    ),
+    upstream_compression: str = typer.Option(
+        "auto",
+        help="Content codings asked of the daemons: auto (every available one), off, or a list like zstd,br,gzip",
+        envvar="UPSTREAM_COMPRESSION",
+    ),
+    json_decoder: str = typer.Option(
+        "auto", help="JSON decoder for upstream responses: auto, orjson or stdlib", envvar="JSON_DECODER"
+    ),
 ):
     """Start the GraphQL server"""
 
@@ -148,6 +311,64 @@ def serve(
     console.print(table)
     console.print()  # Add empty line for spacing
 
+    try:
+        use_decoder(json_decoder)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--json-decoder")
+
+    # Shared upstream connection pools, with optional per-daemon connection limits
+    limits = PoolLimits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+        http2=http2,
+        timeout=upstream_timeout,
+    )
+    daemon_limits = {
+        daemon: replace(limits, max_connections=daemon_max)
+        for daemon, daemon_max in (
+            ("walletd", walletd_max_connections),
+            ("renterd", renterd_max_connections),
+            ("hostd", hostd_max_connections),
+        )
+        if daemon_max is not None
+    }
+    # Daemon traffic is either recorded to a journal or replayed from one
+    if record_journal and replay_journal:
+        raise typer.BadParameter("RECORD_JOURNAL and REPLAY_JOURNAL can't be used together")
+    journal = Journal(record_journal) if record_journal else None
+    try:
+        replay_records = load_journal(replay_journal) if replay_journal else None
+    except (OSError, ValueError) as e:
+        raise typer.BadParameter(f"Can't read replay journal: {e}")
+    if journal is not None:
+        console.print(f"[cyan]Recording daemon traffic to {record_journal}[/cyan]")
+    if replay_records is not None:
+        console.print(f"[cyan]Replaying daemon traffic from {replay_journal}, daemons won't be contacted[/cyan]")
+    if upstream_compression.strip().lower() == "auto":
+        compression = None
+    elif upstream_compression.strip().lower() == "off":
+        compression = []
+    else:
+        compression = [codec.strip().lower() for codec in upstream_compression.split(",") if codec.strip()]
+    try:
+        resolve_codecs(compression)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    pool = ConnectionPool(
+        limits=limits,
+        daemon_limits=daemon_limits,
+        coalesce_gets=coalesce_gets,
+        adaptive_concurrency=adaptive_concurrency,
+        journal=journal,
+        replay_records=replay_records,
+        replay_latency_scale=replay_latency_scale,
+        compression=compression,
+    )
+
+    # Per-daemon response cache policies
+    cache_policies = build_cache_policies(cache_daemons, cache_ttls, cache_max_entries) if response_cache else {}
+
     graphql_app = create_graphql_app(
         walletd_url=walletd_url,
         walletd_password=walletd_password,
@@ -156,9 +377,27 @@ def serve(
         hostd_url=hostd_url,
         hostd_password=hostd_password,
         skipped_endpoints=skipped_endpoints,
+        pool=pool,
+        cache_policies=cache_policies,
+        tip_poll_interval=tip_poll_interval,
+        retry_policy=RetryPolicy(max_retries=max_retries, base_delay=retry_backoff) if max_retries > 0 else None,
+        breaker_threshold=breaker_threshold,
+        breaker_reset_timeout=breaker_reset_timeout,
+        request_timeout=request_timeout or None,
+        conversion_cache_size=conversion_cache_size,
+        dedupe_calls=dedupe_calls,
+        lazy_conversion=lazy_conversion,
+        dict_resolvers=dict_resolvers,
+        result_cache_ttl=result_cache_ttl,
+        result_cache_size=result_cache_size,
+        renterd_worker_urls=[url.strip() for url in (renterd_worker_urls or "").split(",") if url.strip()],
     )
 
-    uvicorn.run(graphql_app, host=host, port=port, log_level="info")
+    try:
+        uvicorn.run(graphql_app, host=host, port=port, log_level="info")
+    finally:
+        if journal is not None:
+            journal.close()
 
 
 if __name__ == "__main__":
@@ -1,13 +1,26 @@
 # siaql/siaql/graphql/app.py
-from typing import Optional, Union, Dict, Any
+from dataclasses import replace
+from typing import Optional, Union, Dict, Any, List
 from strawberry.asgi import GraphQL
 from starlette.requests import Request
 from starlette.websockets import WebSocket
 from starlette.responses import Response
-from siaql.graphql.schema import schema
+from starlette.types import Receive, Scope, Send
+from siaql.graphql.schema import mapping_schema, schema
 from siaql.api.walletd import WalletdClient
 from siaql.api.renterd import RenterdClient
 from siaql.api.hostd import HostdClient
+from siaql.api.cache import CachePolicy, ResponseCache
+from siaql.api.deadline import DEADLINE_HEADER, Deadline
+from siaql.api.pool import ConnectionPool
+from siaql.api.resilience import CircuitBreaker, RetryPolicy
+from siaql.api.tip import TipWatcher
+from siaql.graphql.binary import BINARY_PREFIX, create_binary_app
+from siaql.graphql.resolvers.converter import ConversionCache
+from siaql.graphql.resolvers.loaders import LoaderRegistry, LoaderStats
+from siaql.graphql.resolvers.pipeline import create_pipeline
+from siaql.graphql.resolvers.pushdown import create_pushdowns
+from siaql.graphql.result_cache import ResultCache
 
 
 class SiaQLGraphQL(GraphQL):
@@ -20,23 +33,139 @@ class SiaQLGraphQL(GraphQL):
         hostd_url: str,
         hostd_password: str,
         skipped_endpoints: Dict[str, bool],
+        pool: Optional[ConnectionPool] = None,
+        cache_policies: Optional[Dict[str, CachePolicy]] = None,
+        tip_poll_interval: float = 5.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        breaker_threshold: int = 0,
+        breaker_reset_timeout: float = 30.0,
+        request_timeout: Optional[float] = None,
+        renterd_worker_urls: Optional[List[str]] = None,
+        conversion_cache_size: int = 0,
+        dedupe_calls: bool = False,
+        lazy_conversion: bool = False,
+        result_cache_ttl: float = 0,
+        result_cache_size: int = 256,
         *args,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
         self.skipped_endpoints = skipped_endpoints
+        # Default time budget of a GraphQL request, clients may ask for less with a header
+        self.request_timeout = request_timeout
+        # All clients share one set of per-daemon connection pools
+        self.pool = pool or ConnectionPool()
+        # Daemons without a cache policy are not cached
+        caches = {daemon: ResponseCache(policy) for daemon, policy in (cache_policies or {}).items()}
+
+        def client_options(daemon: str) -> Dict[str, Any]:
+            # Every daemon gets its own retry counters and circuit breaker
+            return {
+                "pool": self.pool,
+                "cache": caches.get(daemon),
+                "retry": replace(retry_policy) if retry_policy is not None else None,
+                "breaker": (
+                    CircuitBreaker(daemon, breaker_threshold, breaker_reset_timeout) if breaker_threshold > 0 else None
+                ),
+            }
 
         # Initialize clients only for non-skipped endpoints
         self.walletd_client = (
-            None if skipped_endpoints["walletd"] else WalletdClient(base_url=walletd_url, api_password=walletd_password)
+            None
+            if skipped_endpoints["walletd"]
+            else WalletdClient(base_url=walletd_url, api_password=walletd_password, **client_options("walletd"))
         )
         self.renterd_client = (
-            None if skipped_endpoints["renterd"] else RenterdClient(base_url=renterd_url, api_password=renterd_password)
+            None
+            if skipped_endpoints["renterd"]
+            else RenterdClient(
+                base_url=renterd_url,
+                api_password=renterd_password,
+                worker_urls=renterd_worker_urls,
+                **client_options("renterd"),
+            )
         )
         self.hostd_client = (
-            None if skipped_endpoints["hostd"] else HostdClient(base_url=hostd_url, api_password=hostd_password)
+            None
+            if skipped_endpoints["hostd"]
+            else HostdClient(base_url=hostd_url, api_password=hostd_password, **client_options("hostd"))
         )
 
+        # Follow each cached daemon's chain tip to expire its consensus-derived responses
+        self.tip_watchers: Dict[str, TipWatcher] = {}
+        if tip_poll_interval > 0:
+            for daemon, client in self.clients().items():
+                if client.cache is not None and client.cache.policy.tip_scoped:
+                    fetch_tip = getattr(client, client.tip_method)
+                    self.tip_watchers[daemon] = TipWatcher(client.cache, fetch_tip, interval=tip_poll_interval)
+
+        # Converted results of unchanged upstream responses are reused instead of converted again
+        self.conversion_cache = ConversionCache(conversion_cache_size) if conversion_cache_size > 0 else None
+        # Each query gets its own loaders that share and batch identical upstream calls
+        self.loader_stats = LoaderStats() if dedupe_calls else None
+        # Objects are converted field by field as they are resolved instead of all at once
+        self.lazy_conversion = lazy_conversion
+        # Complete results of repeated read-only queries, dropped when a mutation reaches their daemons
+        self.result_cache = ResultCache(result_cache_ttl, result_cache_size) if result_cache_ttl > 0 else None
+
+        # Stages every resolver call goes through, timed for this app alone
+        self.pipeline = create_pipeline()
+        # Filters, sorts and pages handed to the daemons, counted for this app alone
+        self.pushdowns = create_pushdowns()
+
+        # Raw slab and object data is streamed on its own routes instead of going through GraphQL
+        self.binary_app = create_binary_app(self.renterd_client)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+            return
+        if scope["type"] == "http" and scope["path"].startswith(f"{BINARY_PREFIX}/"):
+            await self.binary_app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+    async def lifespan(self, receive: Receive, send: Send) -> None:
+        """Run the background tasks while the server is up"""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def startup(self) -> None:
+        """Start the tip watchers in the server's event loop"""
+        for watcher in self.tip_watchers.values():
+            watcher.ensure_started()
+
+    async def shutdown(self) -> None:
+        """Stop the tip watchers and close the upstream connections"""
+        for watcher in self.tip_watchers.values():
+            await watcher.stop()
+        await self.pool.aclose()
+
+    def clients(self) -> Dict[str, Any]:
+        """The initialized daemon clients by daemon name"""
+        clients = {"walletd": self.walletd_client, "renterd": self.renterd_client, "hostd": self.hostd_client}
+        return {daemon: client for daemon, client in clients.items() if client is not None}
+
+    def request_deadline(self, request: Union[Request, WebSocket]) -> Optional[Deadline]:
+        """Deadline for a GraphQL request, from its timeout header capped at the server's default"""
+        if isinstance(request, WebSocket):
+            return None
+        timeout = self.request_timeout
+        try:
+            requested = float(request.headers[DEADLINE_HEADER])
+        except (KeyError, ValueError):
+            requested = None
+        if requested is not None and requested > 0:
+            timeout = requested if timeout is None else min(timeout, requested)
+        return Deadline.after(timeout) if timeout else None
+
     async def get_context(
         self, request: Union[Request, WebSocket], response: Optional[Response] = None
     ) -> Dict[str, Any]:
@@ -48,6 +177,15 @@ class SiaQLGraphQL(GraphQL):
             "renterd_client": self.renterd_client,
             "hostd_client": self.hostd_client,
             "skipped_endpoints": self.skipped_endpoints,
+            "pool": self.pool,
+            "tip_watchers": self.tip_watchers,
+            "deadline": self.request_deadline(request),
+            "conversion_cache": self.conversion_cache,
+            "loaders": LoaderRegistry(self.loader_stats) if self.loader_stats is not None else None,
+            "lazy_conversion": self.lazy_conversion,
+            "result_cache": self.result_cache,
+            "pipeline": self.pipeline,
+            "pushdowns": self.pushdowns,
         }
         return context
 
@@ -60,10 +198,25 @@ def create_graphql_app(
     hostd_url: str,
     hostd_password: str,
     skipped_endpoints: Dict[str, bool],
+    pool: Optional[ConnectionPool] = None,
+    cache_policies: Optional[Dict[str, CachePolicy]] = None,
+    tip_poll_interval: float = 5.0,
+    retry_policy: Optional[RetryPolicy] = None,
+    breaker_threshold: int = 0,
+    breaker_reset_timeout: float = 30.0,
+    request_timeout: Optional[float] = None,
+    renterd_worker_urls: Optional[List[str]] = None,
+    conversion_cache_size: int = 0,
+    dedupe_calls: bool = False,
+    lazy_conversion: bool = False,
+    dict_resolvers: bool = False,
+    result_cache_ttl: float = 0,
+    result_cache_size: int = 256,
 ) -> GraphQL:
     """Creates and configures the GraphQL application"""
     return SiaQLGraphQL(
-        schema=schema,
+        # Fields are either resolved from converted objects or straight from the upstream dicts
+        schema=mapping_schema() if dict_resolvers else schema,
         walletd_url=walletd_url,
         walletd_password=walletd_password,
         renterd_url=renterd_url,
@@ -71,6 +224,19 @@ def create_graphql_app(
         hostd_url=hostd_url,
         hostd_password=hostd_password,
         skipped_endpoints=skipped_endpoints,
+        pool=pool,
+        cache_policies=cache_policies,
+        tip_poll_interval=tip_poll_interval,
+        retry_policy=retry_policy,
+        breaker_threshold=breaker_threshold,
+        breaker_reset_timeout=breaker_reset_timeout,
+        request_timeout=request_timeout,
+        renterd_worker_urls=renterd_worker_urls,
+        conversion_cache_size=conversion_cache_size,
+        dedupe_calls=dedupe_calls,
+        lazy_conversion=lazy_conversion,
+        result_cache_ttl=result_cache_ttl,
+        result_cache_size=result_cache_size,
         graphiql=True,
         debug=True,
     )
@@ -0,0 +1,161 @@
+# siaql/graphql/binary.py
+from typing import AsyncContextManager, Callable, Optional
+
+import httpx
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route, Router
+from starlette.types import Receive, Scope, Send
+
+from siaql.api.renterd import OBJECT_META_PREFIX, UPLOAD_PARAMS, RenterdClient
+
+# Path prefix the binary routes are served under, everything else goes to GraphQL
+BINARY_PREFIX = "/binary"
+# Upstream response headers forwarded to the HTTP client
+PASSTHROUGH_HEADERS = (
+    "content-type",
+    "content-length",
+    "content-encoding",
+    "content-range",
+    "accept-ranges",
+    "etag",
+    "last-modified",
+)
+
+
+def accept_encoding(request: Request) -> str:
+    """Accept-Encoding to ask renterd for, raw bodies are relayed so only what the HTTP client can decode"""
+    return request.headers.get("accept-encoding", "identity")
+
+
+def error_response(e: Exception) -> JSONResponse:
+    """Report a failed upstream call with the daemon's status code, or 502 if it could not be reached"""
+    cause = e.__cause__ if e.__cause__ is not None else e
+    status = cause.response.status_code if isinstance(cause, httpx.HTTPStatusError) else 502
+    return JSONResponse({"error": str(e)}, status_code=status)
+
+
+class PassthroughResponse(Response):
+    """Response that relays a streamed upstream response chunk by chunk, as received"""
+
+    def __init__(self, open_upstream: Callable[[], AsyncContextManager[httpx.Response]]):
+        self.open_upstream = open_upstream
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        started = False
+        try:
+            async with self.open_upstream() as upstream:
+                headers = [
+                    (name.encode("latin-1"), upstream.headers[name].encode("latin-1"))
+                    for name in PASSTHROUGH_HEADERS
+                    if name in upstream.headers
+                ]
+                await send({"type": "http.response.start", "status": upstream.status_code, "headers": headers})
+                started = True
+                # Streams bypass the compression transport and ask for the HTTP client's own codings, raw
+                # chunks are relayed with their Content-Encoding and Content-Length for the client to decode
+                async for chunk in upstream.aiter_raw():
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                await send({"type": "http.response.body", "body": b""})
+        except httpx.HTTPError as e:
+            if started:
+                # Headers are already out, all that is left is cutting the response short
+                raise
+            await error_response(e)(scope, receive, send)
+
+
+def create_binary_app(renterd_client: Optional[RenterdClient]) -> Router:
+    """Routes that stream slab and object data between HTTP clients and renterd without GraphQL"""
+
+    def renterd_unavailable() -> Optional[JSONResponse]:
+        if renterd_client is None:
+            return JSONResponse({"error": "renterd is disabled"}, status_code=503)
+        return None
+
+    async def get_slabs_partial(request: Request) -> Response:
+        unavailable = renterd_unavailable()
+        if unavailable is not None:
+            return unavailable
+        key = request.path_params["key"]
+        try:
+            offset = int(request.query_params.get("offset", 0))
+            length = int(request.query_params["length"])
+        except (KeyError, ValueError):
+            return JSONResponse({"error": "offset and length must be integers"}, status_code=400)
+        return PassthroughResponse(
+            lambda: renterd_client.open_slabs_partial(key, offset, length, accept_encoding(request))
+        )
+
+    async def add_slabs_partial(request: Request) -> Response:
+        unavailable = renterd_unavailable()
+        if unavailable is not None:
+            return unavailable
+        params = request.query_params
+        content_length = request.headers.get("content-length")
+        try:
+            min_shards, total_shards = int(params["minShards"]), int(params["totalShards"])
+        except (KeyError, ValueError):
+            return JSONResponse({"error": "minShards and totalShards must be integers"}, status_code=400)
+        try:
+            content_length = int(content_length) if content_length is not None else None
+        except ValueError:
+            return JSONResponse({"error": "Content-Length must be an integer"}, status_code=400)
+        try:
+            result = await renterd_client.add_slabs_partial(
+                request.stream(),
+                min_shards=min_shards,
+                total_shards=total_shards,
+                contract_set=params.get("contractSet", ""),
+                content_length=content_length,
+            )
+        except Exception as e:
+            return error_response(e)
+        return JSONResponse(result)
+
+    async def get_object(request: Request) -> Response:
+        unavailable = renterd_unavailable()
+        if unavailable is not None:
+            return unavailable
+        path = request.path_params["path"]
+        bucket = request.query_params.get("bucket", "default")
+        # The client's Range header is forwarded as is
+        byte_range = request.headers.get("range")
+        return PassthroughResponse(
+            lambda: renterd_client.open_object(bucket, path, byte_range, accept_encoding(request))
+        )
+
+    async def put_object(request: Request) -> Response:
+        unavailable = renterd_unavailable()
+        if unavailable is not None:
+            return unavailable
+        path = request.path_params["path"]
+        params = request.query_params
+        options = {key: params[param] for key, param in UPLOAD_PARAMS.items() if param in params}
+        if "content-type" in request.headers:
+            options.setdefault("mimeType", request.headers["content-type"])
+        if "content-length" in request.headers:
+            try:
+                options["contentLength"] = int(request.headers["content-length"])
+            except ValueError:
+                return JSONResponse({"error": "Content-Length must be an integer"}, status_code=400)
+        prefix = OBJECT_META_PREFIX.lower()
+        options["metadata"] = {
+            name[len(prefix) :]: value for name, value in request.headers.items() if name.startswith(prefix)
+        }
+        try:
+            result = await renterd_client.upload_object_stream(
+                params.get("bucket", "default"), path, request.stream(), options
+            )
+        except Exception as e:
+            return error_response(e)
+        headers = {"ETag": result["etag"]} if result.get("etag") else None
+        return Response(status_code=200, headers=headers)
+
+    return Router(
+        routes=[
+            Route(f"{BINARY_PREFIX}/renterd/slabs/partial/{{key}}", get_slabs_partial, methods=["GET"]),
+            Route(f"{BINARY_PREFIX}/renterd/slabs/partial", add_slabs_partial, methods=["POST"]),
+            Route(f"{BINARY_PREFIX}/renterd/objects/{{path:path}}", get_object, methods=["GET"]),
+            Route(f"{BINARY_PREFIX}/renterd/objects/{{path:path}}", put_object, methods=["PUT"]),
+        ]
+    )
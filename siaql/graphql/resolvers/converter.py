@@ -2,15 +2,19 @@
 import enum
 import inspect
 import logging
+from collections import OrderedDict
 from dataclasses import fields
 from datetime import datetime
-from functools import wraps
+from functools import lru_cache, wraps
 from typing import (
     Any,
     Callable,
     Dict,
+    Hashable,
     List,
     Optional,
+    Sequence,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -25,13 +29,78 @@ from strawberry.types import Info
 from strawberry.types.base import StrawberryList, StrawberryOptional, StrawberryType
 from strawberry.types.enum import EnumDefinition as StrawberryEnum
 from strawberry.types.lazy_type import LazyType
+from strawberry.types.nodes import SelectedField, Selection
 from strawberry.types.scalar import ScalarDefinition, ScalarWrapper
 from strawberry.types.union import StrawberryUnion
+from strawberry.utils.str_converters import to_camel_case
 from dateutil import parser
 
 
 logger = logging.getLogger("siaql.resolvers.converter")
 
+# GraphQL names of Python field names, looked up for every field of every converted object
+graphql_name = lru_cache(maxsize=None)(to_camel_case)
+
+# Fields to convert by GraphQL name, each with the projection of its own fields; None converts everything
+Projection = Optional[Dict[str, "Projection"]]
+
+
+def merge_projection(projection: Dict[str, Projection], name: str, sub: Projection) -> None:
+    if name not in projection:
+        projection[name] = sub
+    elif projection[name] is None or sub is None:
+        projection[name] = None
+    else:
+        for sub_name, sub_sub in sub.items():
+            merge_projection(projection[name], sub_name, sub_sub)
+
+
+def compile_projection(selections: Sequence[Selection]) -> Dict[str, Projection]:
+    """Projection of a selection set, fields selected by several fragments are merged"""
+    projection: Dict[str, Projection] = {}
+    for selection in selections:
+        if isinstance(selection, SelectedField):
+            if selection.name.startswith("__"):
+                continue
+            sub = compile_projection(selection.selections) if selection.selections else None
+            merge_projection(projection, selection.name, sub)
+        else:
+            for name, sub in compile_projection(selection.selections).items():
+                merge_projection(projection, name, sub)
+    return projection
+
+
+def add_projection_path(projection: Dict[str, Projection], path: str) -> None:
+    """Include a dotted field path, such as one a filter or sort refers to, with everything below it"""
+    parts = path.split(".")
+    for part in parts[:-1]:
+        if part in projection and projection[part] is None:
+            return
+        projection = projection.setdefault(part, {})
+    projection[parts[-1]] = None
+
+
+def selection_projection(info: Info, paths: Sequence[str] = ()) -> Projection:
+    """Projection of the fields a resolver's query selects, plus the given field paths"""
+    selected = getattr(info, "selected_fields", None)
+    if not selected or not selected[0].selections:
+        return None
+    projection = compile_projection(selected[0].selections)
+    for path in paths:
+        if path:
+            add_projection_path(projection, path)
+    return projection
+
+
+def project(projection: Projection, python_name: str, json_name: Optional[str]) -> Tuple[bool, Projection]:
+    """Whether a field is selected and the projection of its own fields"""
+    if projection is None:
+        return True, None
+    for name in (json_name, python_name, graphql_name(python_name)):
+        if name in projection:
+            return True, projection[name]
+    return False, None
+
 
 class TypeConverter:
     @staticmethod
@@ -83,13 +152,13 @@ class TypeConverter:
         return type_obj
 
     @classmethod
-    def convert_value(cls, value: Any, target_type: Type) -> Any:
+    def convert_value(cls, value: Any, target_type: Type, projection: Projection = None, lazy: bool = False) -> Any:
         """Convert a value to the target type, handling nested structures"""
         if value is None:
             return None
 
         if isinstance(target_type, StrawberryOptional):
-            return cls.convert_value(value, target_type.of_type)  # Unwrap optional
+            return cls.convert_value(value, target_type.of_type, projection, lazy)  # Unwrap optional
 
         # Handle StrawberryList
         if isinstance(target_type, StrawberryList):
@@ -99,11 +168,11 @@ class TypeConverter:
             if not isinstance(value, (list, tuple)):
                 return None
             # Convert each item in the list using the list's element type
-            return [cls.convert_value(item, target_type.of_type) for item in value]
+            return [cls.convert_value(item, target_type.of_type, projection, lazy) for item in value]
 
         # Handle LazyType
         if isinstance(target_type, LazyType):
-            return cls.convert_value(value, target_type.resolve_type())
+            return cls.convert_value(value, target_type.resolve_type(), projection, lazy)
 
         # Get the wrapped type (preserving Optional wrapper)
         wrapped_type = cls.get_wrapped_type(target_type)
@@ -116,7 +185,7 @@ class TypeConverter:
             # Try each possible type until one works
             for possible_type in possible_types:
                 try:
-                    return cls.convert_value(value, possible_type)
+                    return cls.convert_value(value, possible_type, projection, lazy)
                 except (ValueError, TypeError):
                     continue
             return value
@@ -149,7 +218,9 @@ class TypeConverter:
             hasattr(base_type, "__strawberry_definition__")
             or (inspect.isclass(base_type) and issubclass(base_type, strawberry.type))
         ):
-            converted = cls.convert_to_strawberry_type(value, base_type)
+            if lazy and inspect.isclass(base_type):
+                return lazy_type(base_type).wrap(value)
+            converted = cls.convert_to_strawberry_type(value, base_type, projection)
             # Create an instance if needed
             if inspect.isclass(base_type) and not isinstance(converted, base_type):
                 # Get all required fields with their default values
@@ -211,8 +282,11 @@ class TypeConverter:
         return python_name, json_name
 
     @classmethod
-    def convert_to_strawberry_type(cls, data: Dict[str, Any], target_type: Type) -> Any:
-        """Convert a dictionary to a Strawberry type, handling nested fields"""
+    def convert_to_strawberry_type(cls, data: Dict[str, Any], target_type: Type, projection: Projection = None) -> Any:
+        """Convert a dictionary to a Strawberry type, handling nested fields
+
+        With a projection only the selected fields are converted, the others are left unset.
+        """
         if not isinstance(data, dict):
             return data
 
@@ -233,9 +307,12 @@ class TypeConverter:
         for key, value in data.items():
             if key in field_mappings:
                 python_name, field = field_mappings[key]
+                selected, sub_projection = project(projection, python_name, getattr(field, "graphql_name", None))
+                if not selected:
+                    continue
                 field_type = field.type if hasattr(field, "type") else field
                 try:
-                    converted_value = cls.convert_value(value, field_type)
+                    converted_value = cls.convert_value(value, field_type, sub_projection)
                     result[python_name] = converted_value
                 except Exception as e:
                     logger.error("Error converting field %s: %s", key, str(e))
@@ -266,6 +343,129 @@ class TypeConverter:
         return result
 
     @classmethod
-    def convert(cls, value: Any, target_type: Type) -> Any:
-        """Main entry point for type conversion"""
-        return cls.convert_value(value, target_type)
+    def convert(cls, value: Any, target_type: Type, projection: Projection = None, lazy: bool = False) -> Any:
+        """Main entry point for type conversion, converting only the fields in `projection` if given
+
+        With `lazy` objects are returned as `LazyObject` proxies that convert each field when it is first read.
+        """
+        return cls.convert_value(value, target_type, projection, lazy)
+
+
+class LazyField:
+    """Field of a lazy object, converted from the object's raw data the first time it is read"""
+
+    def __init__(self, python_name: str, keys: Tuple[str, ...], field_type: Any, default: Any):
+        self.python_name = python_name
+        # Keys the field may have in the raw data
+        self.keys = keys
+        self.field_type = field_type
+        self.default = default
+
+    def __get__(self, instance: Any, owner: Type) -> Any:
+        if instance is None:
+            return self
+        data = instance.__dict__[LazyObject.DATA]
+        key = next((key for key in self.keys if key in data), None)
+        if key is None:
+            value = self.default
+        else:
+            try:
+                value = TypeConverter.convert_value(data[key], self.field_type, lazy=True)
+            except Exception as e:
+                logger.error("Error converting field %s: %s", key, str(e))
+                value = None
+        # The converted value shadows the field from now on
+        instance.__dict__[self.python_name] = value
+        return value
+
+
+class LazyObject:
+    """Proxy of a Strawberry object that only converts the fields that are read
+
+    Proxies are instances of a subclass of the target type, so type checks and union resolution
+    treat them like converted objects, but nested objects and lists are only built on access.
+    """
+
+    DATA = "_lazy_data"
+
+    @classmethod
+    def wrap(cls, data: Dict[str, Any]) -> Any:
+        instance = object.__new__(cls)
+        instance.__dict__[cls.DATA] = data
+        return instance
+
+
+_lazy_types: Dict[Type, Type] = {}
+
+
+def lazy_type(target_type: Type) -> Type:
+    """The `LazyObject` subclass of a Strawberry type, created on first use"""
+    lazy = _lazy_types.get(target_type)
+    if lazy is None:
+        defaults = TypeConverter.get_required_fields(target_type)
+        namespace: Dict[str, Any] = {"__module__": target_type.__module__}
+        for field in TypeConverter.get_all_fields(target_type).values():
+            if getattr(field, "base_resolver", None) is not None:
+                continue
+            python_name, json_name = TypeConverter.get_field_name_mapping(field)
+            keys = tuple(dict.fromkeys(key for key in (json_name, python_name) if key))
+            field_type = field.type if hasattr(field, "type") else field
+            namespace[python_name] = LazyField(python_name, keys, field_type, defaults.get(python_name))
+        lazy = type(target_type.__name__, (LazyObject, target_type), namespace)
+        _lazy_types[target_type] = lazy
+    return lazy
+
+
+class ConversionCache:
+    """Converted results of byte-identical upstream responses, so they aren't converted again
+
+    Results are keyed by the client call and the digests of the response bodies it decoded, and
+    kept in a small LRU per GraphQL field type. Cached results are shared between requests and
+    must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._entries: Dict[Any, "OrderedDict[Tuple[Hashable, ...], Any]"] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(
+        field_type: Any, method: str, transform_func: Optional[Callable], call: Any, digests: Sequence[bytes]
+    ) -> Optional[Tuple[Hashable, ...]]:
+        """Key of a converted result, None when it can't be told apart from other responses"""
+        if field_type is None or not digests:
+            return None
+        # Lambdas are created anew on every call, their code object identifies them
+        transform = getattr(transform_func, "__code__", transform_func)
+        # Concurrent fetches record their digests in completion order, each digest covers its URL
+        return field_type, method, transform, repr(call), tuple(sorted(digests))
+
+    def get(self, key: Tuple[Hashable, ...]) -> Tuple[bool, Any]:
+        entries = self._entries.get(key[0])
+        if entries is None or key not in entries:
+            self.misses += 1
+            return False, None
+        entries.move_to_end(key)
+        self.hits += 1
+        return True, entries[key]
+
+    def set(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        entries = self._entries.setdefault(key[0], OrderedDict())
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "fieldTypes": len(self._entries),
+            "entries": sum(len(entries) for entries in self._entries.values()),
+            "maxEntriesPerType": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
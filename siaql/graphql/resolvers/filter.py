@@ -234,6 +234,17 @@ class QueryFiltering:
             return items[start:end]
         return items[start:]
 
+    @staticmethod
+    def required_items(
+        filter_input: Optional[FilterInput] = None,
+        sort_input: Optional[SortInput] = None,
+        pagination_input: Optional[PaginationInput] = None,
+    ) -> Optional[int]:
+        """How many leading items a query needs, or None if it needs all of them"""
+        if filter_input or sort_input or not pagination_input or pagination_input.limit is None:
+            return None
+        return max(0, pagination_input.offset) + pagination_input.limit
+
     @classmethod
     def process_query(
         cls,
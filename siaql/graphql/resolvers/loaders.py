@@ -0,0 +1,160 @@
+# siaql/graphql/resolvers/loaders.py
+import asyncio
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from graphql import OperationType
+from strawberry.dataloader import DataLoader
+from strawberry.types import Info
+
+from siaql.api.decoding import capture_digests, record_digests
+
+# Positional and keyword arguments of a client call
+CallKey = Tuple[Tuple[Any, ...], Tuple[Tuple[str, Any], ...]]
+# A call's result with the digests of the responses it was decoded from
+Loaded = Tuple[Any, Tuple[bytes, ...]]
+
+
+@dataclass(frozen=True)
+class BatchRule:
+    """Serves several single-item calls with one call of a list endpoint"""
+
+    # Client method returning the items
+    list_method: str
+    # Keyword argument of the single-item call holding the item ID
+    id_arg: str
+    # Arguments of the list call for the requested IDs
+    list_args: Callable[[List[Any]], Tuple[Tuple[Any, ...], Dict[str, Any]]] = lambda ids: ((), {})
+    # Items of the list call's result
+    items: Callable[[Any], Sequence[Dict[str, Any]]] = lambda result: result
+    # Field of an item holding its ID
+    item_id: str = "id"
+    # Fewest concurrent calls worth a list call
+    min_batch: int = 2
+
+
+BATCH_RULES: Dict[Tuple[str, str], BatchRule] = {
+    # Only endpoints that filter by the requested IDs, renterd's contract list can't and may be huge
+    ("hostd", "get_contract"): BatchRule(
+        "post_contracts",
+        "id",
+        list_args=lambda ids: ((), {"filter": {"contractIDs": ids, "offset": 0, "limit": len(ids)}}),
+        items=lambda result: result.get("contracts") or [],
+    ),
+}
+
+
+def cache_key(key: CallKey) -> Hashable:
+    try:
+        hash(key)
+        return key
+    except TypeError:
+        # Input objects are unhashable dataclasses, their repr holds every field
+        return repr(key)
+
+
+class LoaderStats:
+    """Counters of the per-request loaders, shared by every request"""
+
+    def __init__(self):
+        self.loads = 0
+        self.keys = 0
+        self.calls = 0
+        self.batches = 0
+        self.batched = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "loads": self.loads,
+            "upstreamCalls": self.calls,
+            "deduplicated": self.loads - self.keys,
+            "batches": self.batches,
+            "batchedCalls": self.batched,
+        }
+
+
+class LoaderRegistry:
+    """DataLoaders of one GraphQL request, one per daemon client method
+
+    Calls with the same arguments made anywhere in the request, e.g. from several aliases or
+    fragments, share one upstream call. Concurrent single-item calls that have a `BatchRule` are
+    served by one call of the list endpoint, items it doesn't return are still fetched one by one.
+    """
+
+    def __init__(self, stats: Optional[LoaderStats] = None, rules: Optional[Dict[Tuple[str, str], BatchRule]] = None):
+        self.counters = stats or LoaderStats()
+        self.rules = BATCH_RULES if rules is None else rules
+        self._loaders: Dict[Tuple[str, str], DataLoader] = {}
+
+    def wrap(self, daemon: str, client: Any, method: str) -> Callable[..., Any]:
+        """The client method, going through this request's loader unless it streams pages"""
+        method_func = getattr(client, method)
+        if not inspect.iscoroutinefunction(method_func):
+            # Paged iterators are consumed by each caller
+            return method_func
+        if (daemon, method) not in self._loaders:
+            load_fn = self._load_fn(daemon, client, method)
+            self._loaders[(daemon, method)] = DataLoader(load_fn, cache_key_fn=cache_key)
+        loader = self._loaders[(daemon, method)]
+
+        async def load(*args: Any, **kwargs: Any) -> Any:
+            self.counters.loads += 1
+            result, digests = await loader.load((args, tuple(sorted(kwargs.items()))))
+            # Every caller reports the responses its result came from, for the conversion cache
+            record_digests(digests)
+            return result
+
+        return load
+
+    def _load_fn(self, daemon: str, client: Any, method: str) -> Callable[[List[CallKey]], Any]:
+        rule = self.rules.get((daemon, method))
+
+        async def fetch(key: CallKey) -> Loaded:
+            args, kwargs = key
+            self.counters.calls += 1
+            with capture_digests() as digests:
+                result = await getattr(client, method)(*args, **dict(kwargs))
+            return result, tuple(digests)
+
+        async def load_fn(keys: List[CallKey]) -> List[Any]:
+            self.counters.keys += len(keys)
+            batched: Dict[int, Loaded] = {}
+            if rule is not None and len(keys) >= rule.min_batch:
+                batched = await self._batch(client, rule, keys)
+            rest = [key for i, key in enumerate(keys) if i not in batched]
+            fetched = iter(await asyncio.gather(*(fetch(key) for key in rest), return_exceptions=True))
+            return [batched[i] if i in batched else next(fetched) for i in range(len(keys))]
+
+        return load_fn
+
+    async def _batch(self, client: Any, rule: BatchRule, keys: List[CallKey]) -> Dict[int, Loaded]:
+        """Results of the calls the list endpoint answers, by their position in `keys`"""
+        ids: Dict[int, Any] = {}
+        for i, (args, kwargs) in enumerate(keys):
+            kwargs = dict(kwargs)
+            if not args and set(kwargs) == {rule.id_arg}:
+                ids[i] = kwargs[rule.id_arg]
+        if len(ids) < rule.min_batch:
+            return {}
+        list_args, list_kwargs = rule.list_args(list(dict.fromkeys(ids.values())))
+        self.counters.calls += 1
+        try:
+            with capture_digests() as digests:
+                result = await getattr(client, rule.list_method)(*list_args, **list_kwargs)
+            items = {str(item.get(rule.item_id)): item for item in rule.items(result) if isinstance(item, dict)}
+        except Exception:
+            # The single-item calls report their own errors
+            return {}
+        self.counters.batches += 1
+        found = {i: (items[str(id)], tuple(digests)) for i, id in ids.items() if str(id) in items}
+        self.counters.batched += len(found)
+        return found
+
+
+def request_loaders(info: Info) -> Optional[LoaderRegistry]:
+    """The request's loaders, only queries share calls since mutations must reach the daemon every time"""
+    operation = getattr(getattr(info, "operation", None), "operation", None)
+    if operation is not OperationType.QUERY:
+        return None
+    return info.context.get("loaders")
@@ -0,0 +1,85 @@
+# siaql/graphql/resolvers/mapping.py
+import datetime
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Tuple
+
+import strawberry
+from graphql import GraphQLEnumType
+from strawberry.schema.types.base_scalars import DateTime as BaseDateTime
+from strawberry.types.base import StrawberryObjectDefinition
+
+from siaql.graphql.resolvers.converter import TypeConverter
+
+
+class MappingResolver:
+    """Default resolver that reads fields straight from the upstream JSON dicts
+
+    Strawberry only hands default resolvers the field's Python name, so the JSON keys each Python
+    name has across the schema's types are looked up, most common first, then the Python name
+    itself. No type uses two of a name's keys, so the first key a dict holds is the field's.
+    Anything that isn't a dict, such as objects built by resolvers, is read with getattr.
+    """
+
+    def __init__(self):
+        self.keys: Dict[str, Tuple[str, ...]] = {}
+
+    def index(self, schema: strawberry.Schema) -> None:
+        """Learn the JSON keys of every output type's fields"""
+        counts: Dict[str, Counter] = defaultdict(Counter)
+        for concrete in schema.schema_converter.type_map.values():
+            definition = concrete.definition
+            if not isinstance(definition, StrawberryObjectDefinition) or definition.is_input:
+                continue
+            for field in definition.fields:
+                if field.base_resolver is None and field.graphql_name:
+                    counts[field.python_name][field.graphql_name] += 1
+        self.keys = {
+            python_name: tuple(dict.fromkeys([key for key, _ in names.most_common()] + [python_name]))
+            for python_name, names in counts.items()
+        }
+
+    def __call__(self, source: Any, python_name: str) -> Any:
+        if not isinstance(source, dict):
+            return getattr(source, python_name)
+        for key in self.keys.get(python_name, (python_name,)):
+            if key in source:
+                return source[key]
+        return None
+
+
+def serialize_datetime(value: Any) -> str:
+    """Timestamps are only parsed to be serialized, raw strings are normalized to isoformat"""
+    if isinstance(value, str):
+        value = TypeConverter.parse_datetime(value)
+    return value.isoformat()
+
+
+# Scalars whose serializers also take the raw JSON values
+MAPPING_SCALARS = {
+    datetime.datetime: strawberry.scalar(
+        datetime.datetime,
+        name="DateTime",
+        description=BaseDateTime._scalar_definition.description,
+        serialize=serialize_datetime,
+        parse_value=BaseDateTime._scalar_definition.parse_value,
+    ),
+}
+
+
+def enum_serializer(enum_type: GraphQLEnumType) -> Callable[[Any], Any]:
+    """Serializer also taking the raw names upstream sends, in any case, like the converter does"""
+    serialize = enum_type.serialize
+
+    def serialize_raw(value: Any) -> Any:
+        if isinstance(value, str) and value.upper() in enum_type.values:
+            return value.upper()
+        return serialize(value)
+
+    return serialize_raw
+
+
+def coerce_raw_enums(schema: strawberry.Schema) -> None:
+    """Let the schema's enums serialize raw JSON values, the schema's GraphQL types are its own"""
+    for graphql_type in schema._schema.type_map.values():
+        if isinstance(graphql_type, GraphQLEnumType) and not graphql_type.name.startswith("__"):
+            graphql_type.serialize = enum_serializer(graphql_type)
@@ -0,0 +1,280 @@
+# siaql/graphql/resolvers/pipeline.py
+import inspect
+import logging
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple, TypeVar, Union
+
+from strawberry.types import Info
+
+from siaql.api.decoding import capture_digests
+from siaql.api.deadline import deadline_scope, within_deadline
+from siaql.api.utils import collect
+from siaql.graphql.resolvers.converter import ConversionCache, Projection, TypeConverter, selection_projection
+from siaql.graphql.resolvers.filter import FilterInput, PaginationInput, QueryFiltering, SortInput
+from siaql.graphql.resolvers.loaders import request_loaders
+from siaql.graphql.resolvers.mapping import MappingResolver
+from siaql.graphql.resolvers.pushdown import create_pushdowns
+
+T = TypeVar("T")
+
+
+@dataclass
+class Resolution:
+    """State of one resolver call as it passes through the pipeline's stages"""
+
+    info: Info
+    daemon: str
+    method: str
+    transform_func: Optional[Callable[[Any], Any]] = None
+    filter_input: Optional[FilterInput] = None
+    sort_input: Optional[SortInput] = None
+    pagination_input: Optional[PaginationInput] = None
+    args: Tuple[Any, ...] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    result: Any = None
+    # Digests of the upstream responses the result was decoded from
+    digests: List[bytes] = field(default_factory=list)
+    # Items a paged endpoint was cut off at, part of what the result depends on
+    max_items: Optional[int] = None
+    conversion_key: Optional[Hashable] = None
+    # Stages to pass over, and whether the remaining stages are passed over
+    skip: Set[str] = field(default_factory=set)
+    done: bool = False
+
+    @property
+    def field_type(self) -> Any:
+        return self.info._field.type if hasattr(self.info, "_field") else None
+
+    @property
+    def serves_dicts(self) -> bool:
+        """Whether the schema resolves fields from the upstream dicts, which then aren't converted"""
+        config = getattr(getattr(self.info, "schema", None), "config", None)
+        return isinstance(getattr(config, "default_resolver", None), MappingResolver)
+
+    @property
+    def lazy(self) -> bool:
+        return bool(self.info.context.get("lazy_conversion"))
+
+    @cached_property
+    def projection(self) -> Projection:
+        """Fields the query selects, plus those left to filter and sort by in process"""
+        if self.lazy:
+            # Lazy results only convert what is read, the whole tree stays available
+            return None
+        paths = [item.field for item in (self.filter_input, self.sort_input) if item is not None]
+        return selection_projection(self.info, paths)
+
+    def finish(self, result: Any) -> None:
+        """Settle the result, no further stage runs"""
+        self.result = result
+        self.done = True
+
+
+Stage = Callable[[Resolution], Union[None, Awaitable[None]]]
+
+
+def push_down(resolution: Resolution) -> None:
+    """Hand the filtering, sorting and paging the endpoint supports natively to the daemon"""
+    # Contexts without the app's registry get a fresh one that is counted nowhere
+    pushdowns = resolution.info.context.get("pushdowns") or create_pushdowns()
+    pushdowns.apply(resolution)
+
+
+async def fetch(resolution: Resolution) -> None:
+    """Get the raw data from the daemon, cancelled if the request's deadline passes first"""
+    info = resolution.info
+    client = info.context[f"{resolution.daemon}_client"]
+    method_func = getattr(client, resolution.method)
+    # Identical calls in one query share a single upstream call
+    loaders = request_loaders(info)
+    if loaders is not None:
+        method_func = loaders.wrap(resolution.daemon, client, resolution.method)
+    deadline = info.context.get("deadline")
+    with deadline_scope(deadline), capture_digests() as digests:
+        result = method_func(*resolution.args, **resolution.kwargs)
+        if inspect.isasyncgen(result):
+            # Paged endpoints are streamed, stop fetching once the requested window is complete
+            resolution.max_items = QueryFiltering.required_items(
+                resolution.filter_input, resolution.sort_input, resolution.pagination_input
+            )
+            result = collect(result, resolution.max_items)
+        resolution.result = await within_deadline(result, deadline)
+    resolution.digests = digests
+
+
+def reuse_conversion(resolution: Resolution) -> None:
+    """Reuse the conversion of byte-identical responses for this field"""
+    conversions: Optional[ConversionCache] = resolution.info.context.get("conversion_cache")
+    if conversions is None or resolution.serves_dicts:
+        return
+    call = (resolution.args, resolution.kwargs, resolution.max_items, resolution.projection)
+    key = ConversionCache.make_key(
+        resolution.field_type, resolution.method, resolution.transform_func, call, resolution.digests
+    )
+    if key is None:
+        return
+    hit, converted = conversions.get(key)
+    if hit:
+        resolution.result = converted
+        resolution.skip.add("convert")
+    else:
+        resolution.conversion_key = key
+
+
+def convert(resolution: Resolution) -> None:
+    """Apply the field's transformation, then convert the fields the query selects to their GraphQL types"""
+    if resolution.transform_func:
+        resolution.result = resolution.transform_func(resolution.result)
+    field_type = resolution.field_type
+    if field_type is not None and not resolution.serves_dicts:
+        resolution.result = TypeConverter.convert(resolution.result, field_type, resolution.projection, resolution.lazy)
+        if resolution.conversion_key is not None:
+            resolution.info.context["conversion_cache"].set(resolution.conversion_key, resolution.result)
+
+
+def apply_filter(resolution: Resolution) -> None:
+    """Filter lists, on the converted types"""
+    if not isinstance(resolution.result, list):
+        # Only lists are filtered, sorted and paged
+        resolution.done = True
+    elif resolution.filter_input:
+        resolution.result = QueryFiltering.apply_filter(resolution.result, resolution.filter_input)
+
+
+def apply_sort(resolution: Resolution) -> None:
+    if resolution.sort_input:
+        resolution.result = QueryFiltering.apply_sort(resolution.result, resolution.sort_input)
+
+
+def apply_pagination(resolution: Resolution) -> None:
+    if resolution.pagination_input:
+        resolution.result = QueryFiltering.apply_pagination(resolution.result, resolution.pagination_input)
+
+
+class StageStats:
+    def __init__(self):
+        self.runs = 0
+        self.skipped = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "totalMs": round(self.seconds * 1000, 3),
+            "meanMs": round(self.seconds * 1000 / self.runs, 3) if self.runs else None,
+            "maxMs": round(self.max_seconds * 1000, 3),
+        }
+
+
+class ResolverPipeline:
+    """Named stages every resolver call goes through, in order, each one timed
+
+    A stage takes the `Resolution` and updates its result. It can pass over later stages by name
+    through `resolution.skip`, or settle the result with `resolution.finish`.
+    """
+
+    def __init__(self, stages: List[Tuple[str, Stage]], clock: Callable[[], float] = time.perf_counter):
+        self.stages: List[Tuple[str, Stage]] = []
+        self.clock = clock
+        self._stats: Dict[str, StageStats] = {}
+        for name, stage in stages:
+            self.add_stage(name, stage)
+
+    def add_stage(self, name: str, stage: Stage, before: Optional[str] = None, after: Optional[str] = None) -> None:
+        """Add a stage at the end, or before or after the stage with the given name"""
+        if name in self._stats:
+            raise ValueError(f"Pipeline already has a stage named '{name}'")
+        names = [existing for existing, _ in self.stages]
+        position = len(self.stages)
+        for anchor, offset in ((before, 0), (after, 1)):
+            if anchor is not None:
+                if anchor not in names:
+                    raise ValueError(f"Pipeline has no stage named '{anchor}'")
+                position = names.index(anchor) + offset
+        self.stages.insert(position, (name, stage))
+        self._stats[name] = StageStats()
+
+    def remove_stage(self, name: str) -> None:
+        self.stages = [(existing, stage) for existing, stage in self.stages if existing != name]
+        self._stats.pop(name, None)
+
+    async def run(self, resolution: Resolution) -> Any:
+        for name, stage in self.stages:
+            stats = self._stats[name]
+            if resolution.done or name in resolution.skip:
+                stats.skipped += 1
+                continue
+            start = self.clock()
+            try:
+                result = stage(resolution)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                elapsed = self.clock() - start
+                stats.runs += 1
+                stats.seconds += elapsed
+                stats.max_seconds = max(stats.max_seconds, elapsed)
+        return resolution.result
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: self._stats[name].stats() for name, _ in self.stages}
+
+
+def create_pipeline() -> ResolverPipeline:
+    """The pipeline of every daemon's resolvers, each app runs its own with its own counters"""
+    return ResolverPipeline(
+        [
+            ("pushdown", push_down),
+            ("fetch", fetch),
+            ("cache", reuse_conversion),
+            ("convert", convert),
+            ("filter", apply_filter),
+            ("sort", apply_sort),
+            ("page", apply_pagination),
+        ]
+    )
+
+
+class BaseResolver:
+    """Base resolver class, daemon resolvers set `daemon`"""
+
+    daemon: str = ""
+
+    @classmethod
+    async def handle_api_call(
+        cls,
+        info: Info,
+        method: str,
+        transform_func: Optional[Callable[[Dict], T]] = None,
+        filter_input: Optional[FilterInput] = None,
+        sort_input: Optional[SortInput] = None,
+        pagination_input: Optional[PaginationInput] = None,
+        *args,
+        **kwargs,
+    ) -> Any:
+        """Generic method to handle API calls with error handling"""
+        # Check if endpoint is skipped
+        if info.context["skipped_endpoints"].get(cls.daemon, False):
+            raise Exception(
+                f"{cls.daemon.capitalize()} endpoint was skipped during startup. This query is not available."
+            )
+
+        resolution = Resolution(
+            info, cls.daemon, method, transform_func, filter_input, sort_input, pagination_input, args, kwargs
+        )
+        # Contexts without the app's pipeline, like those of tests, run a fresh one that is counted nowhere
+        pipeline = info.context.get("pipeline") or create_pipeline()
+        try:
+            return await pipeline.run(resolution)
+        except Exception as e:
+            logging.getLogger(f"siaql.resolvers.{cls.daemon}").error("Error in handle_api_call: %s", e)
+            raise e
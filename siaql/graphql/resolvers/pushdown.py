@@ -0,0 +1,204 @@
+# siaql/graphql/resolvers/pushdown.py
+import dataclasses
+import inspect
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from strawberry.types.base import StrawberryList, StrawberryOptional
+
+from siaql.graphql.resolvers.filter import FilterOperator, PaginationInput, SortDirection
+
+if TYPE_CHECKING:
+    from siaql.graphql.resolvers.pipeline import Resolution
+
+
+def returns_list(field_type: Any) -> bool:
+    if isinstance(field_type, StrawberryOptional):
+        field_type = field_type.of_type
+    return isinstance(field_type, StrawberryList)
+
+
+def argument_default(resolution: "Resolution", name: str) -> Any:
+    """Default of a client method argument the resolver didn't pass"""
+    client = resolution.info.context[f"{resolution.daemon}_client"]
+    try:
+        return inspect.signature(getattr(client, resolution.method)).parameters[name].default
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def narrow_window(offset: int, limit: Optional[int], page: PaginationInput) -> Tuple[int, Optional[int]]:
+    """The window of `page` taken within the window at `offset` of `limit` items (None or negative is unbounded)"""
+    skip = max(0, page.offset)
+    unbounded = limit is None or limit < 0
+    if page.limit is None:
+        return offset + skip, limit if unbounded else max(0, limit - skip)
+    return offset + skip, page.limit if unbounded else max(0, min(page.limit, limit - skip))
+
+
+class Pushdown(ABC):
+    """Moves the filter, sort and pagination inputs an endpoint handles itself into its arguments
+
+    Inputs that are pushed down are cleared from the resolution, the pipeline applies whatever is
+    left in process.
+    """
+
+    @abstractmethod
+    def apply(self, resolution: "Resolution") -> None:
+        """Move the inputs the endpoint handles into the resolution's arguments"""
+
+
+@dataclass(frozen=True)
+class WindowPushdown(Pushdown):
+    """Endpoints paged with offset and limit arguments
+
+    The GraphQL pagination is only pushed down when nothing has to be filtered or sorted in process
+    first, and only for fields returning lists, as the in-process pagination only applies to those.
+    """
+
+    offset_arg: str = "offset"
+    limit_arg: str = "limit"
+
+    def apply(self, resolution: "Resolution") -> None:
+        page = resolution.pagination_input
+        if page is None or resolution.filter_input or resolution.sort_input:
+            return
+        if not returns_list(resolution.field_type):
+            return
+        kwargs = resolution.kwargs
+        offset = kwargs.get(self.offset_arg, argument_default(resolution, self.offset_arg)) or 0
+        limit = kwargs.get(self.limit_arg, argument_default(resolution, self.limit_arg))
+        offset, limit = narrow_window(offset, limit, page)
+        resolution.pagination_input = None
+        if limit == 0:
+            resolution.finish([])
+            return
+        kwargs[self.offset_arg] = offset
+        kwargs[self.limit_arg] = -1 if limit is None else limit
+
+
+@dataclass(frozen=True)
+class ContractFilterPushdown(Pushdown):
+    """hostd's contract search, whose `ContractFilter` filters, sorts and pages itself
+
+    Inputs are only pushed into filter fields the query left unset, the rest stays with the
+    pipeline, which doesn't filter the search's response object anyway.
+    """
+
+    filter_arg: str = "filter"
+    # Contract field -> filter field taking a list of allowed values
+    lists: Tuple[Tuple[str, str], ...] = (
+        ("id", "contract_ids"),
+        ("renewedFrom", "renewed_from"),
+        ("renewedTo", "renewed_to"),
+    )
+    # Contract field -> filter fields of its inclusive lower and upper bound
+    ranges: Tuple[Tuple[str, str, str], ...] = (
+        ("negotiationHeight", "min_negotiation_height", "max_negotiation_height"),
+        ("expirationHeight", "min_expiration_height", "max_expiration_height"),
+    )
+    # Contract fields hostd sorts by
+    sort_fields: Tuple[str, ...] = ("status", "negotiationHeight", "expirationHeight")
+
+    def apply(self, resolution: "Resolution") -> None:
+        contract_filter = resolution.kwargs.get(self.filter_arg)
+        if contract_filter is None or not dataclasses.is_dataclass(contract_filter):
+            return
+        changes: Dict[str, Any] = {}
+
+        condition = resolution.filter_input
+        if condition is not None:
+            pushed = self.filter_changes(condition.field, condition.operator, condition.value)
+            if pushed and all(getattr(contract_filter, name, None) is None for name in pushed):
+                changes.update(pushed)
+                resolution.filter_input = None
+
+        sort = resolution.sort_input
+        if sort is not None and sort.field in self.sort_fields and getattr(contract_filter, "sort_field", None) is None:
+            changes["sort_field"] = sort.field
+            changes["sort_desc"] = sort.direction == SortDirection.DESC
+            resolution.sort_input = None
+
+        page = resolution.pagination_input
+        if page is not None and resolution.filter_input is None and resolution.sort_input is None:
+            offset, limit = narrow_window(
+                getattr(contract_filter, "offset", None) or 0, getattr(contract_filter, "limit", None), page
+            )
+            changes["offset"] = offset
+            changes["limit"] = limit
+            resolution.pagination_input = None
+
+        if changes:
+            resolution.kwargs[self.filter_arg] = dataclasses.replace(contract_filter, **changes)
+
+    def filter_changes(self, field: str, operator: FilterOperator, value: Optional[str]) -> Dict[str, Any]:
+        if value is None:
+            return {}
+        for name, target in self.lists:
+            if field == name and operator in (FilterOperator.EQ, FilterOperator.IN):
+                values = [value] if operator == FilterOperator.EQ else [v.strip() for v in value.split(",")]
+                return {target: values}
+        for name, lower, upper in self.ranges:
+            if field != name:
+                continue
+            try:
+                height = int(value)
+            except ValueError:
+                return {}
+            bounds = {
+                FilterOperator.GTE: {lower: height},
+                FilterOperator.GT: {lower: height + 1},
+                FilterOperator.LTE: {upper: height},
+                FilterOperator.LT: {upper: height - 1},
+                FilterOperator.EQ: {lower: height, upper: height},
+            }
+            return bounds.get(operator, {})
+        return {}
+
+
+class PushdownRegistry:
+    """Pushdowns by daemon and client method, with counters of the inputs they took over"""
+
+    def __init__(self, pushdowns: Optional[Dict[Tuple[str, str], Pushdown]] = None):
+        self.pushdowns: Dict[Tuple[str, str], Pushdown] = dict(pushdowns or {})
+        self.filters = 0
+        self.sorts = 0
+        self.pages = 0
+
+    def register(self, daemon: str, method: str, pushdown: Pushdown) -> None:
+        self.pushdowns[(daemon, method)] = pushdown
+
+    def apply(self, resolution: "Resolution") -> None:
+        pushdown = self.pushdowns.get((resolution.daemon, resolution.method))
+        if pushdown is None:
+            return
+        inputs = (resolution.filter_input, resolution.sort_input, resolution.pagination_input)
+        pushdown.apply(resolution)
+        self.filters += inputs[0] is not None and resolution.filter_input is None
+        self.sorts += inputs[1] is not None and resolution.sort_input is None
+        self.pages += inputs[2] is not None and resolution.pagination_input is None
+
+    def stats(self) -> Dict[str, int]:
+        return {"filters": self.filters, "sorts": self.sorts, "pages": self.pages}
+
+
+WINDOW = WindowPushdown()
+
+# Endpoints that filter, sort or page themselves, by daemon and client method
+ENDPOINT_PUSHDOWNS: Dict[Tuple[str, str], Pushdown] = {
+    ("walletd", "get_wallet_events"): WINDOW,
+    ("walletd", "get_address_events"): WINDOW,
+    ("walletd", "get_address_siacoin_outputs"): WINDOW,
+    ("walletd", "get_address_siafund_outputs"): WINDOW,
+    ("renterd", "get_hosts_scanning"): WINDOW,
+    ("renterd", "get_wallet_transactions"): WINDOW,
+    ("renterd", "search_objects"): WINDOW,
+    ("hostd", "get_wallet_events"): WINDOW,
+    ("hostd", "post_contracts"): ContractFilterPushdown(),
+}
+
+
+def create_pushdowns() -> PushdownRegistry:
+    """Registry of the endpoints' pushdowns, each app keeps its own with its own counters"""
+    return PushdownRegistry(ENDPOINT_PUSHDOWNS)
@@ -0,0 +1,192 @@
+# siaql/graphql/result_cache.py
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from graphql import (
+    DocumentNode,
+    ExecutionResult,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    OperationType,
+    SelectionSetNode,
+    print_ast,
+)
+from strawberry.extensions import SchemaExtension
+
+DAEMONS = ("walletd", "renterd", "hostd")
+
+# Document hash, operation name, variables and enabled daemons
+ResultKey = Tuple[str, Optional[str], str, Tuple[str, ...]]
+
+
+def document_hash(document: DocumentNode) -> str:
+    """Hash of the printed document, so whitespace, comments and commas don't matter"""
+    return hashlib.sha256(print_ast(document).encode()).hexdigest()
+
+
+def operation_definition(document: DocumentNode, operation_name: Optional[str]) -> Optional[OperationDefinitionNode]:
+    for definition in document.definitions:
+        if isinstance(definition, OperationDefinitionNode):
+            if operation_name is None or getattr(definition.name, "value", None) == operation_name:
+                return definition
+    return None
+
+
+def root_fields(document: DocumentNode, operation: OperationDefinitionNode) -> List[str]:
+    """Names of the root fields an operation selects, through fragments"""
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+
+    def fields(selection_set: SelectionSetNode) -> Iterator[str]:
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                yield selection.name.value
+            elif isinstance(selection, InlineFragmentNode):
+                yield from fields(selection.selection_set)
+            elif isinstance(selection, FragmentSpreadNode) and selection.name.value in fragments:
+                yield from fields(fragments[selection.name.value].selection_set)
+
+    return list(dict.fromkeys(fields(operation.selection_set)))
+
+
+def field_daemon(name: str) -> Optional[str]:
+    return next((daemon for daemon in DAEMONS if name.startswith(daemon)), None)
+
+
+class ResultCache:
+    """Size-bounded LRU cache of complete query results, each kept for a fixed TTL
+
+    Entries remember the daemons their root fields query. A mutation drops the entries of the
+    daemons it changes, and results still being computed when that happens aren't stored. Only
+    results without errors are kept, and they are shared between requests, read-only.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[ResultKey, Tuple[float, Tuple[str, ...], Dict[str, Any]]]" = OrderedDict()
+        # Bumped by each invalidation of a daemon, results computed across a bump are stale
+        self._generations: Dict[str, int] = {daemon: 0 for daemon in DAEMONS}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.uncacheable = 0
+
+    @staticmethod
+    def make_key(
+        document: DocumentNode,
+        operation_name: Optional[str],
+        variables: Optional[Dict[str, Any]],
+        skipped_endpoints: Dict[str, bool],
+    ) -> ResultKey:
+        enabled = tuple(daemon for daemon in DAEMONS if not skipped_endpoints.get(daemon, False))
+        return (
+            document_hash(document),
+            operation_name,
+            json.dumps(variables or {}, sort_keys=True, default=str),
+            enabled,
+        )
+
+    def generations(self, daemons: Tuple[str, ...]) -> Tuple[int, ...]:
+        return tuple(self._generations[daemon] for daemon in daemons)
+
+    def get(self, key: ResultKey) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self.clock():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[2]
+
+    def set(self, key: ResultKey, daemons: Tuple[str, ...], data: Dict[str, Any], generations: Tuple[int, ...]) -> None:
+        """Store a result, unless its daemons were invalidated since it started, see `generations`"""
+        if generations != self.generations(daemons):
+            return
+        self._entries[key] = (self.clock() + self.ttl, daemons, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *daemons: str) -> None:
+        """Drop every result that queried one of the given daemons, or everything if none are given"""
+        daemons = daemons or DAEMONS
+        for daemon in daemons:
+            self._generations[daemon] += 1
+        stale = [key for key, (_, queried, _) in self._entries.items() if set(queried) & set(daemons)]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "uncacheable": self.uncacheable,
+        }
+
+
+class ResultCacheExtension(SchemaExtension):
+    """Serves repeated queries from the request context's `result_cache`, if the server has one
+
+    Queries are cached when every root field belongs to a daemon, so SiaQL's own stats are always
+    fresh. Mutations always execute and afterwards invalidate the results of the daemons they touch.
+    """
+
+    def on_execute(self) -> Iterator[None]:
+        execution_context = self.execution_context
+        context = execution_context.context
+        cache: Optional[ResultCache] = context.get("result_cache") if isinstance(context, dict) else None
+        document = execution_context.graphql_document
+        definition = operation_definition(document, execution_context.operation_name) if document else None
+        if cache is None or definition is None:
+            yield
+            return
+
+        daemons = tuple(field_daemon(name) for name in root_fields(document, definition) if not name.startswith("__"))
+        operation = definition.operation
+        if operation == OperationType.MUTATION:
+            yield
+            # Even failed mutations may have changed something upstream
+            changed = tuple(daemon for daemon in daemons if daemon is not None)
+            cache.invalidate(*(changed if None not in daemons else ()))
+            return
+
+        if operation != OperationType.QUERY or not daemons or None in daemons:
+            cache.uncacheable += operation == OperationType.QUERY
+            yield
+            return
+
+        queried = tuple(dict.fromkeys(daemons))
+        key = cache.make_key(
+            document, execution_context.operation_name, execution_context.variables, context["skipped_endpoints"]
+        )
+        hit, data = cache.get(key)
+        if hit:
+            execution_context.result = ExecutionResult(data=data, errors=None)
+            yield
+            return
+        generations = cache.generations(queried)
+        yield
+        result = execution_context.result
+        if result is not None and not result.errors and result.data is not None:
+            cache.set(key, queried, result.data, generations)
@@ -1,11 +1,16 @@
 # siaql/graphql/schema.py
+from functools import lru_cache
+
 import strawberry
 from siaql.graphql.schemas.walletd import WalletdQuery, WalletdMutation
 from siaql.graphql.schemas.renterd import RenterdQuery, RenterdMutation
 from siaql.graphql.schemas.hostd import HostdQuery, HostdMutation
+from siaql.graphql.schemas.stats import StatsQueries
 
 from typing import Optional, List
 from siaql.graphql.resolvers.filter import FilterOperator, SortInput, PaginationInput
+from siaql.graphql.resolvers.mapping import MAPPING_SCALARS, MappingResolver, coerce_raw_enums
+from siaql.graphql.result_cache import ResultCacheExtension
 from strawberry.schema.config import StrawberryConfig
 from strawberry.extensions import ValidationCache
 from strawberry.extensions import ParserCache
@@ -16,7 +21,7 @@ from strawberry.extensions import SchemaExtension
 
 
 @strawberry.type
-class Query(WalletdQuery, RenterdQuery, HostdQuery):
+class Query(WalletdQuery, RenterdQuery, HostdQuery, StatsQueries):
     pass
 
 
@@ -25,12 +30,34 @@ class Mutation(WalletdMutation, RenterdMutation, HostdMutation):
     pass
 
 
-schema = strawberry.Schema(
-    query=Query,
-    mutation=Mutation,
-    extensions=[
-        ValidationCache(),
-        ParserCache(),
-    ],
-    config=StrawberryConfig(auto_camel_case=True),
-)
+def build_schema(config: StrawberryConfig, **kwargs: Any) -> strawberry.Schema:
+    return strawberry.Schema(
+        query=Query,
+        mutation=Mutation,
+        extensions=[
+            ValidationCache(),
+            ParserCache(),
+            ResultCacheExtension,
+        ],
+        config=config,
+        **kwargs,
+    )
+
+
+schema = build_schema(StrawberryConfig(auto_camel_case=True))
+
+
+@lru_cache(maxsize=None)
+def mapping_schema() -> strawberry.Schema:
+    """Schema resolving fields straight from the upstream JSON dicts instead of converted objects
+
+    Built on first use, as schemas share their fields and this sets every field's default resolver,
+    which still reads objects with getattr.
+    """
+    resolver = MappingResolver()
+    mapping = build_schema(
+        StrawberryConfig(auto_camel_case=True, default_resolver=resolver), scalar_overrides=MAPPING_SCALARS
+    )
+    resolver.index(mapping)
+    coerce_raw_enums(mapping)
+    return mapping
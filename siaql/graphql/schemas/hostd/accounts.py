@@ -2,7 +2,7 @@ import strawberry
 from typing import List, Optional
 from strawberry.types import Info
 
-from siaql.graphql.schemas.types import FundingSource, HostdAccount
+from siaql.graphql.schemas.types import AccountFundingResult, FundingSource, HostdAccount
 from siaql.graphql.resolvers.filter import FilterInput, SortInput, PaginationInput
 from siaql.graphql.resolvers.hostd import HostdBaseResolver
 
@@ -17,9 +17,11 @@ class AccountQueries:
         sort: Optional[SortInput] = None,
         pagination: Optional[PaginationInput] = None,
     ) -> List[HostdAccount]:
-        """Get list of accounts with pagination"""
+        """Get list of accounts with pagination, the first 100 accounts when no pagination is given"""
+        # Only a pagination input walks the accounts page by page, hostd may hold too many to list them all
+        method = "get_accounts" if pagination is None else "iter_accounts"
         return await HostdBaseResolver.handle_api_call(
-            info, "get_accounts", filter_input=filter, sort_input=sort, pagination_input=pagination
+            info, method, filter_input=filter, sort_input=sort, pagination_input=pagination
         )
 
     @strawberry.field
@@ -40,3 +42,27 @@ class AccountQueries:
             sort_input=sort,
             pagination_input=pagination,
         )
+
+    @strawberry.field
+    async def hostd_accounts_funding(
+        self,
+        info: Info,
+        accounts: Optional[List[str]] = None,
+        concurrency: int = 16,
+        filter: Optional[FilterInput] = None,
+        sort: Optional[SortInput] = None,
+        pagination: Optional[PaginationInput] = None,
+    ) -> List[AccountFundingResult]:
+        """Get funding sources for many accounts at once, or for every account if none are given
+
+        At most 64 requests are made concurrently.
+        """
+        return await HostdBaseResolver.handle_api_call(
+            info,
+            "get_accounts_funding",
+            accounts=accounts,
+            concurrency=concurrency,
+            filter_input=filter,
+            sort_input=sort,
+            pagination_input=pagination,
+        )
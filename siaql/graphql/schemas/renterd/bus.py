@@ -806,6 +806,7 @@ class BusQueries:
         sort: Optional[SortInput] = None,
         pagination: Optional[PaginationInput] = None,
     ) -> str:
+        """Get partial slab data, GET /binary/renterd/slabs/partial/{key} streams it as raw bytes instead"""
         return await RenterdBaseResolver.handle_api_call(
             info,
             "get_slabs_partial",
@@ -1218,7 +1219,7 @@ class BusMutations:
     async def renterd_add_slabs_partial(
         self, info: Info, data: str, min_shards: int, total_shards: int, contract_set: str
     ) -> AddPartialSlabResponse:
-        """Add partial slab data"""
+        """Add partial slab data, POST /binary/renterd/slabs/partial streams raw bytes instead"""
         return await RenterdBaseResolver.handle_api_call(
             info,
             "add_slabs_partial",
@@ -0,0 +1,29 @@
+import strawberry
+from strawberry.scalars import JSON
+from strawberry.types import Info
+
+
+@strawberry.type
+class StatsQueries:
+    @strawberry.field
+    def siaql_stats(self, info: Info) -> JSON:
+        """Get SiaQL's internal counters and circuit breaker states for the upstream daemon connections"""
+        stats = info.context["pool"].stats()
+        for daemon in ("walletd", "renterd", "hostd"):
+            client = info.context.get(f"{daemon}_client")
+            for name in ("cache", "retry", "breaker"):
+                if getattr(client, name, None) is not None:
+                    stats.setdefault(daemon, {})[name] = getattr(client, name).stats()
+        for daemon, watcher in info.context.get("tip_watchers", {}).items():
+            stats.setdefault(daemon, {})["tip"] = watcher.stats()
+        if info.context.get("conversion_cache") is not None:
+            stats["conversions"] = info.context["conversion_cache"].stats()
+        if info.context.get("result_cache") is not None:
+            stats["results"] = info.context["result_cache"].stats()
+        if info.context.get("loaders") is not None:
+            stats["loaders"] = info.context["loaders"].counters.stats()
+        if info.context.get("pipeline") is not None:
+            stats["pipeline"] = info.context["pipeline"].stats()
+        if info.context.get("pushdowns") is not None:
+            stats["pushdown"] = info.context["pushdowns"].stats()
+        return stats
@@ -2777,6 +2777,13 @@ class Balance(SiaType):
     siafunds: Optional[int] = strawberry.field(name="siafunds")
 
 
+@strawberry.type
+class AddressBalanceResult(SiaType):
+    address: Optional[Address] = strawberry.field(name="address")
+    balance: Optional[Balance] = strawberry.field(name="balance")
+    error: Optional[str] = strawberry.field(name="error")
+
+
 @strawberry.type
 class Wallet(SiaType):
     id: Optional[int] = strawberry.field(name="id")
@@ -3449,6 +3456,13 @@ class FundingSource(SiaType):
     amount: Optional[Currency] = strawberry.field(name="amount")
 
 
+@strawberry.type
+class AccountFundingResult(SiaType):
+    account: Optional[PublicKey] = strawberry.field(name="account")
+    funding: Optional[List[FundingSource]] = strawberry.field(name="funding")
+    error: Optional[str] = strawberry.field(name="error")
+
+
 @strawberry.type
 class HostdAccount(SiaType):
     id: Optional[PublicKey] = strawberry.field(name="id")  # rhp3.Account is a PublicKey
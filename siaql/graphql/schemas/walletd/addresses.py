@@ -3,7 +3,7 @@ from strawberry.types import Info
 import strawberry
 from datetime import datetime
 from siaql.graphql.resolvers.walletd import WalletdBaseResolver
-from siaql.graphql.schemas.types import WalletEvent, SiacoinElement, SiafundElement, Balance
+from siaql.graphql.schemas.types import AddressBalanceResult, WalletEvent, SiacoinElement, SiafundElement, Balance
 from siaql.graphql.resolvers.filter import FilterInput, SortInput, PaginationInput
 
 
@@ -29,6 +29,27 @@ class AddressQueries:
         )
         return data
 
+    @strawberry.field
+    async def walletd_address_balances(
+        self,
+        info: Info,
+        addresses: List[str],
+        concurrency: int = 16,
+        filter: Optional[FilterInput] = None,
+        sort: Optional[SortInput] = None,
+        pagination: Optional[PaginationInput] = None,
+    ) -> List[AddressBalanceResult]:
+        """Get balances for many addresses at once, with at most 64 concurrent requests"""
+        return await WalletdBaseResolver.handle_api_call(
+            info,
+            "get_address_balances",
+            addresses=addresses,
+            concurrency=concurrency,
+            filter_input=filter,
+            sort_input=sort,
+            pagination_input=pagination,
+        )
+
     @strawberry.field
     async def walletd_address_events(
         self,
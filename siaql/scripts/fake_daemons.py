@@ -0,0 +1,283 @@
+"""Stand-in walletd, renterd and hostd servers for load testing SiaQL without Sia nodes
+
+Every endpoint described in api-schemas/*.simplified.json is served with its example response.
+List responses are scaled up to a configurable number of entries, paged with the `offset` and
+`limit` parameters like the real daemons do. Each entry's IDs, keys and addresses end in its
+position, so they are unique across the list. Every response can be delayed or failed at a
+configurable rate. The daemons are mounted under /walletd, /renterd and /hostd, so SiaQL is
+pointed at them with e.g. WALLETD_URL=http://127.0.0.1:9880/walletd.
+
+    siaql-fake-daemons --size hosts=100000 --size events=1000000 --latency 0.01 --error-rate 0.001
+"""
+
+import asyncio
+import json
+import random
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import typer
+import uvicorn
+from rich.console import Console
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+
+# The schemas aren't packaged, so without --schemas they're only found in a source checkout
+SCHEMAS = Path(__file__).parent.parent.parent / "api-schemas"
+# Where each URL template of the schemas is served, the clients add /api to the daemon URL
+PREFIXES = {
+    "{{baseURL}}": "/api",
+    "{{BUS_URI}}{{BUS_API_PREFIX}}": "/api/bus",
+    "{{WORKER_URI}}{{WORKER_API_PREFIX}}": "/api/worker",
+    "{{AUTOPILOT_URI}}{{AUTOPILOT_API_PREFIX}}": "/api/autopilot",
+}
+DAEMONS = ("walletd", "renterd", "hostd")
+# Marker the scaled list is spliced in at when a list is nested in an object
+ITEMS_MARKER = "__siaql_fake_items__"
+# Hex IDs, keys and addresses, with an optional prefix like ed25519: or fcid:
+HEX_ID = re.compile(r"((?:[a-z0-9]+:)?)([0-9a-f]{16,})")
+# Trailing hex digits of an ID that are replaced with the entry's position
+INDEX_DIGITS = 16
+
+console = Console()
+
+
+@dataclass
+class FakeConfig:
+    """Response sizes, latency and failures of the fake daemons"""
+
+    # Collection name (the last fixed path segment, e.g. hosts or events) -> entries it holds
+    sizes: Dict[str, int] = field(default_factory=dict)
+    # Entries of collections without a size of their own
+    default_size: int = 100
+    # Seconds every response is held back, plus up to `jitter` seconds more
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Share of requests answered with `error_status` instead
+    error_rate: float = 0.0
+    error_status: int = 500
+    seed: Optional[int] = None
+
+
+def endpoints(items: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    for item in items:
+        if "item" in item:
+            yield from endpoints(item["item"])
+        else:
+            yield item
+
+
+def route_path(url: str) -> Optional[str]:
+    """Starlette path of a schema URL like {{baseURL}}/wallets/:id/events?limit=100"""
+    for template, prefix in PREFIXES.items():
+        if url.startswith(template):
+            path = url[len(template) :].split("?")[0].rstrip("/")
+            break
+    else:
+        return None
+    if not path:
+        return None
+    segments = path.split("/")
+    for i, segment in enumerate(segments):
+        if segment.startswith(":"):
+            # A trailing parameter takes the rest of the path, like renterd's object paths
+            segments[i] = f"{{{segment[1:]}:path}}" if i == len(segments) - 1 else f"{{{segment[1:]}}}"
+    return prefix + "/".join(segments)
+
+
+def entry_template(item: Any) -> Tuple[List[bytes], List[Tuple[bytes, int]]]:
+    """A list entry, encoded and split around its IDs (nested ones included)
+
+    Each ID gets the start it keeps, opening quote included, and how many trailing digits the
+    entry's index replaces.
+    """
+    ids: Dict[bytes, Tuple[bytes, int]] = {}
+
+    def collect(value: Any) -> None:
+        if isinstance(value, dict):
+            for nested in value.values():
+                collect(nested)
+        elif isinstance(value, list):
+            for nested in value:
+                collect(nested)
+        elif isinstance(value, str):
+            match = HEX_ID.fullmatch(value)
+            if match is not None:
+                prefix, digits = match.groups()
+                head = json.dumps(prefix + digits[:-INDEX_DIGITS])[:-1].encode()
+                ids[json.dumps(value).encode()] = (head, min(len(digits), INDEX_DIGITS))
+
+    collect(item)
+    content = json.dumps(item).encode()
+    if not ids:
+        return [content], []
+    pattern = re.compile(b"|".join(re.escape(value) for value in ids))
+    return pattern.split(content), [ids[value] for value in pattern.findall(content)]
+
+
+def example_response(endpoint: Dict[str, Any]) -> Tuple[int, Any]:
+    """Status and body of an endpoint's first successful example response"""
+    for response in endpoint.get("responses", []):
+        if 200 <= response.get("status", 0) < 300:
+            return response["status"], response.get("body")
+    return 200, None
+
+
+class FakeEndpoint:
+    """Serves one endpoint's example response, with its largest list scaled to the configured size"""
+
+    def __init__(self, path: str, status: int, body: Any, config: FakeConfig, rng: random.Random):
+        self.status = status
+        self.config = config
+        self.rng = rng
+        fixed = [segment for segment in path.split("/") if segment and not segment.startswith("{")]
+        self.collection = fixed[-1] if fixed else ""
+        # Each example entry, split around its IDs, see `entry_template`
+        self.items: Optional[List[Tuple[List[bytes], List[Tuple[bytes, int]]]]] = None
+        self.envelope = b""
+        examples: List[Any] = []
+        if isinstance(body, list) and body:
+            examples = body
+            self.envelope = b'"' + ITEMS_MARKER.encode() + b'"'
+        elif isinstance(body, dict):
+            lists = [key for key, value in body.items() if isinstance(value, list) and value]
+            if lists:
+                key = max(lists, key=lambda key: len(body[key]))
+                examples = body[key]
+                self.envelope = json.dumps({**body, key: ITEMS_MARKER}).encode()
+        if examples:
+            self.items = [entry_template(item) for item in examples]
+        self.content = b"" if body is None else json.dumps(body).encode()
+
+    @property
+    def size(self) -> int:
+        return self.config.sizes.get(self.collection, self.config.default_size)
+
+    def window(self, params: Dict[str, Any]) -> Tuple[int, int]:
+        """First entry and number of entries a request asks for"""
+        try:
+            offset = max(0, int(params.get("offset", 0)))
+            limit = int(params.get("limit", -1))
+        except (TypeError, ValueError):
+            offset, limit = 0, -1
+        remaining = max(0, self.size - offset)
+        return offset, remaining if limit < 0 else min(limit, remaining)
+
+    def entry(self, index: int) -> bytes:
+        """The list's entry at `index`, an example entry with IDs ending in the index"""
+        assert self.items is not None
+        segments, ids = self.items[index % len(self.items)]
+        if not ids:
+            return segments[0]
+        digits = f"{index:0{INDEX_DIGITS}x}".encode()
+        parts = [segments[0]]
+        for (head, count), segment in zip(ids, segments[1:]):
+            parts += (head, digits[-count:], b'"', segment)
+        return b"".join(parts)
+
+    def render(self, params: Dict[str, Any]) -> bytes:
+        if self.items is None:
+            return self.content
+        offset, count = self.window(params)
+        joined = b"[" + b",".join(self.entry(offset + i) for i in range(count)) + b"]"
+        return self.envelope.replace(b'"' + ITEMS_MARKER.encode() + b'"', joined)
+
+    async def respond(self, request: Request) -> Response:
+        config = self.config
+        delay = config.latency + (self.rng.uniform(0, config.jitter) if config.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if config.error_rate and self.rng.random() < config.error_rate:
+            return Response("injected failure", status_code=config.error_status, media_type="text/plain")
+
+        params: Dict[str, Any] = dict(request.query_params)
+        if request.method in ("POST", "PUT") and self.items is not None:
+            # Searches such as hostd's POST /contracts page with offset and limit in the body
+            try:
+                body = json.loads(await request.body() or b"{}")
+                if isinstance(body, dict):
+                    params = {**{k: v for k, v in body.items() if k in ("offset", "limit")}, **params}
+            except ValueError:
+                pass
+        content = self.render(params)
+        media_type = "application/json" if content else None
+        return Response(content, status_code=self.status, media_type=media_type)
+
+
+def daemon_routes(daemon: str, config: FakeConfig, rng: random.Random, schemas: Path = SCHEMAS) -> List[Route]:
+    schema = json.loads((schemas / f"{daemon}.simplified.json").read_text())
+    routes: Dict[Tuple[str, str], Route] = {}
+    for endpoint in endpoints(schema["item"]):
+        path = route_path(endpoint.get("url", ""))
+        method = endpoint.get("method", "").strip()
+        if path is None or not method or (path, method) in routes:
+            continue
+        status, body = example_response(endpoint)
+        routes[(path, method)] = Route(path, FakeEndpoint(path, status, body, config, rng).respond, methods=[method])
+    # Fixed paths first, so /contracts/prunable isn't taken for the contract with ID "prunable"
+    return sorted(routes.values(), key=lambda route: (route.path.count("{"), -len(route.path)))
+
+
+def create_fake_daemons(config: Optional[FakeConfig] = None, schemas: Path = SCHEMAS) -> Starlette:
+    """ASGI app serving fake walletd, renterd and hostd APIs under /walletd, /renterd and /hostd"""
+    config = config or FakeConfig()
+    rng = random.Random(config.seed)
+    return Starlette(
+        routes=[Mount(f"/{daemon}", routes=daemon_routes(daemon, config, rng, schemas)) for daemon in DAEMONS]
+    )
+
+
+def schema_dir(schemas: Optional[Path]) -> Path:
+    """Directory holding every daemon's simplified schema, the checkout's api-schemas when not given"""
+    directory = schemas or SCHEMAS
+    missing = [
+        f"{daemon}.simplified.json" for daemon in DAEMONS if not (directory / f"{daemon}.simplified.json").is_file()
+    ]
+    if missing:
+        hint = "" if schemas else ", pass --schemas with the api-schemas directory of a SiaQL checkout"
+        raise typer.BadParameter(f"{', '.join(missing)} not found in {directory}{hint}", param_hint="--schemas")
+    return directory
+
+
+def parse_sizes(values: List[str]) -> Dict[str, int]:
+    sizes = {}
+    for value in values:
+        match = re.fullmatch(r"\s*([\w-]+)\s*=\s*(\d+)\s*", value)
+        if match is None:
+            raise typer.BadParameter(f"Invalid size '{value}', expected <collection>=<entries>")
+        sizes[match.group(1)] = int(match.group(2))
+    return sizes
+
+
+def serve(
+    host: str = typer.Option("127.0.0.1", help="Host to bind the fake daemons to"),
+    port: int = typer.Option(9880, help="Port to bind the fake daemons to"),
+    size: List[str] = typer.Option([], help="Entries of a collection, e.g. hosts=100000 (repeatable)"),
+    default_size: int = typer.Option(100, help="Entries of collections without a --size"),
+    latency: float = typer.Option(0.0, help="Seconds every response is delayed"),
+    jitter: float = typer.Option(0.0, help="Up to this many extra seconds of random delay"),
+    error_rate: float = typer.Option(0.0, help="Share of requests that fail, between 0 and 1"),
+    error_status: int = typer.Option(500, help="HTTP status of failed requests"),
+    seed: Optional[int] = typer.Option(None, help="Random seed for reproducible delays and failures"),
+    schemas: Optional[Path] = typer.Option(
+        None, help="Directory holding the *.simplified.json API schemas, required outside a source checkout"
+    ),
+):
+    """Serve fake walletd, renterd and hostd APIs"""
+    config = FakeConfig(parse_sizes(size), default_size, latency, jitter, error_rate, error_status, seed)
+    app = create_fake_daemons(config, schema_dir(schemas))
+    for daemon in DAEMONS:
+        console.print(f"Serving fake [bold]{daemon}[/bold] on http://{host}:{port}/{daemon}")
+    uvicorn.run(app, host=host, port=port, log_level="warning")
+
+
+def main():
+    typer.run(serve)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# tests/api/test_balancer.py
+import asyncio
+
+import httpx
+import pytest
+
+from siaql.api.balancer import BalancerTransport, Member
+from siaql.api.renterd import RenterdClient
+from tests.conftest import FakeClock
+
+
+class Daemon:
+    """Mock renterd process recording the paths it is asked for"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.paths = []
+        self.down = False
+        self.delay = 0.0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        if self.down:
+            raise httpx.ConnectError("connection refused", request=request)
+        self.paths.append(request.url.path)
+        await asyncio.sleep(self.delay)
+        return httpx.Response(200, json={"served_by": self.name, "host": request.headers["host"]})
+
+
+def balanced_client(bus: Daemon, workers, **kwargs) -> httpx.AsyncClient:
+    members = [Member(f"http://{w.name}:9980/api", httpx.MockTransport(w.handler)) for w in workers]
+    transport = BalancerTransport(httpx.MockTransport(bus.handler), "http://bus:9980/api", "worker", members, **kwargs)
+    return httpx.AsyncClient(base_url="http://bus:9980/api", transport=transport)
+
+
+class TestBalancerTransport:
+    async def test_only_worker_routes_are_balanced(self):
+        bus, w1, w2 = Daemon("bus"), Daemon("w1"), Daemon("w2")
+        client = balanced_client(bus, [w1, w2])
+
+        await client.get("/bus/contracts")
+        await client.get("/autopilot/state")
+        responses = [await client.get("/worker/state", params={"a": 1}) for _ in range(4)]
+
+        assert bus.paths == ["/api/bus/contracts", "/api/autopilot/state"]
+        assert w1.paths == w2.paths == ["/api/worker/state"] * 2
+        assert {r.json()["host"] for r in responses} == {"w1:9980", "w2:9980"}
+
+    async def test_prefers_least_loaded_member(self):
+        bus, slow, fast = Daemon("bus"), Daemon("slow"), Daemon("fast")
+        slow.delay = 0.05
+        client = balanced_client(bus, [slow, fast])
+
+        first = asyncio.create_task(client.get("/worker/rhp/scan"))
+        await asyncio.sleep(0.01)
+        for _ in range(3):
+            await client.get("/worker/rhp/scan")
+        await first
+
+        assert len(slow.paths) == 1
+        assert len(fast.paths) == 3
+
+    async def test_fails_over_and_ejects_unreachable_member(self):
+        clock = FakeClock()
+        bus, w1, w2 = Daemon("bus"), Daemon("w1"), Daemon("w2")
+        w1.down = True
+        client = balanced_client(bus, [w1, w2], eject_threshold=2, eject_time=10, clock=clock)
+
+        for _ in range(6):
+            assert (await client.get("/worker/state")).json()["served_by"] == "w2"
+
+        stats = client._transport.stats()
+        assert stats["members"]["http://w1:9980/api"]["ejected"]
+        assert stats["failovers"] == 2
+
+        w1.down = False
+        clock.now = 10
+        served = {(await client.get("/worker/state")).json()["served_by"] for _ in range(4)}
+        assert served == {"w1", "w2"}
+
+    async def test_raises_once_every_member_failed(self):
+        bus, w1, w2 = Daemon("bus"), Daemon("w1"), Daemon("w2")
+        w1.down = w2.down = True
+        client = balanced_client(bus, [w1, w2])
+
+        with pytest.raises(httpx.ConnectError):
+            await client.get("/worker/state")
+
+        assert client._transport.stats()["failovers"] == 1
+
+    def test_renterd_client_balances_over_worker_urls(self):
+        client = RenterdClient("http://bus:9980", worker_urls=["http://w1:9980", "http://w2:9980/"])
+
+        stats = client.pool.stats()
+
+        assert list(stats["renterd"]["balancer"]["members"]) == ["http://w1:9980/api", "http://w2:9980/api"]
+        assert {"renterd-worker1", "renterd-worker2"} <= set(stats)
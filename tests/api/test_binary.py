@@ -0,0 +1,133 @@
+# tests/api/test_binary.py
+import httpx
+import pytest
+
+from siaql.graphql.app import create_graphql_app
+from tests.conftest import StreamingMockTransport, mock_http
+
+
+class Body(httpx.AsyncByteStream):
+    """Response body that is only read when streamed, as with a real upstream"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def __aiter__(self):
+        yield self.data
+
+
+def create_app(handler, skip_renterd: bool = False):
+    app = create_graphql_app(
+        walletd_url="http://walletd",
+        walletd_password="",
+        renterd_url="http://renterd",
+        renterd_password="",
+        hostd_url="http://hostd",
+        hostd_password="",
+        skipped_endpoints={"walletd": True, "renterd": skip_renterd, "hostd": True},
+    )
+    if app.renterd_client is not None:
+        mock_http(app.renterd_client, StreamingMockTransport(handler))
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://siaql")
+
+
+class TestBinaryRoutes:
+    async def test_object_download_passes_status_and_headers_through(self):
+        seen = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["url"] = str(request.url)
+            seen["range"] = request.headers.get("range")
+            return httpx.Response(
+                206, stream=Body(b"bcd"), headers={"Content-Range": "bytes 1-3/10", "X-Internal": "hidden"}
+            )
+
+        async with create_app(handler) as client:
+            response = await client.get(
+                "/binary/renterd/objects/dir/file.bin?bucket=b1", headers={"Range": "bytes=1-3"}
+            )
+
+        assert response.status_code == 206
+        assert response.content == b"bcd"
+        assert response.headers["content-range"] == "bytes 1-3/10"
+        assert "x-internal" not in response.headers
+        assert seen == {"url": "http://renterd/api/worker/objects/dir/file.bin?bucket=b1", "range": "bytes=1-3"}
+
+    async def test_downloads_ask_for_the_client_codings(self):
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers["accept-encoding"])
+            return httpx.Response(200, stream=Body(b"abc"))
+
+        async with create_app(handler) as client:
+            await client.get("/binary/renterd/objects/file.bin", headers={"Accept-Encoding": "gzip"})
+            del client.headers["accept-encoding"]
+            await client.get("/binary/renterd/objects/file.bin")
+            await client.get("/binary/renterd/slabs/partial/key?offset=0&length=3")
+
+        assert seen == ["gzip", "identity", "identity"]
+
+    async def test_object_upload_streams_body_and_metadata(self):
+        seen = {}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen["body"] = b"".join([chunk async for chunk in request.stream])
+            seen["params"] = dict(request.url.params)
+            seen["owner"] = request.headers.get("x-sia-meta-owner")
+            return httpx.Response(200, headers={"ETag": '"tag"'})
+
+        async with create_app(handler) as client:
+            response = await client.put(
+                "/binary/renterd/objects/file.bin?bucket=default&minshards=2",
+                content=b"payload",
+                headers={"X-Sia-Meta-Owner": "me"},
+            )
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == '"tag"'
+        assert seen == {"body": b"payload", "params": {"bucket": "default", "minshards": "2"}, "owner": "me"}
+
+    async def test_slabs_partial_round_trip(self):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET":
+                assert dict(request.url.params) == {"offset": "4", "length": "8"}
+                return httpx.Response(200, stream=Body(b"slabdata"))
+            body = b"".join([chunk async for chunk in request.stream])
+            return httpx.Response(200, json={"slabs": [], "size": len(body)})
+
+        async with create_app(handler) as client:
+            read = await client.get("/binary/renterd/slabs/partial/key1?offset=4&length=8")
+            added = await client.post(
+                "/binary/renterd/slabs/partial?minShards=1&totalShards=3&contractSet=autopilot", content=b"abc"
+            )
+            invalid = await client.post("/binary/renterd/slabs/partial", content=b"abc")
+
+        assert read.content == b"slabdata"
+        assert added.json() == {"slabs": [], "size": 3}
+        assert invalid.status_code == 400
+
+    async def test_invalid_content_length_is_rejected(self):
+        async with create_app(lambda request: httpx.Response(200)) as client:
+            upload = await client.put("/binary/renterd/objects/file.bin", content=b"x", headers={"Content-Length": "x"})
+            added = await client.post(
+                "/binary/renterd/slabs/partial?minShards=1&totalShards=3", content=b"x", headers={"Content-Length": "x"}
+            )
+
+        assert upload.status_code == 400
+        assert added.status_code == 400
+
+    async def test_upstream_errors_keep_their_status(self):
+        async with create_app(lambda request: httpx.Response(404, stream=Body(b"object not found"))) as client:
+            download = await client.get("/binary/renterd/objects/missing")
+            upload = await client.put("/binary/renterd/objects/missing", content=b"x")
+
+        assert download.status_code == 404
+        assert upload.status_code == 404
+
+    @pytest.mark.parametrize("method", ["GET", "PUT"])
+    async def test_disabled_renterd(self, method):
+        async with create_app(None, skip_renterd=True) as client:
+            response = await client.request(method, "/binary/renterd/objects/file.bin")
+
+        assert response.status_code == 503
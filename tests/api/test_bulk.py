@@ -0,0 +1,114 @@
+# tests/api/test_bulk.py
+import asyncio
+
+import httpx
+import pytest
+
+from siaql.api.hostd import HostdClient
+from siaql.api.utils import MAX_FAN_OUT, fan_out
+from siaql.api.walletd import WalletdClient
+from tests.conftest import mock_http
+
+
+class TestFanOut:
+    async def test_results_keep_key_order(self):
+        async def fetch(key: int):
+            await asyncio.sleep(0.001 * (5 - key))
+            return key * 10
+
+        results = await fan_out(range(5), fetch, concurrency=5)
+
+        assert results == [(key, key * 10, None) for key in range(5)]
+
+    async def test_concurrency_is_bounded(self):
+        in_flight = peak = 0
+
+        async def fetch(key: int):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return key
+
+        results = await fan_out(range(50), fetch, concurrency=4)
+
+        assert len(results) == 50
+        assert peak == 4
+
+    async def test_errors_are_reported_per_key(self):
+        async def fetch(key: int):
+            if key == 2:
+                raise ValueError("not found")
+            return key
+
+        results = await fan_out(range(4), fetch)
+
+        assert results[2] == (2, None, "not found")
+        assert [value for _, value, _ in results] == [0, 1, None, 3]
+
+    async def test_no_keys(self):
+        async def fetch(key):
+            raise AssertionError("should not be called")
+
+        assert await fan_out([], fetch) == []
+
+    async def test_concurrency_must_be_positive(self):
+        async def fetch(key):
+            return key
+
+        with pytest.raises(ValueError):
+            await fan_out([1], fetch, concurrency=0)
+
+
+class TestBulkClients:
+    async def test_walletd_address_balances(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            address = request.url.path.split("/")[-2]
+            if address == "bad":
+                return httpx.Response(400, text="invalid address")
+            return httpx.Response(200, json={"siacoins": address, "immatureSiacoins": "0", "siafunds": 0})
+
+        client = mock_http(WalletdClient("http://walletd"), handler)
+
+        results = await client.get_address_balances(["a", "bad", "b"], concurrency=2)
+
+        assert [result["address"] for result in results] == ["a", "bad", "b"]
+        assert results[0]["balance"]["siacoins"] == "a"
+        assert results[1]["balance"] is None and "400 Bad Request" in results[1]["error"]
+        assert results[2]["error"] is None
+
+    async def test_hostd_accounts_funding_defaults_to_every_account(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/api/accounts":
+                offset = int(request.url.params["offset"])
+                accounts = [{"id": f"ed25519:{i}"} for i in range(3)]
+                return httpx.Response(200, json=accounts[offset:])
+            account = request.url.path.split("/")[-2]
+            return httpx.Response(200, json=[{"contractID": "fcid", "accountID": account, "amount": "1"}])
+
+        client = mock_http(HostdClient("http://hostd"), handler)
+
+        results = await client.get_accounts_funding()
+
+        assert [result["account"] for result in results] == ["ed25519:0", "ed25519:1", "ed25519:2"]
+        assert all(result["funding"][0]["accountID"] == result["account"] for result in results)
+
+    @pytest.mark.parametrize("concurrency, expected", [(0, 1), (-3, 1), (MAX_FAN_OUT * 4, MAX_FAN_OUT)])
+    async def test_concurrency_is_clamped(self, concurrency, expected):
+        in_flight = peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return httpx.Response(200, json={"siacoins": "0", "immatureSiacoins": "0", "siafunds": 0})
+
+        client = mock_http(WalletdClient("http://walletd"), handler)
+
+        results = await client.get_address_balances([f"addr{i}" for i in range(MAX_FAN_OUT * 2)], concurrency)
+
+        assert all(result["error"] is None for result in results)
+        assert peak == expected
@@ -0,0 +1,79 @@
+# tests/api/test_cache.py
+import httpx
+import pytest
+import typer
+
+from siaql.api.cache import CachePolicy, ResponseCache
+from siaql.api.hostd import CACHE_POLICY, HostdClient
+from siaql.cli.main import build_cache_policies
+from tests.conftest import FakeClock, mock_http
+
+
+@pytest.fixture
+def daemon_calls():
+    return []
+
+
+@pytest.fixture
+def hostd_client(fake_clock, daemon_calls):
+    def handler(request: httpx.Request) -> httpx.Response:
+        daemon_calls.append((request.method, request.url.path))
+        return httpx.Response(200, json={"acceptingContracts": len(daemon_calls) == 1})
+
+    return mock_http(HostdClient("http://localhost:9983", cache=ResponseCache(CACHE_POLICY, clock=fake_clock)), handler)
+
+
+class TestResponseCache:
+    async def test_cached_method_is_served_until_ttl_expires(self, hostd_client, fake_clock, daemon_calls):
+        first = await hostd_client.get_settings()
+        second = await hostd_client.get_settings()
+
+        assert first == second
+        assert len(daemon_calls) == 1
+
+        fake_clock.now += CACHE_POLICY.ttls["get_settings"]
+        await hostd_client.get_settings()
+        assert len(daemon_calls) == 2
+        assert hostd_client.cache.stats()["hits"] == 1
+
+    async def test_uncached_method_always_hits_daemon(self, hostd_client, daemon_calls):
+        await hostd_client.get_state()
+        await hostd_client.get_state()
+
+        assert len(daemon_calls) == 2
+        assert hostd_client.cache.stats()["entries"] == 0
+
+    async def test_mutation_invalidates_related_methods(self, hostd_client, daemon_calls):
+        await hostd_client.get_settings()
+        await hostd_client.patch_settings({"acceptingContracts": False})
+        await hostd_client.get_settings()
+
+        assert daemon_calls == [("GET", "/api/settings"), ("PATCH", "/api/settings"), ("GET", "/api/settings")]
+
+    def test_least_recently_used_entry_is_evicted(self, fake_clock):
+        cache = ResponseCache(CachePolicy(ttls={"get": 60.0}, max_entries=2), clock=fake_clock)
+        cache.set(("get", "a"), 1, 60.0)
+        cache.set(("get", "b"), 2, 60.0)
+        cache.get(("get", "a"))
+        cache.set(("get", "c"), 3, 60.0)
+
+        assert cache.get(("get", "a")) == (True, 1)
+        assert cache.get(("get", "b")) == (False, None)
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_overrides(self):
+        policy = CachePolicy(ttls={"get_settings": 60.0, "get_webhooks": 60.0}).with_ttls(
+            {"get_settings": 0, "get_volumes": 5.0}
+        )
+
+        assert policy.ttls == {"get_webhooks": 60.0, "get_volumes": 5.0}
+
+    def test_caches_are_chosen_per_daemon(self):
+        policies = build_cache_policies(" walletd, HOSTD ", "hostd.get_settings=0,walletd.get_state=7", 10)
+
+        assert set(policies) == {"walletd", "hostd"}
+        assert "get_settings" not in policies["hostd"].ttls and policies["walletd"].ttls["get_state"] == 7
+        assert policies["walletd"].max_entries == 10
+        assert set(build_cache_policies(None, None, 10)) == {"walletd", "renterd", "hostd"}
+        with pytest.raises(typer.BadParameter):
+            build_cache_policies("explorerd", None, 10)
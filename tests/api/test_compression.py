@@ -0,0 +1,190 @@
+# tests/api/test_compression.py
+import base64
+import gzip
+import json
+import zlib
+
+import httpx
+import pytest
+
+from siaql.api.compression import CODECS, CompressionTransport, endpoint_name, resolve_codecs
+from siaql.api.hostd import HostdClient
+from siaql.api.pool import ConnectionPool
+from siaql.api.singleflight import NO_COALESCE
+from tests.conftest import Upstream
+
+HOSTS = [{"publicKey": f"ed25519:{i:064x}", "netAddress": f"host{i}.example.com:9982"} for i in range(500)]
+
+
+class Renterd(Upstream):
+    """Mock renterd sending its hosts compressed with `encoding`, in `chunk_size` chunks"""
+
+    def __init__(self, encoding: str = "gzip", chunk_size: int = 1024):
+        super().__init__(HOSTS)
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.accept_encodings = []
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        self.accept_encodings.append(request.headers.get("accept-encoding"))
+        body = json.dumps(self.body).encode()
+        if self.encoding == "gzip":
+            body = gzip.compress(body)
+        elif self.encoding == "deflate":
+            body = zlib.compress(body)
+        elif self.encoding == "raw-deflate":
+            compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+            body = compressor.compress(body) + compressor.flush()
+        encoding = "deflate" if self.encoding == "raw-deflate" else self.encoding
+        headers = {"content-encoding": encoding} if encoding != "identity" else {}
+        # Sent in small chunks, so the body is decoded as it streams in
+        chunks = [body[i : i + self.chunk_size] for i in range(0, len(body), self.chunk_size)]
+
+        async def stream():
+            for chunk in chunks:
+                yield chunk
+
+        return httpx.Response(200, headers=headers, content=stream())
+
+
+def client_for(upstream: Renterd, codecs=("gzip", "deflate")) -> httpx.AsyncClient:
+    transport = CompressionTransport(httpx.MockTransport(upstream.handler), codecs)
+    return httpx.AsyncClient(base_url="http://renterd/api", transport=transport)
+
+
+class TestCompressionTransport:
+    @pytest.mark.parametrize("encoding", ["gzip", "deflate", "raw-deflate", "identity"])
+    async def test_bodies_are_decoded(self, encoding):
+        client = client_for(Renterd(encoding))
+
+        response = await client.get("/bus/hosts")
+
+        assert response.json() == HOSTS
+        assert "content-encoding" not in response.headers
+
+    async def test_negotiates_configured_codecs(self):
+        upstream = Renterd()
+        await client_for(upstream).get("/bus/hosts")
+        await client_for(upstream, codecs=()).get("/bus/hosts")
+
+        assert upstream.accept_encodings == ["gzip, deflate", "identity"]
+
+    async def test_stats_per_endpoint(self):
+        client = client_for(Renterd())
+        transport = client._transport
+
+        await client.get(f"/bus/host/ed25519:{1:064x}")
+        await client.get(f"/bus/host/ed25519:{2:064x}")
+        await client.get("/bus/hosts")
+
+        stats = transport.stats()
+        hosts = stats["endpoints"]["GET /api/bus/host/{id}"]
+        assert hosts["responses"] == 2
+        assert hosts["compressedResponses"] == 2
+        assert hosts["decodedBytes"] == 2 * len(json.dumps(HOSTS))
+        assert hosts["bytesSaved"] == hosts["decodedBytes"] - hosts["wireBytes"] > 0
+        assert hosts["ratio"] > 5
+        assert stats["responses"] == 3
+        assert stats["acceptEncoding"] == "gzip, deflate"
+
+    async def test_corrupt_bodies_raise_decoding_errors(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, headers={"content-encoding": "gzip"}, content=b"not gzip")
+
+        client = httpx.AsyncClient(transport=CompressionTransport(httpx.MockTransport(handler)))
+
+        with pytest.raises(httpx.DecodingError):
+            await client.get("http://renterd/api/bus/hosts")
+
+    async def test_identity_responses_keep_their_headers(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, headers={"content-type": "application/octet-stream"}, content=b"x" * 1000)
+
+        client = httpx.AsyncClient(transport=CompressionTransport(httpx.MockTransport(handler), ("gzip",)))
+        response = await client.get("http://renterd/api/worker/objects/file.bin")
+
+        assert response.headers["content-length"] == "1000"
+        assert response.content == b"x" * 1000
+
+    async def test_caller_codings_and_streams_pass_through(self):
+        upstream = Renterd("gzip")
+        client = client_for(upstream)
+
+        own = await client.get("/bus/hosts", headers={"Accept-Encoding": "gzip"})
+        streamed = await client.get("/bus/hosts", extensions={NO_COALESCE: True})
+
+        assert upstream.accept_encodings == ["gzip", "gzip, deflate"]
+        for response in (own, streamed):
+            assert response.headers["content-encoding"] == "gzip"
+            assert response.json() == HOSTS
+        assert client._transport.stats()["responses"] == 0
+
+    def test_endpoint_names_collapse_ids(self):
+        events = httpx.Request("GET", "http://h/api/wallets/abc/events/12")
+        contract = httpx.Request("GET", f"http://h/api/contracts/{'ab' * 32}")
+
+        assert endpoint_name(events) == "GET /api/wallets/abc/events/{id}"
+        assert endpoint_name(contract) == "GET /api/contracts/{id}"
+
+    def test_unavailable_codecs_are_rejected(self):
+        assert resolve_codecs(None) == tuple(CODECS)
+        assert resolve_codecs(["deflate", "gzip"]) == ("gzip", "deflate")
+        with pytest.raises(ValueError, match="lzma"):
+            resolve_codecs(["lzma"])
+
+    @pytest.mark.parametrize("codec", ["br", "zstd"])
+    async def test_optional_codecs(self, codec):
+        if codec not in CODECS:
+            pytest.skip(f"{codec} support is not installed")
+        if codec == "br":
+            import brotli
+
+            body = brotli.compress(json.dumps(HOSTS).encode())
+        else:
+            import zstandard
+
+            body = zstandard.ZstdCompressor().compress(json.dumps(HOSTS).encode())
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, headers={"content-encoding": codec}, content=body)
+
+        client = httpx.AsyncClient(transport=CompressionTransport(httpx.MockTransport(handler), (codec,)))
+
+        assert (await client.get("http://renterd/api/bus/hosts")).json() == HOSTS
+
+
+class TestPoolCompression:
+    async def test_replayed_journals_are_decoded_and_counted(self):
+        body = gzip.compress(b'[{"id": 1}]')
+        record = {
+            "method": "GET",
+            "path": "/api/volumes",
+            "status": 200,
+            "headers": [["content-encoding", "gzip"]],
+            "base64": base64.b64encode(body).decode(),
+            "latency": 0,
+        }
+        pool = ConnectionPool(replay_records={"hostd": [record]}, compression=["gzip"])
+        client = HostdClient("http://hostd", pool=pool)
+
+        assert await client.get_volumes() == [{"id": 1}]
+        stats = pool.stats()["hostd"]["compression"]
+        assert stats["acceptEncoding"] == "gzip"
+        assert stats["endpoints"]["GET /api/volumes"]["wireBytes"] == len(body)
+
+    async def test_uncompressed_passthrough_keeps_content_length(self):
+        body = b"\0" * 1000
+        record = {
+            "method": "GET",
+            "path": "/api/worker/objects/file.bin",
+            "status": 200,
+            "headers": [["content-type", "application/octet-stream"], ["content-length", "1000"]],
+            "base64": base64.b64encode(body).decode(),
+            "latency": 0,
+        }
+        pool = ConnectionPool(replay_records={"renterd": [record]}, compression=["gzip"])
+        client = httpx.AsyncClient(base_url="http://renterd/api", transport=pool.transport("renterd"))
+
+        async with client.stream("GET", "/worker/objects/file.bin") as response:
+            assert response.headers["content-length"] == "1000"
+            assert await response.aread() == body
@@ -0,0 +1,74 @@
+# tests/api/test_conversion_cache.py
+import httpx
+from strawberry.types.base import StrawberryList
+
+from siaql.api.cache import CachePolicy, ResponseCache
+from siaql.api.decoding import capture_digests, decode_json
+from siaql.api.hostd import HostdClient
+from siaql.graphql.resolvers.converter import ConversionCache
+from siaql.graphql.resolvers.hostd import HostdBaseResolver
+from siaql.graphql.schemas.types import VolumeMeta
+from tests.conftest import BaseHostdTest, Upstream
+
+VOLUMES = [{"id": 1, "localPath": "/mnt/a", "errors": []}]
+
+
+class TestDigests:
+    def test_digest_covers_body_and_url(self):
+        def response(url: str, body: bytes) -> httpx.Response:
+            return httpx.Response(200, content=body, request=httpx.Request("GET", url))
+
+        with capture_digests() as digests:
+            decode_json(response("http://hostd/api/a", b"[1]"))
+            decode_json(response("http://hostd/api/a", b"[1]"))
+            decode_json(response("http://hostd/api/b", b"[1]"))
+            decode_json(response("http://hostd/api/a", b"[2]"))
+
+        assert digests[0] == digests[1]
+        assert len(set(digests)) == 3
+
+    async def test_cached_responses_report_their_digests(self):
+        client = Upstream(VOLUMES).client(HostdClient, cache=ResponseCache(CachePolicy(ttls={"get_volumes": 60})))
+
+        with capture_digests() as fetched:
+            await client.get_volumes()
+        with capture_digests() as served:
+            await client.get_volumes()
+
+        assert len(fetched) == 1
+        assert served == fetched
+
+
+class TestConversionCache:
+    def test_lru_per_field_type(self):
+        cache = ConversionCache(max_entries=1)
+        volumes = ConversionCache.make_key(StrawberryList(VolumeMeta), "get_volumes", None, (), [b"a"])
+        alerts = ConversionCache.make_key(StrawberryList(dict), "get_alerts", None, (), [b"b"])
+        cache.set(volumes, ["volume"])
+        cache.set(alerts, ["alert"])
+
+        assert cache.get(volumes) == (True, ["volume"])
+        cache.set(ConversionCache.make_key(StrawberryList(VolumeMeta), "get_volumes", None, (), [b"c"]), [])
+        assert cache.get(volumes) == (False, None)
+        assert cache.stats()["evictions"] == 1
+
+    def test_untraceable_results_have_no_key(self):
+        assert ConversionCache.make_key(StrawberryList(VolumeMeta), "get_volumes", None, (), []) is None
+        assert ConversionCache.make_key(None, "get_volumes", None, (), [b"a"]) is None
+
+
+class TestResolverDedup(BaseHostdTest):
+    async def test_unchanged_response_reuses_conversion(self):
+        upstream = Upstream(VOLUMES)
+        mock_info = self.create_mock_info(upstream.client(HostdClient), StrawberryList(VolumeMeta))
+        conversions = mock_info.context["conversion_cache"] = ConversionCache()
+
+        first = await HostdBaseResolver.handle_api_call(mock_info, "get_volumes")
+        second = await HostdBaseResolver.handle_api_call(mock_info, "get_volumes")
+        upstream.body = [{"id": 2, "localPath": "/mnt/b", "errors": []}]
+        third = await HostdBaseResolver.handle_api_call(mock_info, "get_volumes")
+
+        assert isinstance(first[0], VolumeMeta)
+        assert second is first
+        assert third[0].local_path == "/mnt/b"
+        assert conversions.stats()["hits"] == 1
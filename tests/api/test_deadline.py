@@ -0,0 +1,133 @@
+# tests/api/test_deadline.py
+import asyncio
+from typing import List
+
+import httpx
+import pytest
+from starlette.requests import Request
+
+from siaql.api.deadline import (
+    DEADLINE_HEADER,
+    Deadline,
+    DeadlineExceeded,
+    DeadlineTransport,
+    deadline_scope,
+    remaining_budget,
+    within_deadline,
+)
+from siaql.api.resilience import CircuitBreaker, guarded
+from siaql.graphql.app import create_graphql_app
+from siaql.graphql.resolvers.hostd import HostdBaseResolver
+from tests.conftest import BaseHostdTest
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self):
+        self.timeouts = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.timeouts.append(request.extensions["timeout"])
+        return httpx.Response(200)
+
+
+class TestDeadline:
+    async def test_transport_caps_timeouts_at_remaining_budget(self):
+        inner = RecordingTransport()
+        client = httpx.AsyncClient(transport=DeadlineTransport(inner), timeout=30)
+
+        await client.get("http://hostd/api/state")
+        with deadline_scope(Deadline.after(2)):
+            await client.get("http://hostd/api/state")
+
+        assert inner.timeouts[0]["read"] == 30
+        assert all(0 < value <= 2 for value in inner.timeouts[1].values())
+
+    async def test_expired_deadline_fails_before_sending(self):
+        inner = RecordingTransport()
+        client = httpx.AsyncClient(transport=DeadlineTransport(inner))
+
+        with deadline_scope(Deadline.after(0)):
+            with pytest.raises(httpx.TimeoutException):
+                await client.get("http://hostd/api/state")
+
+        assert inner.timeouts == []
+
+    async def test_outstanding_calls_are_cancelled(self):
+        cancelled = asyncio.Event()
+
+        async def slow_call():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(DeadlineExceeded):
+            await within_deadline(slow_call(), Deadline.after(0.01))
+
+        assert cancelled.is_set()
+
+    async def test_deadline_timeouts_do_not_trip_the_breaker(self):
+        breaker = CircuitBreaker("hostd", failure_threshold=1)
+
+        async def timing_out():
+            raise httpx.ReadTimeout("timed out")
+
+        with deadline_scope(Deadline.after(0)):
+            with pytest.raises(httpx.ReadTimeout):
+                await guarded(timing_out, breaker, None)()
+
+        assert breaker.state == "closed"
+
+
+class TestResolverDeadline(BaseHostdTest):
+    async def test_field_errors_once_deadline_passes(self, mock_client):
+        async def slow_state():
+            await asyncio.sleep(10)
+
+        mock_client.get_state = slow_state
+        mock_info = self.create_mock_info(mock_client, dict)
+        mock_info.context["deadline"] = Deadline.after(0.01)
+
+        with pytest.raises(DeadlineExceeded):
+            await HostdBaseResolver.handle_api_call(mock_info, "get_state")
+
+    async def test_upstream_calls_see_the_request_deadline(self, mock_client):
+        seen = []
+
+        async def get_alerts():
+            seen.append(remaining_budget())
+            return []
+
+        mock_client.get_alerts = get_alerts
+        mock_info = self.create_mock_info(mock_client, List[dict])
+        mock_info.context["deadline"] = Deadline.after(5)
+
+        await HostdBaseResolver.handle_api_call(mock_info, "get_alerts")
+
+        assert 0 < seen[0] <= 5
+
+
+class TestRequestDeadline:
+    @pytest.mark.parametrize(
+        "default, header, expected",
+        [(None, None, None), (60, None, 60), (60, "5", 5), (60, "120", 60), (None, "5", 5), (60, "soon", 60)],
+    )
+    def test_header_and_server_default(self, default, header, expected):
+        app = create_graphql_app(
+            walletd_url="http://walletd",
+            walletd_password="",
+            renterd_url="http://renterd",
+            renterd_password="",
+            hostd_url="http://hostd",
+            hostd_password="",
+            skipped_endpoints={"walletd": True, "renterd": True, "hostd": False},
+            request_timeout=default,
+        )
+        headers = [(DEADLINE_HEADER.lower().encode(), header.encode())] if header else []
+        deadline = app.request_deadline(Request({"type": "http", "headers": headers}))
+
+        if expected is None:
+            assert deadline is None
+        else:
+            assert expected - 1 < deadline.remaining() <= expected
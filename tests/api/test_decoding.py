@@ -0,0 +1,60 @@
+# tests/api/test_decoding.py
+import httpx
+import pytest
+
+from siaql.api import decoding
+from siaql.api.hostd import HostdClient
+from siaql.api.renterd import RenterdClient
+from tests.conftest import mock_http
+
+
+@pytest.fixture(autouse=True)
+def restore_decoder():
+    previous = decoding.current_decoder()
+    yield
+    decoding.use_decoder(previous)
+
+
+class TestDecoding:
+    def test_auto_prefers_orjson(self):
+        expected = "orjson" if decoding.orjson is not None else "stdlib"
+
+        assert decoding.use_decoder("auto") == expected
+        assert decoding.current_decoder() == expected
+
+    @pytest.mark.parametrize("name", sorted(decoding.DECODERS))
+    def test_decoders_agree(self, name):
+        decoding.use_decoder(name)
+        payload = '{"hosts": [{"publicKey": "ed25519:ab", "price": "1000", "ok": true, "v": 1.5, "n": null}], "é": 1}'
+
+        assert decoding.loads(payload.encode()) == {
+            "hosts": [{"publicKey": "ed25519:ab", "price": "1000", "ok": True, "v": 1.5, "n": None}],
+            "é": 1,
+        }
+
+    async def test_account_balances_keep_integer_precision(self):
+        decoding.use_decoder("auto")
+        body = b'[{"id": "ed25519:ab", "balance": 992407509999995800000001}]'
+        client = mock_http(RenterdClient("http://renterd"), lambda request: httpx.Response(200, content=body))
+
+        accounts = await client.get_worker_accounts()
+
+        assert accounts[0]["balance"] == 992407509999995800000001
+
+    def test_unknown_decoder(self):
+        with pytest.raises(ValueError):
+            decoding.use_decoder("simdjson")
+
+    async def test_registered_decoder_is_used_by_clients(self, monkeypatch):
+        calls = []
+
+        def recording_loads(data: bytes):
+            calls.append(data)
+            return decoding.stdlib_loads(data)
+
+        monkeypatch.setitem(decoding.DECODERS, "recording", recording_loads)
+        decoding.use_decoder("recording")
+        client = mock_http(HostdClient("http://hostd"), lambda request: httpx.Response(200, json=[]))
+
+        assert await client.get_alerts() == []
+        assert calls == [b"[]"]
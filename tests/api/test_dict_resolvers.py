@@ -0,0 +1,66 @@
+# tests/api/test_dict_resolvers.py
+import datetime
+
+from siaql.api.hostd import HostdClient
+from siaql.api.renterd import RenterdClient
+from siaql.graphql.resolvers.mapping import serialize_datetime
+from siaql.graphql.schema import mapping_schema, schema
+from tests.conftest import Upstream, graphql_context
+
+HOSTS = [
+    {
+        "publicKey": f"ed25519:{i:064x}",
+        "netAddress": f"host{i}.example.com:9982",
+        "knownSince": "2024-01-01T00:00:00Z",
+        "storedData": i * 1000,
+        "interactions": {"totalScans": 10 + i},
+        "settings": {"acceptingcontracts": i % 2 == 0, "maxduration": 144 * i},
+    }
+    for i in range(3)
+]
+ALERTS = [
+    {"id": "h:" + "ab" * 32, "severity": "warning", "message": "low on storage", "timestamp": "2024-06-01T00:00:00Z"}
+]
+
+
+class TestMappingSchema:
+    async def test_matches_converted_results(self):
+        query = """query {
+            renterdGetHosts(
+                filter: {field: "interactions.totalScans", operator: GTE, value: "11"}
+                sort: {field: "storedData", direction: DESC}
+            ) {
+                publicKey netAddress knownSince storedData
+                interactions { totalScans lastScan }
+                settings { acceptingcontracts maxduration }
+            }
+        }"""
+
+        converted = await schema.execute(
+            query, context_value=graphql_context(renterd_client=Upstream(HOSTS).client(RenterdClient))
+        )
+        dicts = await mapping_schema().execute(
+            query, context_value=graphql_context(renterd_client=Upstream(HOSTS).client(RenterdClient))
+        )
+
+        assert converted.errors is None and dicts.errors is None
+        assert dicts.data == converted.data
+        hosts = dicts.data["renterdGetHosts"]
+        assert [host["storedData"] for host in hosts] == [2000, 1000]
+        assert hosts[0]["knownSince"] == "2024-01-01T00:00:00+00:00"
+        assert hosts[0]["settings"] == {"acceptingcontracts": True, "maxduration": 288}
+
+    async def test_enums_serialize_raw_names(self):
+        query = "{ hostdAlerts { id severity message timestamp } }"
+
+        result = await mapping_schema().execute(
+            query, context_value=graphql_context(hostd_client=Upstream(ALERTS).client(HostdClient))
+        )
+
+        assert result.errors is None
+        assert result.data["hostdAlerts"][0]["severity"] == "WARNING"
+        assert result.data["hostdAlerts"][0]["timestamp"] == "2024-06-01T00:00:00+00:00"
+
+    def test_datetimes_serialize_strings_and_objects(self):
+        assert serialize_datetime("2024-06-01T12:30:00.5Z") == "2024-06-01T12:30:00.500000+00:00"
+        assert serialize_datetime(datetime.datetime(2024, 6, 1)) == "2024-06-01T00:00:00"
@@ -0,0 +1,71 @@
+# tests/api/test_fake_daemons.py
+import httpx
+import pytest
+import typer
+
+from siaql.api.hostd import HostdClient, HostdError
+from siaql.api.renterd import RenterdClient
+from siaql.api.walletd import WalletdClient
+from siaql.scripts.fake_daemons import SCHEMAS, FakeConfig, create_fake_daemons, parse_sizes, route_path, schema_dir
+from tests.conftest import mock_http
+
+
+def fake_client(client_class, daemon: str, config: FakeConfig):
+    return mock_http(client_class(f"http://fake/{daemon}"), httpx.ASGITransport(app=create_fake_daemons(config)))
+
+
+class TestFakeDaemons:
+    def test_route_paths(self):
+        assert route_path("{{baseURL}}/wallets/:id/events?offset=0&limit=100") == "/api/wallets/{id}/events"
+        assert route_path("{{BUS_URI}}{{BUS_API_PREFIX}}/objects/:key") == "/api/bus/objects/{key:path}"
+        assert route_path("{{WORKER_URI}}{{WORKER_API_PREFIX}}/state") == "/api/worker/state"
+        assert route_path("") is None
+
+    async def test_collections_are_scaled(self):
+        renterd = fake_client(RenterdClient, "renterd", FakeConfig(sizes={"hosts": 2500}, default_size=3))
+
+        assert len(await renterd.get_hosts()) == 2500
+        assert len(await renterd.get_contracts()) == 3
+        assert (await renterd.get_worker_state())["id"] == "worker"
+
+    async def test_entries_have_unique_ids(self):
+        renterd = fake_client(RenterdClient, "renterd", FakeConfig(sizes={"hosts": 2500}))
+        hostd = fake_client(HostdClient, "hostd", FakeConfig(default_size=1000))
+
+        hosts = await renterd.get_hosts()
+        second_page = await renterd.client.get("/bus/hosts", params={"offset": 1, "limit": 1})
+        contracts = await hostd.client.post("/contracts", json={"offset": 0, "limit": 1000})
+
+        assert len({host["publicKey"] for host in hosts}) == 2500
+        assert hosts[1]["publicKey"].startswith("ed25519:") and len(hosts[1]["publicKey"]) == len(hosts[0]["publicKey"])
+        assert second_page.json()[0]["publicKey"] == hosts[1]["publicKey"]
+        assert len({contract["revision"]["parentID"] for contract in contracts.json()["contracts"]}) == 1000
+
+    async def test_pages_follow_offset_and_limit(self):
+        walletd = fake_client(WalletdClient, "walletd", FakeConfig(sizes={"events": 1200}))
+
+        events = await walletd.get_wallet_events("w", offset=1000, limit=500)
+
+        assert len(events) == 200
+
+    async def test_object_paths_and_fixed_routes(self):
+        renterd = fake_client(RenterdClient, "renterd", FakeConfig())
+        hostd = fake_client(HostdClient, "hostd", FakeConfig())
+
+        assert await renterd.client.get("/bus/objects/some/nested/file.txt")
+        assert (await renterd.client.get("/bus/contracts/prunable")).status_code == 200
+        assert isinstance(await hostd.get_volumes(), list)
+
+    async def test_injected_errors(self):
+        hostd = fake_client(HostdClient, "hostd", FakeConfig(error_rate=1.0, error_status=503))
+
+        with pytest.raises(HostdError, match="503"):
+            await hostd.get_volumes()
+
+    def test_parse_sizes(self):
+        assert parse_sizes(["hosts=100000", " events = 5 "]) == {"hosts": 100000, "events": 5}
+
+    def test_missing_schemas_are_reported(self, tmp_path):
+        assert schema_dir(None) == SCHEMAS
+        with pytest.raises(typer.BadParameter, match="walletd.simplified.json, renterd.simplified.json"):
+            schema_dir(tmp_path)
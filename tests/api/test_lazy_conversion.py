@@ -0,0 +1,66 @@
+# tests/api/test_lazy_conversion.py
+import datetime
+
+from strawberry.types.base import StrawberryList
+
+from siaql.api.renterd import RenterdClient
+from siaql.graphql.resolvers.converter import LazyObject, TypeConverter
+from siaql.graphql.schema import schema
+from siaql.graphql.schemas.types import Host
+from tests.conftest import Upstream, graphql_context
+
+HOSTS = [
+    {
+        "publicKey": f"ed25519:{i:064x}",
+        "netAddress": f"host{i}.example.com:9982",
+        "knownSince": "2024-01-01T00:00:00Z",
+        "storedData": i * 1000,
+        "interactions": {"totalScans": 10 + i, "lastScan": "2024-06-01T00:00:00Z"},
+    }
+    for i in range(3)
+]
+
+
+class TestLazyObjects:
+    def test_fields_are_converted_when_read(self):
+        hosts = TypeConverter.convert(HOSTS, StrawberryList(Host), lazy=True)
+        host = hosts[2]
+
+        assert isinstance(host, Host) and isinstance(host, LazyObject)
+        assert "interactions" not in host.__dict__
+        assert isinstance(host.interactions, LazyObject)
+        assert host.interactions.total_scans == 12
+        assert host.interactions.last_scan == datetime.datetime(2024, 6, 1, tzinfo=datetime.timezone.utc)
+        assert host.interactions is host.interactions
+        assert "known_since" not in host.__dict__
+
+    def test_missing_fields_match_eager_conversion(self):
+        lazy = TypeConverter.convert(HOSTS[0], Host, lazy=True)
+        eager = TypeConverter.convert(HOSTS[0], Host)
+
+        assert lazy.price_table is None
+        assert repr(lazy) == repr(eager)
+
+
+class TestQueries:
+    async def test_lazy_results_resolve_filter_and_sort(self):
+        query = """query {
+            renterdGetHosts(
+                filter: {field: "interactions.totalScans", operator: GTE, value: "11"}
+                sort: {field: "storedData", direction: DESC}
+            ) {
+                netAddress
+                ... on Host { interactions { totalScans } }
+            }
+        }"""
+
+        result = await schema.execute(
+            query,
+            context_value=graphql_context(renterd_client=Upstream(HOSTS).client(RenterdClient), lazy_conversion=True),
+        )
+
+        assert result.errors is None
+        assert result.data["renterdGetHosts"] == [
+            {"netAddress": "host2.example.com:9982", "interactions": {"totalScans": 12}},
+            {"netAddress": "host1.example.com:9982", "interactions": {"totalScans": 11}},
+        ]
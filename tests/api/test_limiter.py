@@ -0,0 +1,162 @@
+# tests/api/test_limiter.py
+import asyncio
+
+import httpx
+import pytest
+
+from siaql.api.limiter import AdaptiveLimiter, LimiterTransport
+from siaql.api.pool import ConnectionPool
+from siaql.api.singleflight import NO_COALESCE
+from tests.conftest import FakeClock
+
+
+class TestAdaptiveLimiter:
+    async def test_queues_beyond_the_limit_in_order(self):
+        limiter = AdaptiveLimiter(initial_limit=2)
+        order = []
+
+        async def call(name: str):
+            await limiter.acquire()
+            order.append(name)
+
+        await limiter.acquire()
+        await limiter.acquire()
+        waiters = [asyncio.create_task(call(name)) for name in "abc"]
+        await asyncio.sleep(0)
+
+        assert limiter.stats()["queued"] == 3
+        limiter.release()
+        limiter.release()
+        limiter.release()
+        await asyncio.gather(*waiters)
+
+        assert order == ["a", "b", "c"]
+        assert limiter.in_flight == 2
+
+    async def test_cancelled_waiters_leave_the_queue(self):
+        limiter = AdaptiveLimiter(initial_limit=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release()
+
+        assert limiter.in_flight == 0
+        assert limiter.queued == 0
+
+    def test_grows_while_saturated_and_healthy(self):
+        limiter = AdaptiveLimiter(initial_limit=4, max_limit=10, clock=FakeClock())
+
+        for _ in range(40):
+            limiter.in_flight = limiter.current_limit
+            limiter.release(latency=0.01)
+
+        assert limiter.current_limit > 4
+        assert limiter.current_limit <= 10
+
+    def test_does_not_grow_when_idle(self):
+        limiter = AdaptiveLimiter(initial_limit=4)
+
+        for _ in range(40):
+            limiter.in_flight = 1
+            limiter.release(latency=0.01)
+
+        assert limiter.current_limit == 4
+
+    def test_shrinks_on_failures_once_per_round_trip(self):
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial_limit=16, clock=clock)
+        limiter.in_flight = 1
+        limiter.release(latency=0.1)
+
+        for _ in range(3):
+            limiter.in_flight = 1
+            limiter.release(failed=True)
+        assert limiter.current_limit == 12
+
+        clock.now = 1
+        limiter.in_flight = 1
+        limiter.release(failed=True)
+        assert limiter.current_limit == 9
+
+    def test_shrinks_when_latency_rises(self):
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial_limit=16, clock=clock)
+        for _ in range(20):
+            limiter.in_flight = 1
+            limiter.release(latency=0.1)
+
+        for _ in range(10):
+            clock.now += 10
+            limiter.in_flight = 1
+            limiter.release(latency=1.0)
+
+        assert limiter.current_limit < 16
+        assert limiter.stats()["decreases"] > 0
+
+
+class TestLimiterTransport:
+    async def test_bounds_in_flight_requests(self):
+        in_flight = peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={})
+
+        limiter = AdaptiveLimiter(initial_limit=3, max_limit=3)
+        client = httpx.AsyncClient(transport=LimiterTransport(httpx.MockTransport(handler), limiter))
+
+        await asyncio.gather(*(client.get(f"http://hostd/api/{i}") for i in range(20)))
+
+        assert peak == 3
+        assert limiter.in_flight == 0
+
+    async def test_open_transfers_do_not_take_slots(self):
+        async def body():
+            yield b"x"
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.startswith("/api/worker/upload"):
+                await request.aread()
+            return httpx.Response(200, content=b"x" * 10)
+
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=2)
+        client = httpx.AsyncClient(transport=LimiterTransport(httpx.MockTransport(handler), limiter))
+
+        downloads = [
+            await client.send(
+                client.build_request("GET", f"http://renterd/api/worker/objects/{i}", extensions={NO_COALESCE: True}),
+                stream=True,
+            )
+            for i in range(limiter.current_limit)
+        ]
+        await client.put("http://renterd/api/worker/upload/object", content=body())
+        response = await asyncio.wait_for(client.get("http://renterd/api/bus/state"), 1)
+
+        assert response.status_code == 200
+        assert limiter.in_flight == 0
+        for download in downloads:
+            await download.aclose()
+
+    async def test_unavailable_responses_count_as_failures(self):
+        limiter = AdaptiveLimiter(initial_limit=8)
+        transport = LimiterTransport(httpx.MockTransport(lambda request: httpx.Response(503)), limiter)
+        client = httpx.AsyncClient(transport=transport)
+
+        await client.get("http://hostd/api/state")
+
+        assert limiter.current_limit == 6
+        assert limiter.in_flight == 0
+
+    def test_pool_reports_limiter_stats(self):
+        pool = ConnectionPool(adaptive_concurrency=True)
+        pool.create_client("hostd", "http://hostd/api")
+
+        assert pool.stats()["hostd"]["limiter"]["limit"] == 8
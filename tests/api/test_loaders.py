@@ -0,0 +1,121 @@
+# tests/api/test_loaders.py
+import asyncio
+import json
+
+import httpx
+
+from siaql.api.hostd import HostdClient
+from siaql.api.renterd import RenterdClient
+from siaql.graphql.resolvers.loaders import LoaderRegistry, LoaderStats
+from siaql.graphql.schema import schema
+from tests.conftest import Upstream, graphql_context
+
+FCID = "fcid:" + "ab" * 32
+
+
+class Contracts(Upstream):
+    def __init__(self, contracts):
+        super().__init__()
+        self.contracts = contracts
+        self.filters = []
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if request.method == "POST" and path.endswith("/contracts"):
+            self.filters.append(json.loads(request.content))
+            ids = self.filters[-1]["contractIDs"]
+            return httpx.Response(200, json={"contracts": [c for c in self.contracts if c["id"] in ids], "count": 0})
+        if path.endswith("/bus/contracts"):
+            return httpx.Response(200, json=self.contracts)
+        for contract in self.contracts:
+            if path.endswith(contract["id"]):
+                return httpx.Response(200, json=contract)
+        return httpx.Response(404, text="contract not found")
+
+
+class TestLoaderRegistry:
+    async def test_identical_calls_share_one_request(self):
+        upstream = Contracts([{"id": FCID}])
+        client = upstream.client(HostdClient)
+        loaders = LoaderRegistry()
+        get_contract = loaders.wrap("hostd", client, "get_contract")
+
+        results = [await get_contract(id=FCID)]
+        results += [await get_contract(id=FCID)]
+
+        assert results[0] is results[1]
+        assert upstream.requests == [f"GET /api/contracts/{FCID}"]
+        assert loaders.counters.stats()["deduplicated"] == 1
+
+    async def test_concurrent_lookups_are_batched(self):
+        ids = [f"fcid:{i:064x}" for i in range(3)]
+        upstream = Contracts([{"id": id} for id in ids])
+        client = upstream.client(HostdClient)
+        loaders = LoaderRegistry()
+        get_contract = loaders.wrap("hostd", client, "get_contract")
+
+        results = await asyncio.gather(*(get_contract(id=id) for id in ids + ["fcid:missing"]), return_exceptions=True)
+
+        assert [r["id"] for r in results[:3]] == ids
+        assert "404" in str(results[3])
+        assert upstream.requests == ["POST /api/contracts", "GET /api/contracts/fcid:missing"]
+        assert loaders.counters.stats()["batchedCalls"] == 3
+
+    async def test_lookups_never_fetch_unfiltered_lists(self):
+        contracts = [{"id": f"fcid:{i:064x}"} for i in range(5000)]
+        upstream = Contracts(contracts)
+        ids = [contract["id"] for contract in contracts[:2]]
+        renterd, hostd = upstream.client(RenterdClient), upstream.client(HostdClient)
+        loaders = LoaderRegistry()
+
+        renterd_results = await asyncio.gather(*(loaders.wrap("renterd", renterd, "get_contract")(id=id) for id in ids))
+        hostd_results = await asyncio.gather(*(loaders.wrap("hostd", hostd, "get_contract")(id=id) for id in ids))
+
+        assert [r["id"] for r in renterd_results] == ids and [r["id"] for r in hostd_results] == ids
+        assert upstream.requests == [f"GET /api/bus/contract/{id}" for id in ids] + ["POST /api/contracts"]
+        assert upstream.filters == [{"contractIDs": ids, "offset": 0, "limit": 2}]
+
+    async def test_paged_methods_are_not_wrapped(self):
+        client = HostdClient("http://daemon")
+        loaders = LoaderRegistry()
+
+        assert loaders.wrap("hostd", client, "iter_accounts") == client.iter_accounts
+
+
+class TestQueries:
+    async def test_aliases_share_calls(self):
+        ids = [f"fcid:{i:064x}" for i in range(2)]
+        upstream = Contracts([{"id": id} for id in ids])
+        renterd = upstream.client(RenterdClient)
+        query = """query ($a: FileContractID!, $b: FileContractID!) {
+            a: renterdContract(id: $a) { id }
+            b: renterdContract(id: $a) { id }
+            c: renterdContract(id: $b) { id }
+        }"""
+
+        result = await schema.execute(
+            query,
+            variable_values={"a": ids[0], "b": ids[1]},
+            context_value=graphql_context(renterd_client=renterd, loaders=LoaderRegistry(LoaderStats())),
+        )
+
+        assert result.errors is None
+        assert [result.data[alias]["id"] for alias in "abc"] == [ids[0], ids[0], ids[1]]
+        assert upstream.requests == [f"GET /api/bus/contract/{id}" for id in ids]
+
+    async def test_mutations_always_reach_the_daemon(self):
+        upstream = Contracts([])
+        renterd = upstream.client(RenterdClient)
+        mutation = """mutation ($id: FileContractID!) {
+            a: renterdDeleteContract(id: $id)
+            b: renterdDeleteContract(id: $id)
+        }"""
+
+        result = await schema.execute(
+            mutation,
+            variable_values={"id": FCID},
+            context_value=graphql_context(renterd_client=renterd, loaders=LoaderRegistry(LoaderStats())),
+        )
+
+        assert result.errors is None
+        assert upstream.requests == [f"DELETE /api/bus/contract/{FCID}"] * 2
@@ -0,0 +1,129 @@
+# tests/api/test_pagination.py
+import asyncio
+from typing import List
+
+import httpx
+import pytest
+
+from siaql.api.hostd import HostdClient
+from siaql.api.utils import collect, paginate
+from siaql.graphql.resolvers.filter import PaginationInput
+from siaql.graphql.resolvers.hostd import HostdBaseResolver
+from siaql.graphql.schema import schema
+from tests.conftest import BaseHostdTest, Upstream, graphql_context
+
+
+class PagedEndpoint:
+    """Mock offset/limit endpoint over a fixed number of items"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.requests = []
+
+    async def fetch(self, offset: int, limit: int):
+        self.requests.append((offset, limit))
+        await asyncio.sleep(0)
+        return list(range(offset, min(offset + limit, self.total)))
+
+
+class TestPaginate:
+    async def test_walks_every_page(self):
+        endpoint = PagedEndpoint(total=25)
+
+        items = await collect(paginate(endpoint.fetch, page_size=10, prefetch=0))
+
+        assert items == list(range(25))
+        assert endpoint.requests == [(0, 10), (10, 10), (20, 10)]
+
+    async def test_exact_multiple_ends_on_empty_page(self):
+        endpoint = PagedEndpoint(total=20)
+
+        items = await collect(paginate(endpoint.fetch, page_size=10, prefetch=0))
+
+        assert items == list(range(20))
+        assert endpoint.requests[-1] == (20, 10)
+
+    async def test_prefetches_next_pages(self):
+        endpoint = PagedEndpoint(total=100)
+        pages = paginate(endpoint.fetch, page_size=10, prefetch=2)
+
+        first = await pages.__anext__()
+        await asyncio.sleep(0.01)
+
+        assert first == 0
+        assert endpoint.requests == [(0, 10), (10, 10), (20, 10)]
+        await pages.aclose()
+
+    @pytest.mark.parametrize("prefetch", [0, 1, 2])
+    async def test_no_prefetch_past_a_short_page(self, prefetch):
+        endpoint = PagedEndpoint(total=25)
+
+        items = await collect(paginate(endpoint.fetch, page_size=10, prefetch=prefetch))
+        await asyncio.sleep(0.01)
+
+        assert items == list(range(25))
+        assert endpoint.requests == [(0, 10), (10, 10), (20, 10)]
+
+    async def test_single_page_takes_one_request(self):
+        endpoint = PagedEndpoint(total=5)
+
+        items = await collect(paginate(endpoint.fetch, page_size=10, prefetch=2))
+        await asyncio.sleep(0.01)
+
+        assert items == list(range(5))
+        assert endpoint.requests == [(0, 10)]
+
+    async def test_collect_stops_early(self):
+        endpoint = PagedEndpoint(total=1000)
+
+        items = await collect(paginate(endpoint.fetch, page_size=10, prefetch=1), max_items=15)
+
+        assert items == list(range(15))
+        assert len(endpoint.requests) <= 3
+
+    async def test_page_errors_are_raised(self):
+        async def broken(offset: int, limit: int):
+            raise ConnectionError("daemon unavailable")
+
+        with pytest.raises(ConnectionError):
+            await collect(paginate(broken, page_size=10))
+
+    def test_page_size_must_be_positive(self):
+        with pytest.raises(ValueError):
+            paginate(PagedEndpoint(total=1).fetch, page_size=0)
+
+
+class TestPagedResolvers(BaseHostdTest):
+    async def test_resolver_stops_once_pagination_is_satisfied(self, mock_client):
+        endpoint = PagedEndpoint(total=1000)
+        mock_client.iter_accounts = lambda: paginate(endpoint.fetch, page_size=10, prefetch=0)
+        mock_info = self.create_mock_info(mock_client, List[int])
+
+        result = await HostdBaseResolver.handle_api_call(
+            mock_info, "iter_accounts", pagination_input=PaginationInput(offset=5, limit=10)
+        )
+
+        assert result == list(range(5, 15))
+        assert endpoint.requests == [(0, 10), (10, 10)]
+
+    @pytest.mark.parametrize(
+        "arguments, pages",
+        [("", [(0, 100)]), ("(pagination: {offset: 150, limit: 10})", [(0, 100), (100, 100)])],
+    )
+    async def test_accounts_without_pagination_get_the_first_page(self, arguments, pages):
+        requested = []
+
+        class Hostd(Upstream):
+            def respond(self, request: httpx.Request) -> httpx.Response:
+                offset, limit = int(request.url.params["offset"]), int(request.url.params["limit"])
+                requested.append((offset, limit))
+                accounts = [{"balance": "0"} for _ in range(offset, min(offset + limit, 1000))]
+                return httpx.Response(200, json=accounts)
+
+        hostd = Hostd().client(HostdClient)
+        result = await schema.execute(
+            f"{{ hostdAccounts{arguments} {{ balance }} }}", context_value=graphql_context(hostd_client=hostd)
+        )
+
+        assert result.errors is None
+        assert sorted(requested) == pages
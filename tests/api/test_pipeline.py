@@ -0,0 +1,100 @@
+# tests/api/test_pipeline.py
+from typing import List
+
+import pytest
+
+from siaql.graphql.resolvers.filter import PaginationInput
+from siaql.graphql.resolvers.hostd import HostdBaseResolver
+from siaql.graphql.resolvers.pipeline import Resolution, ResolverPipeline, create_pipeline
+from tests.conftest import BaseHostdTest, FakeClock
+
+
+def resolution(result=None) -> Resolution:
+    return Resolution(info=None, daemon="hostd", method="get_volumes", result=result)
+
+
+class TestResolverPipeline:
+    async def test_stages_run_in_order_and_are_timed(self):
+        calls = []
+
+        def double(r: Resolution) -> None:
+            calls.append("double")
+            r.result *= 2
+
+        async def increment(r: Resolution) -> None:
+            calls.append("increment")
+            r.result += 1
+
+        pipeline = ResolverPipeline([("double", double)], clock=FakeClock(step=0.5))
+        pipeline.add_stage("increment", increment, before="double")
+
+        assert await pipeline.run(resolution(1)) == 4
+        assert calls == ["increment", "double"]
+        assert pipeline.stats()["double"]["runs"] == 1
+        assert pipeline.stats()["double"]["totalMs"] == 500
+
+    async def test_stages_short_circuit(self):
+        def settle(r: Resolution) -> None:
+            r.skip.add("skipped")
+            r.finish("settled")
+
+        def fail(r: Resolution) -> None:
+            raise AssertionError("stage should not run")
+
+        pipeline = ResolverPipeline([("settle", settle), ("skipped", fail), ("after", fail)])
+
+        assert await pipeline.run(resolution()) == "settled"
+        assert pipeline.stats()["skipped"]["skipped"] == 1
+        assert pipeline.stats()["after"]["skipped"] == 1
+
+    async def test_errors_are_counted(self):
+        def fail(r: Resolution) -> None:
+            raise ValueError("broken")
+
+        pipeline = ResolverPipeline([("fail", fail)])
+
+        with pytest.raises(ValueError):
+            await pipeline.run(resolution())
+        assert pipeline.stats()["fail"]["errors"] == 1
+
+    def test_stage_names_are_unique(self):
+        pipeline = ResolverPipeline([("fetch", lambda r: None)])
+
+        with pytest.raises(ValueError):
+            pipeline.add_stage("fetch", lambda r: None)
+        with pytest.raises(ValueError):
+            pipeline.add_stage("convert", lambda r: None, after="cache")
+
+    def test_default_stages(self):
+        assert [name for name, _ in create_pipeline().stages] == [
+            "pushdown",
+            "fetch",
+            "cache",
+            "convert",
+            "filter",
+            "sort",
+            "page",
+        ]
+
+
+class TestDaemonResolvers(BaseHostdTest):
+    async def test_resolvers_run_the_context_pipeline(self, mock_client):
+        mock_client.get_volumes.return_value = list(range(10))
+        mock_info = self.create_mock_info(mock_client, List[int])
+        mock_info.context["pipeline"] = pipeline = create_pipeline()
+        other = create_pipeline()
+
+        result = await HostdBaseResolver.handle_api_call(
+            mock_info, "get_volumes", pagination_input=PaginationInput(offset=2, limit=3)
+        )
+
+        assert result == [2, 3, 4]
+        assert pipeline.stats()["page"]["runs"] == 1
+        assert other.stats()["page"]["runs"] == 0
+
+    async def test_skipped_daemons_are_rejected(self, mock_client):
+        mock_info = self.create_mock_info(mock_client, List[int])
+        mock_info.context["skipped_endpoints"]["hostd"] = True
+
+        with pytest.raises(Exception, match="Hostd endpoint was skipped"):
+            await HostdBaseResolver.handle_api_call(mock_info, "get_volumes")
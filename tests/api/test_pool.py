@@ -0,0 +1,110 @@
+# tests/api/test_pool.py
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from siaql.api.pool import ConnectionPool, MeteredTransport, PoolLimits, socket_url, split_socket_url
+from siaql.api.walletd import WalletdClient
+
+
+def make_mock_transport(handler) -> MeteredTransport:
+    transport = MeteredTransport(httpx.MockTransport(handler))
+    transport.users += 1
+    return transport
+
+
+class TestConnectionPool:
+    def test_daemon_limits_override_defaults(self):
+        pool = ConnectionPool(limits=PoolLimits(max_connections=50), daemon_limits={"hostd": PoolLimits(5)})
+
+        assert pool.limits_for("walletd").max_connections == 50
+        assert pool.limits_for("hostd").max_connections == 5
+
+    async def test_clients_share_daemon_transport(self):
+        pool = ConnectionPool()
+        first = WalletdClient("http://localhost:9980", pool=pool)
+        second = WalletdClient("http://localhost:9980", pool=pool)
+
+        assert pool.transport("walletd") is first.client._transport
+        assert pool.transport("walletd") is second.client._transport
+
+        # Closing one client must not close the pool the other one still uses
+        await first.close()
+        assert pool.transport("walletd").users == 1
+        await second.close()
+
+    async def test_counters_track_requests(self):
+        transport = make_mock_transport(lambda request: httpx.Response(200, json={"height": 1}))
+        async with httpx.AsyncClient(base_url="http://walletd/api", transport=transport) as client:
+            response = await client.get("/consensus/tip")
+            assert response.json() == {"height": 1}
+
+        stats = transport.stats()
+        assert stats["requests"] == 1
+        assert stats["inFlight"] == 0
+        assert stats["peakInFlight"] == 1
+
+    async def test_counters_track_errors(self):
+        def handler(request):
+            raise httpx.ConnectError("connection refused", request=request)
+
+        transport = make_mock_transport(handler)
+        async with httpx.AsyncClient(base_url="http://walletd/api", transport=transport) as client:
+            with pytest.raises(httpx.ConnectError):
+                await client.get("/state")
+
+        assert transport.stats()["errors"] == 1
+        assert transport.stats()["inFlight"] == 0
+
+    def test_stats_are_reported_per_daemon(self):
+        pool = ConnectionPool(coalesce_gets=False)
+        pool.transport("hostd")
+
+        stats = pool.stats()
+        assert list(stats) == ["hostd"]
+        assert stats["hostd"]["pool"]["connections"] == 0
+        assert "singleflight" not in stats["hostd"]
+
+    def test_connection_stats_degrade_without_httpx_pool(self):
+        pool = ConnectionPool()
+        pool.transport("hostd")
+        pool._http["hostd"] = httpx.MockTransport(lambda request: httpx.Response(200))
+
+        assert pool.stats()["hostd"]["pool"]["connections"] is None
+        assert pool.connection_stats("walletd") == {
+            "connections": None,
+            "idleConnections": None,
+            "activeConnections": None,
+        }
+
+
+class TestUnixSockets:
+    def test_socket_urls_take_api_paths(self):
+        url = f"{socket_url('unix:///run/walletd/api.sock/')}/api"
+
+        assert url == "http+unix://%2Frun%2Fwalletd%2Fapi.sock/api"
+        assert split_socket_url(url) == ("/run/walletd/api.sock", "http://localhost/api")
+        assert split_socket_url("http://localhost:9980/api") == (None, "http://localhost:9980/api")
+
+    async def test_client_talks_over_unix_socket(self, tmp_path):
+        path = os.path.join(tmp_path, "walletd.sock")
+        seen = []
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            seen.append((await reader.readuntil(b"\r\n\r\n")).split(b"\r\n")[0])
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 12\r\nConnection: close\r\n\r\n{"height":1}')
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_unix_server(handle, path)
+        client = WalletdClient(f"unix://{path}")
+        try:
+            response = await client.client.get("/consensus/tip")
+        finally:
+            await client.close()
+            server.close()
+
+        assert response.json() == {"height": 1}
+        assert seen == [b"GET /api/consensus/tip HTTP/1.1"]
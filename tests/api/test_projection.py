@@ -0,0 +1,67 @@
+# tests/api/test_projection.py
+from siaql.api.renterd import RenterdClient
+from siaql.graphql.resolvers.converter import TypeConverter, add_projection_path, merge_projection
+from siaql.graphql.schema import schema
+from siaql.graphql.schemas.types import Host
+from tests.conftest import Upstream, graphql_context
+
+HOSTS = [
+    {
+        "publicKey": f"ed25519:{i:064x}",
+        "netAddress": f"host{i}.example.com:9982",
+        "knownSince": "2024-01-01T00:00:00Z",
+        "storedData": i * 1000,
+        "interactions": {"totalScans": 10 + i, "lastScan": "2024-06-01T00:00:00Z", "lastScanSuccess": True},
+    }
+    for i in range(5)
+]
+
+
+class TestProjection:
+    def test_unselected_fields_are_not_converted(self):
+        projection = {"netAddress": None, "interactions": {"totalScans": None}}
+
+        host = TypeConverter.convert(HOSTS[1], Host, projection)
+
+        assert host.net_address == "host1.example.com:9982"
+        assert host.interactions.total_scans == 11
+        assert host.interactions.last_scan is None
+        assert host.known_since is None
+        assert host.public_key is None
+
+    def test_without_projection_everything_is_converted(self):
+        host = TypeConverter.convert(HOSTS[1], Host)
+
+        assert host.known_since is not None
+        assert host.interactions.last_scan is not None
+
+    def test_paths_and_merges(self):
+        projection = {"interactions": {"totalScans": None}}
+        add_projection_path(projection, "interactions.lastScan")
+        add_projection_path(projection, "settings.maxDuration")
+        merge_projection(projection, "settings", None)
+
+        assert projection == {"interactions": {"totalScans": None, "lastScan": None}, "settings": None}
+
+
+class TestQueries:
+    async def test_fragments_and_filter_fields_are_converted(self):
+        query = """query {
+            renterdGetHosts(
+                filter: {field: "interactions.totalScans", operator: GTE, value: "12"}
+                sort: {field: "storedData", direction: DESC}
+            ) {
+                netAddress
+                ...Scans
+            }
+        }
+        fragment Scans on Host { interactions { lastScanSuccess } }"""
+
+        result = await schema.execute(
+            query, context_value=graphql_context(renterd_client=Upstream(HOSTS).client(RenterdClient))
+        )
+
+        assert result.errors is None
+        hosts = result.data["renterdGetHosts"]
+        assert [host["netAddress"] for host in hosts] == [f"host{i}.example.com:9982" for i in (4, 3, 2)]
+        assert hosts[0] == {"netAddress": "host4.example.com:9982", "interactions": {"lastScanSuccess": True}}
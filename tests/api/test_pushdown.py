@@ -0,0 +1,136 @@
+# tests/api/test_pushdown.py
+import json
+
+import httpx
+from strawberry.types.base import StrawberryList
+
+from siaql.api.hostd import HostdClient
+from siaql.graphql.resolvers.filter import FilterInput, FilterOperator, PaginationInput, SortDirection, SortInput
+from siaql.graphql.resolvers.hostd import HostdBaseResolver
+from siaql.graphql.resolvers.pushdown import create_pushdowns, narrow_window
+from siaql.graphql.resolvers.walletd import WalletdBaseResolver
+from siaql.graphql.schema import schema
+from siaql.graphql.schemas.types import ContractFilter, HostdContractsResponse
+from tests.conftest import BaseHostdTest, BaseWalletdTest, Upstream, graphql_context
+
+
+class TestWindow:
+    def test_narrow_window(self):
+        assert narrow_window(100, 500, PaginationInput(offset=20, limit=10)) == (120, 10)
+        assert narrow_window(0, 25, PaginationInput(offset=20, limit=10)) == (20, 5)
+        assert narrow_window(0, 5, PaginationInput(offset=20, limit=10)) == (20, 0)
+        assert narrow_window(0, -1, PaginationInput(offset=3, limit=10)) == (3, 10)
+
+
+class TestEventPushdown(BaseWalletdTest):
+    async def test_pagination_becomes_offset_and_limit(self, mock_client):
+        mock_client.get_wallet_events.return_value = list(range(10))
+        mock_info = self.create_mock_info(mock_client, StrawberryList(int))
+
+        result = await WalletdBaseResolver.handle_api_call(
+            mock_info,
+            "get_wallet_events",
+            wallet_id="w",
+            offset=100,
+            limit=500,
+            pagination_input=PaginationInput(offset=20, limit=10),
+        )
+
+        assert result == list(range(10))
+        mock_client.get_wallet_events.assert_awaited_once_with(wallet_id="w", offset=120, limit=10)
+
+    async def test_filtered_queries_page_in_process(self, mock_client):
+        mock_client.get_wallet_events.return_value = list(range(50))
+        mock_info = self.create_mock_info(mock_client, StrawberryList(int))
+
+        result = await WalletdBaseResolver.handle_api_call(
+            mock_info,
+            "get_wallet_events",
+            wallet_id="w",
+            offset=0,
+            limit=500,
+            filter_input=FilterInput(field="", operator=FilterOperator.GTE, value="10"),
+            pagination_input=PaginationInput(offset=0, limit=5),
+        )
+
+        assert result == [10, 11, 12, 13, 14]
+        mock_client.get_wallet_events.assert_awaited_once_with(wallet_id="w", offset=0, limit=500)
+
+    async def test_pages_past_the_window_are_empty(self, mock_client):
+        mock_info = self.create_mock_info(mock_client, StrawberryList(int))
+
+        result = await WalletdBaseResolver.handle_api_call(
+            mock_info, "get_wallet_events", wallet_id="w", limit=5, pagination_input=PaginationInput(offset=20)
+        )
+
+        assert result == []
+        mock_client.get_wallet_events.assert_not_awaited()
+
+
+class TestContractFilterPushdown(BaseHostdTest):
+    async def test_inputs_become_contract_filter_fields(self, mock_client):
+        mock_client.post_contracts.return_value = {"contracts": [], "count": 0}
+        mock_info = self.create_mock_info(mock_client, HostdContractsResponse)
+        mock_info.context["pushdowns"] = pushdowns = create_pushdowns()
+
+        await HostdBaseResolver.handle_api_call(
+            mock_info,
+            "post_contracts",
+            filter=ContractFilter.Input(),
+            filter_input=FilterInput(field="negotiationHeight", operator=FilterOperator.GT, value="100"),
+            sort_input=SortInput(field="negotiationHeight", direction=SortDirection.DESC),
+            pagination_input=PaginationInput(offset=5, limit=10),
+        )
+
+        pushed = mock_client.post_contracts.await_args.kwargs["filter"]
+        assert pushed.min_negotiation_height == 101
+        assert (pushed.sort_field, pushed.sort_desc) == ("negotiationHeight", True)
+        assert (pushed.offset, pushed.limit) == (5, 10)
+        assert pushdowns.stats() == {"filters": 1, "sorts": 1, "pages": 1}
+        assert create_pushdowns().stats() == {"filters": 0, "sorts": 0, "pages": 0}
+
+    async def test_fields_set_by_the_query_are_kept(self, mock_client):
+        mock_client.post_contracts.return_value = {"contracts": [], "count": 0}
+        mock_info = self.create_mock_info(mock_client, HostdContractsResponse)
+
+        await HostdBaseResolver.handle_api_call(
+            mock_info,
+            "post_contracts",
+            filter=ContractFilter.Input(contract_ids=["fcid:a"], limit=50),
+            filter_input=FilterInput(field="id", operator=FilterOperator.IN, value="fcid:b,fcid:c"),
+            pagination_input=PaginationInput(offset=5, limit=10),
+        )
+
+        pushed = mock_client.post_contracts.await_args.kwargs["filter"]
+        assert pushed.contract_ids == ["fcid:a"]
+        assert (pushed.offset, pushed.limit) == (None, 50)
+
+    async def test_pushed_filter_reaches_hostd(self):
+        bodies = []
+
+        class Hostd(Upstream):
+            def respond(self, request: httpx.Request) -> httpx.Response:
+                bodies.append(json.loads(request.content))
+                return httpx.Response(200, json={"contracts": [], "count": 0})
+
+        query = """{
+            hostdContracts(
+                filter: {statuses: [ACTIVE], renterKey: ["ed25519:ab"]}
+                sort: {field: "negotiationHeight", direction: DESC}
+                pagination: {offset: 5, limit: 10}
+            ) { count }
+        }"""
+
+        result = await schema.execute(query, context_value=graphql_context(hostd_client=Hostd().client(HostdClient)))
+
+        assert result.errors is None
+        assert bodies == [
+            {
+                "statuses": ["active"],
+                "renterKey": ["ed25519:ab"],
+                "sortField": "negotiationHeight",
+                "sortDesc": True,
+                "offset": 5,
+                "limit": 10,
+            }
+        ]
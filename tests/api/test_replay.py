@@ -0,0 +1,132 @@
+# tests/api/test_replay.py
+import asyncio
+import gzip
+import os
+
+import httpx
+import pytest
+
+from siaql.api.hostd import HostdClient, HostdError
+from siaql.api.pool import ConnectionPool
+from siaql.api.replay import (
+    Journal,
+    RecordingStream,
+    RecordingTransport,
+    ReplayMissError,
+    ReplayTransport,
+    load_journal,
+)
+from siaql.api.singleflight import NO_COALESCE
+
+
+class Daemon:
+    def __init__(self):
+        self.height = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.02)
+        if request.url.path.endswith("/sectors"):
+            return httpx.Response(200, content=bytes(range(256)))
+        self.height += 1
+        return httpx.Response(200, json={"height": self.height, "query": request.url.query.decode()})
+
+
+async def record(path: str, *requests) -> None:
+    journal = Journal(path)
+    transport = RecordingTransport(httpx.MockTransport(Daemon().handler), journal, "hostd")
+    async with httpx.AsyncClient(base_url="http://hostd/api", transport=transport) as client:
+        for method, url, kwargs in requests:
+            await client.request(method, url, **kwargs)
+    journal.close()
+
+
+class TestRecordReplay:
+    async def test_records_exchanges_with_timings(self, tmp_path):
+        path = os.path.join(tmp_path, "hostd.jsonl.gz")
+        await record(path, ("GET", "/state", {"params": {"a": 1}}), ("GET", "/sectors", {}))
+
+        records = load_journal(path)["hostd"]
+
+        assert [r["path"] for r in records] == ["/api/state?a=1", "/api/sectors"]
+        assert records[0]["latency"] >= 0.02
+        assert "base64" in records[1] and "text" in records[0]
+        with gzip.open(path, "rt") as f:
+            assert len(f.readlines()) == 2
+
+    async def test_replays_in_order_and_starts_over(self, tmp_path):
+        path = os.path.join(tmp_path, "hostd.jsonl.gz")
+        await record(path, ("GET", "/state", {}), ("GET", "/state", {}), ("GET", "/sectors", {}))
+        transport = ReplayTransport(load_journal(path)["hostd"], latency_scale=0)
+        client = httpx.AsyncClient(base_url="http://elsewhere/api", transport=transport)
+
+        heights = [(await client.get("/state")).json()["height"] for _ in range(3)]
+        sectors = await client.get("/sectors")
+
+        assert heights == [1, 2, 1]
+        assert sectors.content == bytes(range(256))
+        with pytest.raises(ReplayMissError):
+            await client.get("/volumes")
+        assert transport.stats() == {"recorded": 3, "hits": 4, "misses": 1}
+
+    async def test_post_bodies_are_matched(self, tmp_path):
+        path = os.path.join(tmp_path, "hostd.jsonl.gz")
+        await record(
+            path, ("POST", "/contracts", {"json": {"limit": 1}}), ("POST", "/contracts", {"json": {"limit": 2}})
+        )
+        client = httpx.AsyncClient(transport=ReplayTransport(load_journal(path)["hostd"], latency_scale=0))
+
+        second = await client.post("http://hostd/api/contracts", json={"limit": 2})
+
+        assert second.json()["height"] == 2
+
+    async def test_streamed_bodies_are_recorded_by_size(self, tmp_path):
+        path = os.path.join(tmp_path, "hostd.jsonl.gz")
+        journal = Journal(path)
+        transport = RecordingTransport(httpx.MockTransport(Daemon().handler), journal, "hostd")
+        async with httpx.AsyncClient(base_url="http://hostd/api", transport=transport) as client:
+            request = client.build_request("GET", "/sectors", extensions={NO_COALESCE: True})
+            response = await client.send(request, stream=True)
+            streamed = b"".join([chunk async for chunk in response.aiter_bytes()])
+            await response.aclose()
+        journal.close()
+
+        records = load_journal(path)["hostd"]
+        replayed = await httpx.AsyncClient(transport=ReplayTransport(records, latency_scale=0)).get(
+            "http://hostd/api/sectors"
+        )
+
+        assert streamed == bytes(range(256))
+        assert records[0]["omitted"] and records[0]["size"] == 256
+        assert "text" not in records[0] and "base64" not in records[0]
+        assert replayed.content == bytes(256)
+
+    async def test_bodies_past_the_limit_are_not_kept(self):
+        recorded = []
+        stream = RecordingStream(
+            httpx.ByteStream(b"x" * 10), lambda body, size: recorded.append((body, size)), max_body=4
+        )
+
+        assert b"".join([chunk async for chunk in stream]) == b"x" * 10
+        await stream.aclose()
+        assert recorded == [(None, 10)] and stream.chunks == []
+
+    async def test_latencies_are_scaled(self):
+        record = {"method": "GET", "path": "/api/state", "status": 200, "headers": [], "text": "{}", "latency": 0.05}
+        client = httpx.AsyncClient(transport=ReplayTransport([record], latency_scale=2))
+
+        start = asyncio.get_running_loop().time()
+        await client.get("http://hostd/api/state")
+        assert asyncio.get_running_loop().time() - start >= 0.1
+
+        with pytest.raises(httpx.ReadTimeout):
+            await client.get("http://hostd/api/state", timeout=0.01)
+
+    async def test_pool_replays_without_daemons(self):
+        record = {"method": "GET", "path": "/api/state", "status": 200, "headers": [], "text": '{"name":"hostd"}'}
+        pool = ConnectionPool(replay_records={"hostd": [{**record, "latency": 0}]})
+        client = HostdClient("http://unreachable:1", pool=pool)
+
+        assert await client.get_state() == {"name": "hostd"}
+        with pytest.raises(HostdError):
+            await client.get_volumes()
+        assert pool.stats()["hostd"]["replay"]["misses"] == 1
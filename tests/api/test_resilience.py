@@ -0,0 +1,145 @@
+# tests/api/test_resilience.py
+import httpx
+import pytest
+
+from siaql.api.cache import CachePolicy, ResponseCache
+from siaql.api.hostd import HostdClient, HostdError
+from siaql.api.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from tests.conftest import FakeClock, Upstream
+
+
+class Hostd(Upstream):
+    """Mock hostd that fails to connect while `down` is set"""
+
+    def __init__(self):
+        super().__init__({"name": "hostd"})
+        self.down = False
+        self.status = 200
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        if self.down:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(self.status, json=self.body)
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_and_probes_half_open(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker("hostd", failure_threshold=2, reset_timeout=10, clock=clock)
+
+        breaker.record_failure()
+        assert breaker.state == "closed"
+        breaker.record_failure()
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        clock.now = 10
+        assert breaker.state == "half_open"
+        breaker.before_call()
+        # Only a single probe is let through while half-open
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+        assert breaker.stats() == {"state": "closed", "consecutiveFailures": 0, "opens": 1, "rejected": 2}
+
+    def test_failed_probe_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker("hostd", failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 10
+        breaker.before_call()
+
+        breaker.record_failure()
+
+        assert breaker.state == "open"
+        clock.now = 15
+        assert breaker.state == "open"
+
+
+class TestGuardedCalls:
+    async def test_gets_are_retried(self):
+        upstream = Hostd()
+        upstream.down = True
+        retry = RetryPolicy(max_retries=2, base_delay=0)
+        client = upstream.client(HostdClient, retry=retry)
+
+        with pytest.raises(HostdError):
+            await client.get_state()
+
+        assert upstream.requests == ["GET /api/state"] * 3
+        assert retry.retries == 2
+
+    async def test_recovers_within_retries(self):
+        upstream = Hostd()
+        calls = 0
+
+        def flaky(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise httpx.ConnectError("connection refused", request=request)
+            return httpx.Response(200, json={"name": "hostd"})
+
+        upstream.respond = flaky
+        client = upstream.client(HostdClient, retry=RetryPolicy(base_delay=0))
+
+        assert await client.get_state() == {"name": "hostd"}
+        assert calls == 2
+
+    async def test_non_idempotent_calls_are_not_retried(self):
+        upstream = Hostd()
+        upstream.down = True
+        client = upstream.client(HostdClient, retry=RetryPolicy(base_delay=0))
+
+        with pytest.raises(HostdError):
+            await client.delete_sector("h:00")
+
+        assert upstream.requests == ["DELETE /api/sectors/h:00"]
+
+    async def test_open_breaker_fails_fast(self):
+        upstream = Hostd()
+        upstream.down = True
+        clock = FakeClock()
+        breaker = CircuitBreaker("hostd", failure_threshold=2, reset_timeout=30, clock=clock)
+        client = upstream.client(HostdClient, breaker=breaker)
+
+        for _ in range(4):
+            with pytest.raises(HostdError):
+                await client.get_state()
+
+        assert len(upstream.requests) == 2
+        assert breaker.stats()["rejected"] == 2
+
+        upstream.down = False
+        clock.now = 30
+        assert await client.get_state() == {"name": "hostd"}
+        assert breaker.state == "closed"
+
+    async def test_daemon_errors_do_not_trip_the_breaker(self):
+        upstream = Hostd()
+        upstream.status = 500
+        breaker = CircuitBreaker("hostd", failure_threshold=1)
+        client = upstream.client(HostdClient, breaker=breaker, retry=RetryPolicy(base_delay=0))
+
+        with pytest.raises(HostdError):
+            await client.get_state()
+
+        assert breaker.state == "closed"
+        assert upstream.requests == ["GET /api/state"]
+
+    async def test_cached_responses_are_served_while_open(self):
+        upstream = Hostd()
+        breaker = CircuitBreaker("hostd", failure_threshold=1)
+        cache = ResponseCache(CachePolicy(ttls={"get_settings": 60}))
+        client = upstream.client(HostdClient, cache=cache, breaker=breaker)
+        await client.get_settings()
+
+        upstream.down = True
+        with pytest.raises(HostdError):
+            await client.get_state()
+
+        assert breaker.state == "open"
+        assert await client.get_settings() == {"name": "hostd"}
@@ -0,0 +1,123 @@
+# tests/api/test_result_cache.py
+import httpx
+from graphql import parse
+
+from siaql.api.pool import ConnectionPool
+from siaql.api.renterd import RenterdClient
+from siaql.graphql.result_cache import ResultCache
+from siaql.graphql.schema import schema
+from tests.conftest import FakeClock, Upstream, graphql_context
+
+FCID = "fcid:" + "ab" * 32
+HOSTS = [{"publicKey": f"ed25519:{i:064x}", "netAddress": f"host{i}.example.com:9982"} for i in range(3)]
+
+
+class Renterd(Upstream):
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "DELETE":
+            return httpx.Response(200)
+        return super().respond(request)
+
+
+def setup(cache: ResultCache):
+    upstream = Renterd(HOSTS)
+    client = upstream.client(RenterdClient)
+
+    def context():
+        return graphql_context(renterd_client=client, pool=ConnectionPool(), result_cache=cache)
+
+    return upstream, context
+
+
+class TestResultCacheExtension:
+    async def test_repeated_queries_are_served_from_cache(self):
+        cache = ResultCache(ttl=10)
+        upstream, context = setup(cache)
+
+        first = await schema.execute("{ renterdGetHosts { netAddress } }", context_value=context())
+        # The same document, formatted differently
+        second = await schema.execute(
+            "query {\n  # hosts\n  renterdGetHosts {\n    netAddress\n  }\n}", context_value=context()
+        )
+
+        assert first.errors is None and second.data == first.data
+        assert upstream.requests == ["GET /api/bus/hosts"]
+        assert cache.stats()["hits"] == 1
+
+    async def test_variables_are_part_of_the_key(self):
+        cache = ResultCache(ttl=10)
+        upstream, context = setup(cache)
+        query = "query ($limit: Int!) { renterdGetHosts(pagination: {offset: 0, limit: $limit}) { netAddress } }"
+
+        one = await schema.execute(query, variable_values={"limit": 1}, context_value=context())
+        two = await schema.execute(query, variable_values={"limit": 2}, context_value=context())
+        await schema.execute(query, variable_values={"limit": 1}, context_value=context())
+
+        assert len(one.data["renterdGetHosts"]) == 1 and len(two.data["renterdGetHosts"]) == 2
+        assert len(upstream.requests) == 2
+
+    async def test_mutations_execute_and_invalidate(self):
+        cache = ResultCache(ttl=10)
+        upstream, context = setup(cache)
+        query = "{ renterdGetHosts { netAddress } }"
+        mutation = "mutation ($id: FileContractID!) { renterdDeleteContract(id: $id) }"
+
+        await schema.execute(query, context_value=context())
+        await schema.execute(mutation, variable_values={"id": FCID}, context_value=context())
+        await schema.execute(mutation, variable_values={"id": FCID}, context_value=context())
+        await schema.execute(query, context_value=context())
+
+        assert upstream.requests == ["GET /api/bus/hosts"] + [f"DELETE /api/bus/contract/{FCID}"] * 2 + [
+            "GET /api/bus/hosts"
+        ]
+        assert cache.stats()["invalidations"] == 1
+
+    async def test_stats_are_never_cached(self):
+        cache = ResultCache(ttl=10)
+        upstream, context = setup(cache)
+        query = "{ renterdGetHosts { netAddress } siaqlStats }"
+
+        await schema.execute(query, context_value=context())
+        result = await schema.execute(query, context_value=context())
+
+        assert result.errors is None
+        assert len(upstream.requests) == 2
+        assert result.data["siaqlStats"]["results"]["uncacheable"] == 2
+
+
+class TestResultCache:
+    def key(self, query: str, skipped=None):
+        return ResultCache.make_key(parse(query), None, None, skipped or {})
+
+    def test_entries_expire_and_are_evicted(self):
+        clock = FakeClock()
+        cache = ResultCache(ttl=5, max_entries=2, clock=clock)
+        keys = [self.key(f"{{ renterdGetHosts{i} }}") for i in range(3)]
+        for key in keys[:2]:
+            cache.set(key, ("renterd",), {}, cache.generations(("renterd",)))
+
+        clock.now = 4
+        cache.set(keys[2], ("renterd",), {}, cache.generations(("renterd",)))
+        assert cache.get(keys[0]) == (False, None)
+        assert cache.get(keys[1])[0] and cache.get(keys[2])[0]
+
+        clock.now = 5
+        assert cache.get(keys[1]) == (False, None)
+        assert cache.get(keys[2])[0]
+        assert cache.stats()["evictions"] == 1
+
+    def test_results_computed_across_an_invalidation_are_not_stored(self):
+        cache = ResultCache(ttl=5)
+        key = self.key("{ hostdState { name } }")
+        generations = cache.generations(("hostd",))
+
+        cache.invalidate("hostd")
+        cache.set(key, ("hostd",), {}, generations)
+
+        assert cache.get(key) == (False, None)
+
+    def test_keys_depend_on_enabled_daemons(self):
+        query = "{ renterdGetHosts { netAddress } }"
+
+        assert self.key(query) != self.key(query, {"hostd": True})
+        assert self.key(query) == self.key("query{renterdGetHosts{netAddress}}")
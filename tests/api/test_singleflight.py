@@ -0,0 +1,104 @@
+# tests/api/test_singleflight.py
+import asyncio
+
+import httpx
+import pytest
+
+from siaql.api.deadline import Deadline, DeadlineTransport, deadline_scope
+from siaql.api.singleflight import SingleFlightTransport
+
+
+class SlowDaemon:
+    """Mock daemon handler that holds every request until released"""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await self.release.wait()
+        if request.url.path.endswith("/broken"):
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, json={"path": request.url.path, "params": str(request.url.params)})
+
+
+@pytest.fixture
+def daemon():
+    return SlowDaemon()
+
+
+@pytest.fixture
+def transport(daemon):
+    return SingleFlightTransport(httpx.MockTransport(daemon))
+
+
+async def release_after_queued(daemon: SlowDaemon):
+    await asyncio.sleep(0.01)
+    daemon.release.set()
+
+
+class TestSingleFlightTransport:
+    async def test_identical_gets_are_coalesced(self, daemon, transport):
+        async with httpx.AsyncClient(base_url="http://walletd/api", transport=transport) as client:
+            calls = [client.get("/consensus/tip") for _ in range(10)]
+            responses, _ = await asyncio.gather(asyncio.gather(*calls), release_after_queued(daemon))
+
+        assert daemon.calls == 1
+        assert all(response.json() == {"path": "/api/consensus/tip", "params": ""} for response in responses)
+        assert transport.stats() == {"leaders": 1, "coalesced": 9, "inFlight": 0}
+
+    async def test_different_params_are_not_coalesced(self, daemon, transport):
+        async with httpx.AsyncClient(base_url="http://walletd/api", transport=transport) as client:
+            calls = [client.get("/wallets/1/events", params={"offset": offset}) for offset in (0, 100)]
+            responses, _ = await asyncio.gather(asyncio.gather(*calls), release_after_queued(daemon))
+
+        assert daemon.calls == 2
+        assert [response.json()["params"] for response in responses] == ["offset=0", "offset=100"]
+
+    async def test_posts_are_not_coalesced(self, daemon, transport):
+        async with httpx.AsyncClient(base_url="http://hostd/api", transport=transport) as client:
+            calls = [client.post("/contracts", json={}) for _ in range(3)]
+            await asyncio.gather(asyncio.gather(*calls), release_after_queued(daemon))
+
+        assert daemon.calls == 3
+        assert transport.stats()["coalesced"] == 0
+
+    async def test_errors_are_shared_with_waiters(self, daemon, transport):
+        async with httpx.AsyncClient(base_url="http://hostd/api", transport=transport) as client:
+            calls = [client.get("/broken") for _ in range(3)]
+            results, _ = await asyncio.gather(
+                asyncio.gather(*calls, return_exceptions=True), release_after_queued(daemon)
+            )
+
+        assert daemon.calls == 1
+        assert all(isinstance(result, httpx.ConnectError) for result in results)
+
+    async def test_callers_wait_within_their_own_deadlines(self, daemon):
+        timeouts = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            timeouts.append(request.extensions["timeout"])
+            return await daemon(request)
+
+        transport = SingleFlightTransport(DeadlineTransport(httpx.MockTransport(handler)))
+
+        async def get(client: httpx.AsyncClient, budget: float) -> httpx.Response:
+            with deadline_scope(Deadline.after(budget)):
+                return await client.get("/state")
+
+        async def release_later():
+            await asyncio.sleep(0.1)
+            daemon.release.set()
+
+        async with httpx.AsyncClient(base_url="http://hostd/api", transport=transport, timeout=30) as client:
+            results, _ = await asyncio.gather(
+                asyncio.gather(get(client, 0.02), get(client, 5), return_exceptions=True), release_later()
+            )
+
+        short, long = results
+        assert isinstance(short, httpx.PoolTimeout)
+        assert long.json() == {"path": "/api/state", "params": ""}
+        assert daemon.calls == 1
+        # The shared request kept the client's timeouts rather than the first caller's budget
+        assert timeouts == [{"connect": 30, "read": 30, "write": 30, "pool": 30}]
@@ -0,0 +1,130 @@
+# tests/api/test_streaming.py
+import httpx
+import pytest
+
+from siaql.api.renterd import RenterdClient, RenterdError
+from siaql.api.singleflight import NO_COALESCE, SingleFlightTransport
+from tests.conftest import StreamingMockTransport, mock_http
+
+
+def mock_renterd(handler) -> RenterdClient:
+    return mock_http(RenterdClient("http://renterd"), StreamingMockTransport(handler))
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    """Response body served in fixed-size chunks, recording how far it was read"""
+
+    def __init__(self, size: int, chunk_size: int):
+        self.size = size
+        self.chunk_size = chunk_size
+        self.sent = 0
+
+    async def __aiter__(self):
+        while self.sent < self.size:
+            chunk = b"x" * min(self.chunk_size, self.size - self.sent)
+            self.sent += len(chunk)
+            yield chunk
+
+
+class TestStreamingUpload:
+    async def test_upload_from_async_iterator(self):
+        received = {}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            received["chunks"] = [chunk async for chunk in request.stream]
+            received["params"] = dict(request.url.params)
+            received["headers"] = request.headers
+            return httpx.Response(200, headers={"ETag": '"abc"'})
+
+        async def body():
+            for i in range(3):
+                yield bytes([i]) * 4
+
+        client = mock_renterd(handler)
+
+        result = await client.upload_object_stream(
+            "default", "dir/file.bin", body(), {"minShards": 10, "metadata": {"owner": "me"}}
+        )
+
+        assert result == {"etag": '"abc"'}
+        assert received["chunks"] == [b"\x00" * 4, b"\x01" * 4, b"\x02" * 4]
+        assert received["params"] == {"bucket": "default", "minshards": "10"}
+        assert received["headers"]["X-Sia-Meta-owner"] == "me"
+
+    async def test_upload_from_file_path(self, tmp_path):
+        source = tmp_path / "object.bin"
+        source.write_bytes(b"a" * 2500)
+        received = {}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            received["chunks"] = [chunk async for chunk in request.stream]
+            received["length"] = request.headers.get("Content-Length")
+            return httpx.Response(200)
+
+        await mock_renterd(handler).upload_object_stream("default", "object.bin", source, chunk_size=1000)
+
+        assert [len(chunk) for chunk in received["chunks"]] == [1000, 1000, 500]
+        assert received["length"] == "2500"
+
+
+class TestStreamingDownload:
+    async def test_download_to_file_path(self, tmp_path):
+        stream = ChunkedStream(size=5000, chunk_size=1024)
+        client = mock_renterd(lambda request: httpx.Response(200, stream=stream))
+        target = tmp_path / "object.bin"
+
+        written = await client.download_object("default", "object.bin", target)
+
+        assert written == 5000
+        assert target.read_bytes() == b"x" * 5000
+
+    async def test_download_to_async_callable(self):
+        chunks = []
+
+        async def sink(chunk: bytes):
+            chunks.append(len(chunk))
+
+        client = mock_renterd(lambda request: httpx.Response(200, stream=ChunkedStream(size=3000, chunk_size=1000)))
+
+        await client.download_object("default", "object.bin", sink, chunk_size=1000)
+
+        assert chunks == [1000, 1000, 1000]
+
+    async def test_stream_is_read_lazily(self):
+        stream = ChunkedStream(size=10_000_000, chunk_size=1000)
+        client = mock_renterd(lambda request: httpx.Response(200, stream=stream))
+
+        chunks = client.stream_object("default", "big.bin", chunk_size=1000)
+        first = await chunks.__anext__()
+        await chunks.aclose()
+
+        assert len(first) == 1000
+        assert stream.sent < 10_000
+
+    async def test_byte_range_header(self):
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers.get("Range"))
+            return httpx.Response(206, content=b"abc")
+
+        client = mock_renterd(handler)
+
+        assert b"".join([chunk async for chunk in client.stream_object("default", "f", byte_range=(10, 12))]) == b"abc"
+        assert [chunk async for chunk in client.stream_object("default", "f", byte_range=(10, None))] == [b"abc"]
+        assert seen == ["bytes=10-12", "bytes=10-"]
+
+    async def test_errors_are_wrapped(self):
+        client = mock_renterd(lambda request: httpx.Response(404, text="object not found"))
+
+        with pytest.raises(RenterdError):
+            await client.download_object("default", "missing", lambda chunk: None)
+
+    async def test_streamed_gets_bypass_coalescing(self):
+        transport = SingleFlightTransport(httpx.MockTransport(lambda request: httpx.Response(200, content=b"data")))
+        request = httpx.Request("GET", "http://renterd/api/worker/objects/f", extensions={NO_COALESCE: True})
+
+        response = await transport.handle_async_request(request)
+
+        assert transport.leaders == 0
+        assert await response.aread() == b"data"
@@ -0,0 +1,130 @@
+# tests/api/test_tip.py
+import asyncio
+
+import pytest
+
+from siaql.api.cache import CachePolicy, ResponseCache
+from siaql.api.tip import TipWatcher
+from siaql.graphql.app import create_graphql_app
+
+
+class FakeDaemon:
+    def __init__(self):
+        self.tip = {"height": 100, "id": "bid:100"}
+        self.balance_calls = 0
+        self.down = False
+
+    async def get_consensus_tip(self):
+        if self.down:
+            raise ConnectionError("walletd is down")
+        return self.tip
+
+    async def get_wallet_balance(self, wallet_id: str):
+        self.balance_calls += 1
+        return {"siacoins": str(self.tip["height"])}
+
+
+@pytest.fixture
+def daemon():
+    return FakeDaemon()
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache(CachePolicy(tip_scoped=["get_wallet_balance"]))
+
+
+@pytest.fixture
+def watcher(cache, daemon):
+    return TipWatcher(cache, daemon.get_consensus_tip)
+
+
+async def get_balance(cache: ResponseCache, daemon: FakeDaemon, wallet_id: str):
+    func = FakeDaemon.get_wallet_balance
+    return await cache.call("get_wallet_balance", func, (daemon, wallet_id), {})
+
+
+class TestTipWatcher:
+    async def test_tip_scoped_calls_are_not_cached_before_tip_is_known(self, cache, daemon):
+        await get_balance(cache, daemon, "1")
+        await get_balance(cache, daemon, "1")
+
+        assert daemon.balance_calls == 2
+
+    async def test_tip_scoped_calls_are_cached_between_blocks(self, cache, daemon, watcher):
+        await watcher.poll()
+        await get_balance(cache, daemon, "1")
+        await watcher.poll()
+        result = await get_balance(cache, daemon, "1")
+
+        assert result == {"siacoins": "100"}
+        assert daemon.balance_calls == 1
+
+    async def test_tip_change_drops_cached_calls(self, cache, daemon, watcher):
+        await watcher.poll()
+        await get_balance(cache, daemon, "1")
+        daemon.tip = {"height": 101, "id": "bid:101"}
+        await watcher.poll()
+        result = await get_balance(cache, daemon, "1")
+
+        assert result == {"siacoins": "101"}
+        assert daemon.balance_calls == 2
+        assert watcher.stats()["changes"] == 2
+
+    async def test_failed_poll_stops_tip_scoped_caching(self, cache, daemon, watcher):
+        await watcher.poll()
+        await get_balance(cache, daemon, "1")
+        daemon.down = True
+        await watcher.poll()
+        await get_balance(cache, daemon, "1")
+
+        assert daemon.balance_calls == 2
+        assert cache.tip is None
+        assert watcher.stats()["failures"] == 1
+
+    async def test_watcher_runs_in_background(self, cache, watcher):
+        watcher.ensure_started()
+        await asyncio.sleep(0.01)
+        assert watcher.stats()["polls"] == 1
+        assert cache.tip is not None
+
+        await watcher.stop()
+        assert cache.tip is None
+
+
+class TestAppLifespan:
+    async def test_watchers_and_pool_follow_the_server(self, daemon):
+        app = create_graphql_app(
+            walletd_url="http://walletd",
+            walletd_password="",
+            renterd_url="http://renterd",
+            renterd_password="",
+            hostd_url="http://hostd",
+            hostd_password="",
+            skipped_endpoints={"walletd": False, "renterd": True, "hostd": True},
+            cache_policies={"walletd": CachePolicy(tip_scoped=["get_wallet_balance"])},
+        )
+        watcher = app.tip_watchers["walletd"]
+        watcher.fetch_tip = daemon.get_consensus_tip
+        closed = []
+        app.pool.aclose = lambda: asyncio.sleep(0, closed.append(True))
+        messages = asyncio.Queue()
+        sent = []
+
+        async def send(message):
+            sent.append(message["type"])
+
+        await messages.put({"type": "lifespan.startup"})
+        server = asyncio.ensure_future(app({"type": "lifespan"}, messages.get, send))
+        await asyncio.sleep(0.01)
+
+        assert sent == ["lifespan.startup.complete"]
+        assert watcher.stats()["polls"] == 1
+        assert app.walletd_client.cache.tip is not None
+
+        await messages.put({"type": "lifespan.shutdown"})
+        await asyncio.wait_for(server, 1)
+
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        assert app.walletd_client.cache.tip is None
+        assert closed == [True]
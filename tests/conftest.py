@@ -1,4 +1,5 @@
 # tests/conftest.py
+import httpx
 import pytest
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, PropertyMock
@@ -6,7 +7,7 @@ from strawberry.types import Info
 from siaql.api.renterd import RenterdClient
 from siaql.api.walletd import WalletdClient
 from siaql.api.hostd import HostdClient
-from typing import List, Optional, Type
+from typing import Any, Callable, Dict, List, Optional, Type, Union
 import strawberry
 from siaql.graphql.schemas.types import Wallet, Balance, Address, Currency
 
@@ -43,6 +44,72 @@ class RenterddMockInfo:
         self._field = MockField(field_type)
 
 
+class FakeClock:
+    """Clock for TTLs, breakers and limiters that only moves when told to, or by `step` per reading"""
+
+    def __init__(self, step: float = 0.0):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+Handler = Callable[[httpx.Request], Any]
+
+
+def mock_http(client, handler: Union[Handler, httpx.AsyncBaseTransport]):
+    """Point a daemon client at a request handler, or a transport, instead of a daemon"""
+    transport = handler if isinstance(handler, httpx.AsyncBaseTransport) else httpx.MockTransport(handler)
+    client.client = httpx.AsyncClient(base_url=client.base_url, transport=transport)
+    return client
+
+
+class StreamingMockTransport(httpx.AsyncBaseTransport):
+    """Like httpx.MockTransport, but leaves the request body unread for the handler to stream"""
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = self.handler(request)
+        if not isinstance(response, httpx.Response):
+            response = await response
+        return response
+
+
+class Upstream:
+    """Mock daemon recording each request as "METHOD /path", answering every one with `body` as JSON
+
+    Subclasses answer differently by overriding `respond`.
+    """
+
+    def __init__(self, body: Any = None):
+        self.body = body
+        self.requests: List[str] = []
+
+    def handler(self, request: httpx.Request) -> Any:
+        self.requests.append(f"{request.method} {request.url.path}")
+        return self.respond(request)
+
+    def respond(self, request: httpx.Request) -> Any:
+        return httpx.Response(200, json=self.body)
+
+    def client(self, client_class, url: str = "http://daemon", **kwargs):
+        """A client of `client_class` talking to this upstream"""
+        return mock_http(client_class(url, **kwargs), self.handler)
+
+
+def graphql_context(**entries: Any) -> Dict[str, Any]:
+    """Context of a GraphQL request reaching only the daemons of the given `<daemon>_client` entries"""
+    return {
+        "skipped_endpoints": {daemon: f"{daemon}_client" not in entries for daemon in ("walletd", "renterd", "hostd")},
+        "conversion_cache": None,
+        **entries,
+    }
+
+
 class BaseWalletdTest:
     """Base class for walletd schema tests"""
 
@@ -119,3 +186,9 @@ def mock_hostd_client():
     client = AsyncMock(spec=HostdClient)
     client.base_url = "http://localhost:9980/api"
     return client
+
+
+@pytest.fixture
+def fake_clock():
+    """A clock that only moves when a test sets `now`"""
+    return FakeClock()